@@ -0,0 +1,3 @@
+__author__ = 'Nuclight.atomAltera'
+
+# Benchmarks of orewrap operations against local redis-server, run with "python -m benchmarks --help"
\ No newline at end of file
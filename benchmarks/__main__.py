@@ -0,0 +1,67 @@
+__author__ = 'Nuclight.atomAltera'
+
+# Runs benchmarks against redis-server and writes results as JSON:
+#
+#	python -m benchmarks --output results.json
+#	python -m benchmarks --compare results.json --filter bulk.
+#
+# Keys with "bench:" prefix are removed before and after run, other keys of DB are not touched
+
+from argparse import ArgumentParser
+import sys
+
+from redis import Redis
+
+from orewrap.fields import Field
+
+from .cases import all_cases, cleanup
+from .runner import run, environment, save, load, compare, format_result
+
+
+def main(arguments=None):
+	parser = ArgumentParser(prog='python -m benchmarks', description='Benchmarks of orewrap operations')
+	parser.add_argument('--host', default='localhost')
+	parser.add_argument('--port', type=int, default=6379)
+	parser.add_argument('--db', type=int, default=15, help='DB number, 15 by default')
+	parser.add_argument('--number', type=int, default=1000, help='number of measured calls of each case')
+	parser.add_argument('--warmup', type=int, default=10, help='number of calls before measurement')
+	parser.add_argument('--size', type=int, default=100, help='size of collections and bulk operations')
+	parser.add_argument('--filter', help='substring of names of cases to run, as like "fields." or "zset"')
+	parser.add_argument('--output', help='path of JSON file to write results to')
+	parser.add_argument('--compare', help='path of JSON file with baseline results')
+	parser.add_argument('--threshold', type=float, default=0.1, help='relative slowdown, reported as regression')
+
+	options = parser.parse_args(arguments)
+
+	redis = Redis(host=options.host, port=options.port, db=options.db)
+	Field.Init(redis)
+
+	cleanup(redis)
+
+	try:
+		results = run(
+			all_cases(redis, options.size), options.number, options.warmup, options.filter,
+			report=lambda result: print(format_result(result))
+		)
+	finally:
+		cleanup(redis)
+
+	if options.output:
+		save(options.output, results, environment(redis))
+
+	if options.compare:
+		regressions = 0
+
+		print()
+
+		for name, change, regression in compare(load(options.compare), results, options.threshold):
+			print('%-40s %+7.1f%%%s' % (name, change * 100, '  REGRESSION' if regression else ''))
+			regressions += regression
+
+		return 1 if regressions else 0
+
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
\ No newline at end of file
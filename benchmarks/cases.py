@@ -0,0 +1,179 @@
+__author__ = 'Nuclight.atomAltera'
+
+from datetime import datetime
+from itertools import count, cycle
+
+from orewrap.fields import Field, StringField, HashField, SetField, SortedSetField
+from orewrap.encoders import EncodeQueue, string_encoder, base64_encoder, datetime_encoder
+from orewrap.object import Object, ObjectField
+
+from .runner import Case
+
+# All keys, written by benchmarks, start with prefix
+PREFIX = 'bench'
+
+
+class BenchItem(Object):
+	_Name = PREFIX + ':item'
+
+	title = ObjectField(StringField)
+
+
+def cleanup(redis):
+	"""
+	Removes all keys, written by benchmarks
+	"""
+	keys = list(redis.scan_iter(PREFIX + ':*', 1000))
+
+	for start in range(0, len(keys), 1000):
+		redis.delete(*keys[start:start + 1000])
+
+
+def field_cases(redis, size):
+	"""
+	Cases of single commands of fields, collections hold 'size' members
+	"""
+	numbers = count()
+	values = ['value%d' % index for index in range(size)]
+
+	string = StringField(PREFIX + ':string', redis=redis)
+	counter = StringField(PREFIX + ':counter', redis=redis)
+	hash = HashField(PREFIX + ':hash', redis=redis)
+	set = SetField(PREFIX + ':set', redis=redis)
+	sorted_set = SortedSetField(PREFIX + ':zset', redis=redis)
+
+	def fill(calls):
+		hash.set_multi(dict(zip(values, values)))
+		set.add(*values)
+		sorted_set.add_multi(dict(zip(values, range(size))))
+
+	return [
+		Case('fields', 'string_set', lambda: string.set('value')),
+		Case('fields', 'string_get', string.get, setup=lambda calls: string.set('value')),
+		Case('fields', 'string_increment', counter.increment),
+		Case('fields', 'hash_set', lambda: hash.set(values[next(numbers) % size], 'value'), setup=fill),
+		Case('fields', 'hash_get', lambda: hash.get(values[next(numbers) % size]), setup=fill),
+		Case('fields', 'hash_members', hash.members, setup=fill),
+		Case('fields', 'set_add', lambda: set.add(values[next(numbers) % size]), setup=fill),
+		Case('fields', 'set_contains', lambda: set.contains(values[next(numbers) % size]), setup=fill),
+		Case('fields', 'set_members', set.members, setup=fill),
+		Case('fields', 'zset_add', lambda: sorted_set.add(values[next(numbers) % size], next(numbers)), setup=fill),
+		Case('fields', 'zset_score_of', lambda: sorted_set.score_of(values[next(numbers) % size]), setup=fill),
+		Case('fields', 'zset_range_10', lambda: sorted_set.range_by_index(0, 9), setup=fill),
+		Case('fields', 'zset_page_10', lambda: sorted_set.page(size=10), setup=fill),
+	]
+
+
+def bulk_cases(redis, size):
+	"""
+	Cases of writing and reading 'size' members with one call (bulk variants) and with 'size' calls (single variants)
+	"""
+	values = ['value%d' % index for index in range(size)]
+
+	hash = HashField(PREFIX + ':bulk:hash', redis=redis)
+	sorted_set = SortedSetField(PREFIX + ':bulk:zset', redis=redis)
+	strings = [StringField('%s:bulk:string:%d' % (PREFIX, index), redis=redis) for index in range(size)]
+
+	def hash_set_single():
+		for value in values:
+			hash.set(value, value)
+
+	def hash_get_single():
+		for value in values:
+			hash.get(value)
+
+	def zset_add_single():
+		for index, value in enumerate(values):
+			sorted_set.add(value, index)
+
+	def zset_score_single():
+		for value in values:
+			sorted_set.score_of(value)
+
+	def strings_set_batch():
+		with Field.batch():
+			for field in strings:
+				field.set('value')
+
+	def strings_set_single():
+		for field in strings:
+			field.set('value')
+
+	scores = dict(zip(values, range(size)))
+
+	return [
+		Case('bulk', 'hash_set_multi', lambda: hash.set_multi(dict(zip(values, values))), items=size),
+		Case('bulk', 'hash_set_single', hash_set_single, items=size),
+		Case('bulk', 'hash_get_multi', lambda: hash.get_multi(values), setup=lambda calls: hash_set_single(), items=size),
+		Case('bulk', 'hash_get_single', hash_get_single, setup=lambda calls: hash_set_single(), items=size),
+		Case('bulk', 'zset_add_multi', lambda: sorted_set.add_multi(scores), items=size),
+		Case('bulk', 'zset_add_single', zset_add_single, items=size),
+		Case('bulk', 'zset_score_of_multi', lambda: sorted_set.score_of_multi(values), setup=lambda calls: zset_add_single(), items=size),
+		Case('bulk', 'zset_score_of_single', zset_score_single, setup=lambda calls: zset_add_single(), items=size),
+		Case('bulk', 'strings_set_batch', strings_set_batch, items=size),
+		Case('bulk', 'strings_set_single', strings_set_single, items=size),
+	]
+
+
+def encoder_cases(size):
+	"""
+	Cases of encoding and decoding of 'size' values with `Encoder.encode_many` and `Encoder.decode_many`
+	"""
+	queue = EncodeQueue(string_encoder, base64_encoder)
+
+	strings = ['value%d' % index for index in range(size)]
+	binaries = string_encoder.encode_many(strings)
+	now = datetime.now()
+	dates = [now] * size
+
+	encoded_queue = queue.encode_many(strings)
+	encoded_base64 = base64_encoder.encode_many(binaries)
+	encoded_dates = datetime_encoder.encode_many(dates)
+
+	return [
+		Case('encoders', 'queue_encode', lambda: queue.encode_many(strings), items=size),
+		Case('encoders', 'queue_decode', lambda: queue.decode_many(encoded_queue), items=size),
+		Case('encoders', 'base64_encode', lambda: base64_encoder.encode_many(binaries), items=size),
+		Case('encoders', 'base64_decode', lambda: base64_encoder.decode_many(encoded_base64), items=size),
+		Case('encoders', 'datetime_encode', lambda: datetime_encoder.encode_many(dates), items=size),
+		Case('encoders', 'datetime_decode', lambda: datetime_encoder.decode_many(encoded_dates), items=size),
+	]
+
+
+def object_cases(redis):
+	"""
+	Cases of `Object` lifecycle: creation, reading and deletion
+	"""
+	objects = []
+	state = {}
+
+	def create_objects(calls):
+		objects[:] = BenchItem.CreateMany(calls, title='title')
+		state['ids'] = cycle([item.object_id for item in objects])
+
+	def get():
+		return BenchItem.Get(next(state['ids']))
+
+	def load():
+		return BenchItem(next(state['ids'])).load()
+
+	def delete():
+		objects.pop().delete()
+
+	return [
+		Case('object', 'create', lambda: BenchItem.Create(title='title')),
+		Case('object', 'create_many_100', lambda: BenchItem.CreateMany(100, title='title'), items=100),
+		Case('object', 'get', get, setup=create_objects),
+		Case('object', 'load', load, setup=create_objects),
+		Case('object', 'delete', delete, setup=create_objects),
+	]
+
+
+def all_cases(redis, size=100):
+	"""
+	Returns all benchmark cases. Fields use 'redis' client, `Object`s use client, passed to `Field.Init`
+
+	size
+		number of members of collections and size of batches of bulk cases
+	"""
+	return field_cases(redis, size) + bulk_cases(redis, size) + encoder_cases(size) + object_cases(redis)
\ No newline at end of file
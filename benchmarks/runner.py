@@ -0,0 +1,200 @@
+__author__ = 'Nuclight.atomAltera'
+
+from time import perf_counter
+from datetime import datetime
+import platform
+import json
+import gc
+
+
+class Case():
+	"""
+	Single benchmark: 'function' is called 'number' times, each call is timed separately
+	"""
+
+	def __init__(self, group, name, function, setup=None, teardown=None, items=1):
+		"""
+		group
+			name of group of cases (fields, bulk, encoders, object...)
+
+		function
+			function without arguments, operation to measure
+
+		setup
+			function, called once before measurement with number of calls to be made (including warmup ones)
+
+		teardown
+			function without arguments, called once after measurement
+
+		items
+			number of operations, done by single call (size of batch for bulk variants), ops/sec are counted by items
+		"""
+		self.group = group
+		self.name = name
+		self.function = function
+		self.setup = setup
+		self.teardown = teardown
+		self.items = items
+
+	@property
+	def full_name(self):
+		return '%s.%s' % (self.group, self.name)
+
+
+def percentile(ordered, fraction):
+	"""
+	Returns value of sorted sequence 'ordered' at 'fraction' (0..1), with linear interpolation
+	"""
+	if not ordered: return None
+
+	position = (len(ordered) - 1) * fraction
+	lower = int(position)
+	upper = min(lower + 1, len(ordered) - 1)
+
+	return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def measure(case, number, warmup=10):
+	"""
+	Runs 'case' and returns dictionary of results, latencies are in microseconds per call
+	"""
+	if number < 1: raise Exception('Number of calls must be positive, got {0}'.format(number))
+	if warmup < 0: raise Exception('Number of warmup calls can not be negative, got {0}'.format(warmup))
+
+	if case.setup is not None: case.setup(number + warmup)
+
+	try:
+		function = case.function
+
+		for index in range(warmup):
+			function()
+
+		timings = [0.0] * number
+
+		gc_enabled = gc.isenabled()
+		gc.disable()
+
+		try:
+			for index in range(number):
+				started = perf_counter()
+				function()
+				timings[index] = perf_counter() - started
+		finally:
+			if gc_enabled: gc.enable()
+	finally:
+		if case.teardown is not None: case.teardown()
+
+	total = sum(timings)
+	timings.sort()
+
+	return {
+		'name': case.full_name,
+		'group': case.group,
+		'calls': number,
+		'items': case.items,
+		'total': total,
+		'ops_per_sec': number * case.items / total if total > 0 else None,
+		'mean_us': total / number * 1e6,
+		'p50_us': percentile(timings, 0.5) * 1e6,
+		'p99_us': percentile(timings, 0.99) * 1e6,
+		'max_us': timings[-1] * 1e6,
+	}
+
+
+def environment(redis=None):
+	"""
+	Returns dictionary, describing machine, interpreter and redis server, stored with results
+	"""
+	info = {
+		'date': datetime.now().isoformat(),
+		'python': platform.python_version(),
+		'implementation': platform.python_implementation(),
+		'platform': platform.platform(),
+	}
+
+	try:
+		import redis as redis_module
+		info['redis_py'] = redis_module.__version__
+	except (ImportError, AttributeError):
+		pass
+
+	if redis is not None:
+		try:
+			info['redis_server'] = redis.info('server').get('redis_version')
+		except Exception:
+			info['redis_server'] = None
+
+	return info
+
+
+def run(cases, number=1000, warmup=10, pattern=None, report=None):
+	"""
+	Measures 'cases'
+
+	pattern
+		substring of full names of cases to run, all by default
+
+	report
+		function, called with result of each case as soon as it is measured
+
+	return value
+		list of results
+	"""
+	results = []
+
+	for case in cases:
+		if pattern is not None and pattern not in case.full_name: continue
+
+		result = measure(case, number, warmup)
+		results.append(result)
+
+		if report is not None: report(result)
+
+	return results
+
+
+def save(path, results, info):
+	"""
+	Writes results with environment 'info' as JSON document
+	"""
+	with open(path, 'w') as file:
+		json.dump({'environment': info, 'results': results}, file, indent=2, sort_keys=True)
+
+
+def load(path):
+	"""
+	Reads JSON document, written by `save`
+
+	return value
+		dictionary of results by name of case
+	"""
+	with open(path) as file:
+		return {result['name']: result for result in json.load(file)['results']}
+
+
+def compare(baseline, results, threshold=0.1):
+	"""
+	Compares 'results' with 'baseline' (dictionary of results by name, returned by `load`)
+
+	threshold
+		relative slowdown of ops/sec, which is reported as regression
+
+	return value
+		list of triples: name, relative change of ops/sec and whether it is regression
+	"""
+	changes = []
+
+	for result in results:
+		old = baseline.get(result['name'])
+		if old is None or not old['ops_per_sec'] or not result['ops_per_sec']: continue
+
+		change = result['ops_per_sec'] / old['ops_per_sec'] - 1
+		changes.append((result['name'], change, change < -threshold))
+
+	return changes
+
+
+def format_result(result):
+	return '%-40s %12.0f ops/s  p50 %9.1f us  p99 %9.1f us' % (
+		result['name'], result['ops_per_sec'] or 0, result['p50_us'], result['p99_us']
+	)
\ No newline at end of file
@@ -0,0 +1,1151 @@
+__author__ = 'Nuclight.atomAltera'
+
+# Asyncio counterparts of fields and objects. They use the same keys, encoders and blocking redis client
+# (the same redis-py installation and command arguments) as blocking ones, all methods, touching DB, are coroutines.
+# Fields wrap client into `AsyncClient`, which runs blocking calls in thread pool, so event loop is not blocked by round trips
+
+from .fields import Field, Batch
+from .encoders import Encoder, string_encoder, datetime_encoder, get_encoder
+from .object import Object, ObjectField, ScoreObjectField, ClassField, RegisterClassField, HASH_STORAGE
+from .object import UniqueIndex, RangeIndex, TagIndex, get_object_id_encoder, _object_id, _RELEASE_SCRIPT
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from functools import partial
+from weakref import WeakKeyDictionary
+
+from redis.exceptions import ResponseError
+
+
+_current_batch = ContextVar('orewrap_async_batch', default=None)
+
+
+class AsyncClient():
+	"""
+	Adapter of blocking redis client for asyncio fields. Command methods return coroutines, which run blocking calls
+	in shared thread pool. Pipelines queue commands locally and are executed in thread pool too
+	"""
+
+	# Blocking calls are run by threads of own executor, as executed `AsyncBatch` waits for executor of `Batch`
+	_Max_Workers = 16
+	_Executor = None
+	_Executor_Lock = threading.Lock()
+
+	def __init__(self, client):
+		self.client = client
+
+	@classmethod
+	def _Get_Executor(cls):
+		with cls._Executor_Lock:
+			if AsyncClient._Executor is None:
+				AsyncClient._Executor = ThreadPoolExecutor(cls._Max_Workers, thread_name_prefix='orewrap-aio')
+
+			return AsyncClient._Executor
+
+	@classmethod
+	async def _Run(cls, function, *args, **kwargs):
+		return await asyncio.get_running_loop().run_in_executor(cls._Get_Executor(), partial(function, *args, **kwargs))
+
+	def __getattr__(self, name):
+		attribute = getattr(self.client, name)
+
+		if name.startswith('_') or not callable(attribute):
+			return attribute
+
+		async def call(*args, **kwargs):
+			return await self._Run(attribute, *args, **kwargs)
+
+		# next calls skip __getattr__
+		setattr(self, name, call)
+
+		return call
+
+	def pipeline(self, transaction=True, shard_hint=None):
+		return AsyncPipeline(self.client.pipeline(transaction, shard_hint))
+
+	def register_script(self, script):
+		return AsyncScript(self.client.register_script(script))
+
+
+class AsyncPipeline():
+	"""
+	Pipeline of `AsyncClient`, commands are queued as to blocking pipeline, `AsyncPipeline.execute` is coroutine
+	"""
+
+	def __init__(self, pipeline):
+		self.pipeline = pipeline
+
+	def __getattr__(self, name):
+		return getattr(self.pipeline, name)
+
+	async def execute(self, raise_on_error=True):
+		return await AsyncClient._Run(self.pipeline.execute, raise_on_error)
+
+
+class AsyncScript():
+	"""
+	Script, registered with `AsyncClient`, calling it is coroutine
+	"""
+
+	def __init__(self, script):
+		self.script = script
+
+	async def __call__(self, keys=[], args=[], client=None):
+		if type(client) is AsyncClient: client = client.client
+
+		return await AsyncClient._Run(self.script, keys, args, client)
+
+
+_clients = WeakKeyDictionary()
+
+
+def async_client(redis):
+	"""
+	Returns `AsyncClient` of blocking 'redis' client, created once per client
+	"""
+	if redis is None or type(redis) is AsyncClient: return redis
+
+	client = _clients.get(redis)
+
+	if client is None:
+		client = _clients[redis] = AsyncClient(redis)
+
+	return client
+
+
+class AsyncBatch(Batch):
+	"""
+	As like `Batch`, but for `AsyncField`s. Active block is tracked per asyncio task. Usually created by `AsyncField.batch`
+	"""
+
+	@classmethod
+	def Current(cls):
+		"""
+		Returns batch of innermost active block in current task, or None
+		"""
+		return _current_batch.get()
+
+	@classmethod
+	@contextmanager
+	def Suspended(cls):
+		"""
+		Commands of asyncio fields, called inside this block, are executed immediately even inside batch block
+		"""
+		token = _current_batch.set(None)
+
+		try:
+			yield
+		finally:
+			_current_batch.reset(token)
+
+	def __init__(self, transaction=False):
+		super(AsyncBatch, self).__init__(transaction)
+
+		self._token = None
+
+	def defer(self, redis, command, args, callback=None):
+		"""
+		As like `Batch.defer`, commands are queued to pipeline of blocking client, adapted by 'redis'
+		"""
+		if type(redis) is AsyncClient: redis = redis.client
+
+		return super(AsyncBatch, self).defer(redis, command, args, callback)
+
+	async def execute(self):
+		"""
+		Sends all queued commands to DB and resolves deferred results
+		"""
+		await AsyncClient._Run(super(AsyncBatch, self).execute)
+
+	def __enter__(self):
+		raise Exception('Batch of asyncio fields must be used with "async with"')
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		raise Exception('Batch of asyncio fields must be used with "async with"')
+
+	async def __aenter__(self):
+		self._token = _current_batch.set(self)
+		return self
+
+	async def __aexit__(self, exc_type, exc_value, traceback):
+		_current_batch.reset(self._token)
+
+		if exc_type is None:
+			await self.execute()
+		else:
+			self.discard()
+
+
+class AsyncField(Field):
+	"""
+	Base class for asyncio fields. Global settings are separate from settings of blocking fields,
+	but blocking redis client (or router of blocking clients) is passed to them
+	"""
+
+	_Redis = None
+	_Value_Encoder = None
+	_Ttl = None
+	# Proxies of `instrumentation` time blocking calls only
+	_Instrument = False
+
+	def __init__(self, key, value_encoder=None, redis=None, ttl=None):
+		super(AsyncField, self).__init__(key, value_encoder=value_encoder, redis=redis, ttl=ttl)
+
+		self._redis = async_client(self._client)
+
+	@staticmethod
+	def batch(transaction=False):
+		"""
+		As like `Field.batch`, but for `AsyncField`s. Use with `async with`
+		"""
+		return AsyncBatch(transaction)
+
+	async def _write(self, command, *args, callback=None, expire=True):
+		expire = expire and self._ttl is not None and command not in self._No_Ttl_Commands
+
+		batch = AsyncBatch.Current()
+
+		if batch is not None:
+			result = batch.defer(self._redis, command, args, callback)
+			if expire: batch.defer(self._redis, 'expire', (self._key, self._ttl))
+
+			return result
+
+		if expire:
+			pipeline = self._redis.pipeline(False)
+			getattr(pipeline, command)(*args)
+			pipeline.expire(self._key, self._ttl)
+
+			result = (await pipeline.execute())[0]
+		else:
+			result = await getattr(self._redis, command)(*args)
+
+		return callback(result) if callback is not None else result
+
+	async def ttl(self):
+		"""
+		As like `Field.ttl`
+		"""
+		milliseconds = await self._redis.pttl(self._key)
+
+		return milliseconds / 1000 if milliseconds is not None and milliseconds >= 0 else None
+
+	async def exists(self):
+		"""
+		Checking field exists in DB
+		"""
+		return bool(await self._redis.exists(self._key))
+
+	async def destroy(self):
+		"""
+		Removing field from DB
+
+		return value
+			True, if field existed, else False
+		"""
+		return await self._write('delete', self._key, callback=bool)
+
+
+class AsyncStringField(AsyncField):
+	"""
+	Asyncio counterpart of `StringField`
+	"""
+
+	def __init__(self, key, value_encoder=None, redis=None, overwrite=True, ttl=None):
+		super(AsyncStringField, self).__init__(key, value_encoder=value_encoder, redis=redis, ttl=ttl)
+
+		self._overwrite = overwrite
+
+	async def set(self, value, overwrite=None):
+		overwrite = self._overwrite if overwrite is None else overwrite
+		command = 'set' if overwrite else 'setnx'
+
+		return await self._write(command, self._key, self._value_encoder.encode(value), callback=bool)
+
+	async def get(self, default=None):
+		data = await self._redis.get(self._key)
+
+		return self._value_encoder.decode(data) if data is not None else default
+
+	async def increment(self, amount=1):
+		return await self._write('incr', self._key, amount)
+
+	def _decode(self, data):
+		return self._value_encoder.decode(data) if data is not None else None
+
+	def _load_command(self):
+		return 'get', (self._key, ), self._decode
+
+	def __hash__(self):
+		return hash(self._key)
+
+
+class AsyncHashField(AsyncField):
+	"""
+	Asyncio counterpart of `HashField`
+	"""
+
+	_Name_Encoder = None
+
+	@classmethod
+	def Init(cls, redis, value_encoder=None, name_encoder=None, ttl=None):
+		super(AsyncHashField, cls).Init(redis=redis, value_encoder=value_encoder, ttl=ttl)
+
+		cls._Name_Encoder = name_encoder
+
+	def __init__(self, key, value_encoder=None, name_encoder=None, redis=None, overwrite=True, ttl=None):
+		super(AsyncHashField, self).__init__(key, value_encoder=value_encoder, redis=redis, ttl=ttl)
+
+		self._name_encoder = get_encoder(name_encoder or self._Name_Encoder) or string_encoder
+
+		self._overwrite = overwrite
+
+	async def set(self, name, value, overwrite=None):
+		overwrite = self._overwrite if overwrite is None else overwrite
+		command = 'hset' if overwrite else 'hsetnx'
+
+		return await self._write(command, self._key,
+			self._name_encoder.encode(name),
+			self._value_encoder.encode(value),
+			callback=lambda result: bool(result) or overwrite
+		)
+
+	async def get(self, name, default=None):
+		value = await self._redis.hget(self._key, self._name_encoder.encode(name))
+
+		return self._value_encoder.decode(value) if value is not None else default
+
+	async def set_multi(self, dictionary):
+		return await self._write('hmset', self._key,
+			dict(zip(self._name_encoder.encode_many(dictionary.keys()), self._value_encoder.encode_many(dictionary.values())))
+		)
+
+	async def get_multi(self, names, default=None):
+		values = await self._redis.hmget(self._key, self._name_encoder.encode_many(names))
+
+		return tuple(self._value_encoder.decode(value) if value is not None else default for value in values)
+
+	async def members(self):
+		return self._decode_members(await self._redis.hgetall(self._key))
+
+	def _decode_members(self, members):
+		return dict(zip(self._name_encoder.decode_many(members.keys()), self._value_encoder.decode_many(members.values())))
+
+	def _load_command(self):
+		return 'hgetall', (self._key, ), self._decode_members
+
+	async def contains(self, name):
+		return bool(await self._redis.hexists(self._key, self._name_encoder.encode(name)))
+
+	async def names(self):
+		return self._name_encoder.decode_many(await self._redis.hkeys(self._key))
+
+	async def values(self):
+		return self._value_encoder.decode_many(await self._redis.hvals(self._key))
+
+	async def delete(self, *names):
+		return await self._write('hdel', self._key, *self._name_encoder.encode_many(names))
+
+	async def count(self):
+		return await self._redis.hlen(self._key)
+
+	async def scan_items(self, match=None, count=None):
+		"""
+		Asynchronously iterates over name-value pairs with HSCAN. Some pairs may be returned more then once,
+		if hash field is modified while iterating
+
+		match
+			glob-style pattern for encoded names
+
+		count
+			hint, how many pairs DB returns per call
+		"""
+		cursor = 0
+
+		while True:
+			cursor, data = await self._redis.hscan(self._key, cursor, match, count or self._Scan_Count)
+
+			for name, value in data.items():
+				yield self._name_encoder.decode(name), self._value_encoder.decode(value)
+
+			if not cursor: break
+
+	async def __aiter__(self):
+		# large hash fields are scanned, so names may repeat, if hash field is modified while iterating
+		if await self.count() > self._Scan_Threshold:
+			async for name, value in self.scan_items():
+				yield name
+		else:
+			for name in await self.names():
+				yield name
+
+
+class AsyncSetField(AsyncField):
+	"""
+	Asyncio counterpart of `SetField`
+	"""
+
+	async def add(self, *values):
+		return await self._write('sadd', self._key, *self._value_encoder.encode_many(values))
+
+	async def delete(self, *values):
+		return await self._write('srem', self._key, *self._value_encoder.encode_many(values))
+
+	async def members(self):
+		return self._decode_members(await self._redis.smembers(self._key))
+
+	def _decode_members(self, members):
+		return set(self._value_encoder.decode_many(members))
+
+	def _load_command(self):
+		return 'smembers', (self._key, ), self._decode_members
+
+	async def count(self):
+		return await self._redis.scard(self._key)
+
+	async def contains(self, value):
+		return bool(await self._redis.sismember(self._key, self._value_encoder.encode(value)))
+
+	async def random(self, number=None, unique=True):
+		if number:
+			if number < 0:
+				raise Exception('Number must be positive')
+
+			values = await self._redis.srandmember(self._key, number if unique else -number)
+
+			if not unique:
+				return self._value_encoder.decode_many(values)
+			else:
+				return set(self._value_encoder.decode_many(values))
+
+		else:
+			value = await self._redis.srandmember(self._key)
+			return self._value_encoder.decode(value) if value is not None else None
+
+	async def pop(self, number=None):
+		if number:
+			if number < 0:
+				raise Exception('Number must be positive')
+
+			pipeline = self._redis.pipeline()
+
+			for index in range(number):
+				pipeline.spop(self._key)
+
+			result = await pipeline.execute()
+
+			return set(self._value_encoder.decode_many(filter(lambda value: value is not None, result)))
+		else:
+			value = await self._redis.spop(self._key)
+			return self._value_encoder.decode(value) if value is not None else None
+
+	async def union(self, *setField_collection):
+		keys = self._keys_from_fields(setField_collection)
+
+		return self._decode_members(await self._redis.sunion(self._key, *keys))
+
+	async def intersection(self, *setField_collection):
+		keys = self._keys_from_fields(setField_collection)
+
+		return self._decode_members(await self._redis.sinter(self._key, *keys))
+
+	async def scan_members(self, match=None, count=None):
+		"""
+		Asynchronously iterates over members with SSCAN. Some members may be returned more then once,
+		if set field is modified while iterating
+
+		match
+			glob-style pattern for encoded values
+
+		count
+			hint, how many members DB returns per call
+		"""
+		cursor = 0
+
+		while True:
+			cursor, values = await self._redis.sscan(self._key, cursor, match, count or self._Scan_Count)
+
+			for value in values:
+				yield self._value_encoder.decode(value)
+
+			if not cursor: break
+
+	async def __aiter__(self):
+		# large set fields are scanned, so members may repeat, if set field is modified while iterating
+		if await self.count() > self._Scan_Threshold:
+			async for value in self.scan_members():
+				yield value
+		else:
+			for value in await self.members():
+				yield value
+
+
+class AsyncSortedSetField(AsyncField):
+	"""
+	Asyncio counterpart of `SortedSetField`
+	"""
+
+	_Score_Encoder = None
+	# Whether ZMSCORE command may be used, reset on first server that does not support it
+	_Use_Zmscore = True
+
+	@classmethod
+	def Init(cls, redis, value_encoder=None, score_encoder=None, ttl=None):
+		super(AsyncSortedSetField, cls).Init(redis=redis, value_encoder=value_encoder, ttl=ttl)
+
+		cls._Score_Encoder = score_encoder
+
+	def __init__(self, key, value_encoder=None, score_encoder=None, redis=None, ttl=None):
+		super(AsyncSortedSetField, self).__init__(key, value_encoder=value_encoder, redis=redis, ttl=ttl)
+
+		self._score_encoder = get_encoder(score_encoder or self._Score_Encoder) or string_encoder
+
+	def _pairs_to_args(self, dictionary):
+		args = [None] * len(dictionary) * 2
+		args[::2] = self._value_encoder.encode_many(dictionary.keys())
+		args[1::2] = self._score_encoder.encode_many(dictionary.values())
+
+		return args
+
+	def _score_range(self, min_score, max_score):
+		return (
+			'-inf' if min_score is None else self._score_encoder.encode(min_score),
+			'+inf' if max_score is None else self._score_encoder.encode(max_score)
+		)
+
+	async def add(self, value, score):
+		return await self._write('zadd', self._key, *self._pairs_to_args({value: score}), callback=bool)
+
+	async def add_multi(self, dictionary):
+		return await self._write('zadd', self._key, *self._pairs_to_args(dictionary))
+
+	async def delete(self, *values):
+		return await self._write('zrem', self._key, *self._value_encoder.encode_many(values))
+
+	async def count(self, min_score=None, max_score=None):
+		if min_score is max_score is None:
+			return await self._redis.zcard(self._key)
+
+		return await self._redis.zcount(self._key, *self._score_range(min_score, max_score))
+
+	async def range_by_index(self, start_index=None, stop_index=None, desc=False):
+		if start_index is None: start_index = 0
+		if stop_index is None: stop_index = -1
+
+		return self._decode_values(await self._redis.zrange(self._key, start_index, stop_index, desc))
+
+	async def range_by_score(self, min_score=None, max_score=None, limit=None):
+		start, number = (None, None) if limit is None else (0, limit)
+
+		return self._decode_values(await self._redis.zrangebyscore(self._key, *self._score_range(min_score, max_score), start, number))
+
+	def _decode_values(self, values):
+		return tuple(self._value_encoder.decode_many(values))
+
+	def _load_command(self):
+		return 'zrange', (self._key, 0, -1), self._decode_values
+
+	async def get_by_index(self, index):
+		result = await self.range_by_index(index, index)
+		if not result: return None
+
+		return result[0]
+
+	async def index_of(self, value):
+		return await self._redis.zrank(self._key, self._value_encoder.encode(value))
+
+	async def contains(self, value):
+		return (await self.index_of(value)) is not None
+
+	async def score_of(self, value):
+		return await self._redis.zscore(self._key, self._value_encoder.encode(value))
+
+	async def score_of_multi(self, values):
+		"""
+		As like `SortedSetField.score_of_multi`, falls back to pipeline of ZSCORE, if DB does not support ZMSCORE
+		"""
+		values = self._value_encoder.encode_many(values)
+
+		if not values:
+			return []
+
+		if AsyncSortedSetField._Use_Zmscore:
+			try:
+				scores = await self._redis.execute_command('ZMSCORE', self._key, *values)
+			except ResponseError as error:
+				if 'unknown command' not in str(error).lower(): raise
+				AsyncSortedSetField._Use_Zmscore = False
+			else:
+				return [float(score) if score is not None else None for score in scores]
+
+		pipeline = self._redis.pipeline(False)
+
+		for value in values:
+			pipeline.zscore(self._key, value)
+
+		return await pipeline.execute()
+
+	async def delete_range_by_index(self, start_index=None, stop_index=None):
+		if start_index is None: start_index = 0
+		if stop_index is None: stop_index = -1
+
+		return await self._write('zremrangebyrank', self._key, start_index, stop_index)
+
+	async def delete_range_by_score(self, min_score=None, max_score=None):
+		return await self._write('zremrangebyscore', self._key, *self._score_range(min_score, max_score))
+
+	async def scan_items(self, match=None, count=None):
+		"""
+		Asynchronously iterates over value-score pairs with ZSCAN, scores are not decoded. Pairs are not ordered by score
+		and some of them may be returned more then once, if sorted set field is modified while iterating
+
+		match
+			glob-style pattern for encoded values
+
+		count
+			hint, how many pairs DB returns per call
+		"""
+		cursor = 0
+
+		while True:
+			cursor, pairs = await self._redis.zscan(self._key, cursor, match, count or self._Scan_Count)
+
+			for value, score in pairs:
+				yield self._value_encoder.decode(value), score
+
+			if not cursor: break
+
+	async def __aiter__(self):
+		# large sorted set fields are scanned, so values are not ordered and may repeat, if field is modified while iterating
+		if await self.count() > self._Scan_Threshold:
+			async for value, score in self.scan_items():
+				yield value
+		else:
+			for value in await self.range_by_index():
+				yield value
+
+
+class AsyncHashMemberField(AsyncField):
+	"""
+	Asyncio counterpart of `HashMemberField`
+	"""
+
+	def __init__(self, hashField, name, value_encoder=None, overwrite=True):
+		super(AsyncHashMemberField, self).__init__(hashField._key, value_encoder=value_encoder, redis=hashField._redis)
+
+		self._name = hashField._name_encoder.encode(name)
+		self._overwrite = overwrite
+
+	async def exists(self):
+		return bool(await self._redis.hexists(self._key, self._name))
+
+	async def destroy(self):
+		return await self._write('hdel', self._key, self._name, callback=bool)
+
+	async def set(self, value, overwrite=None):
+		overwrite = self._overwrite if overwrite is None else overwrite
+		command = 'hset' if overwrite else 'hsetnx'
+
+		return await self._write(command, self._key, self._name, self._value_encoder.encode(value),
+			callback=lambda result: bool(result) or overwrite
+		)
+
+	async def get(self, default=None):
+		data = await self._redis.hget(self._key, self._name)
+
+		return self._value_encoder.decode(data) if data is not None else default
+
+	async def increment(self, amount=1):
+		return await self._write('hincrby', self._key, self._name, amount)
+
+	def _decode(self, data):
+		return self._value_encoder.decode(data) if data is not None else None
+
+	def _load_command(self):
+		return 'hget', (self._key, self._name), self._decode
+
+	def __eq__(self, other):
+		return super(AsyncHashMemberField, self).__eq__(other) and (self._name == other._name)
+
+	def __hash__(self):
+		return hash((self._key, self._name))
+
+
+class AsyncScoreStringField(AsyncStringField):
+	def __init__(self, key, target_sortedSetField, target_sortedSetField_value, score_encoder=None, redis=None):
+		super(AsyncScoreStringField, self).__init__(key, value_encoder=score_encoder, redis=redis, overwrite=True)
+
+		self._target_sortedSetField = target_sortedSetField
+		self._target_sortedSetField_value = target_sortedSetField_value
+
+	async def set(self, score):
+		await self._target_sortedSetField.add(self._target_sortedSetField_value, score)
+		await super(AsyncScoreStringField, self).set(score)
+
+	async def destroy(self):
+		await self._target_sortedSetField.delete(self._target_sortedSetField_value)
+
+		await super(AsyncScoreStringField, self).destroy()
+
+
+class AsyncScoreHashMemberField(AsyncHashMemberField):
+	def __init__(self, hashField, name, target_sortedSetField, target_sortedSetField_value, score_encoder=None):
+		super(AsyncScoreHashMemberField, self).__init__(hashField, name, value_encoder=score_encoder, overwrite=True)
+
+		self._target_sortedSetField = target_sortedSetField
+		self._target_sortedSetField_value = target_sortedSetField_value
+
+	async def set(self, score):
+		await self._target_sortedSetField.add(self._target_sortedSetField_value, score)
+		await super(AsyncScoreHashMemberField, self).set(score)
+
+	async def destroy(self):
+		await self._target_sortedSetField.delete(self._target_sortedSetField_value)
+
+		await super(AsyncScoreHashMemberField, self).destroy()
+
+
+def get_async_object_encoder(object_class):
+	"""
+	Object encoder for asyncio objects. As like `get_object_encoder`, decoding checks existence of object, but, as encoders
+	can not wait for DB, with blocking call of client, adapted by `Register` of class, which holds event loop for round trip.
+	Use `get_object_id_encoder` to decode objects without check
+	"""
+	def encode(object):
+		assert isinstance(object, object_class)
+		return str(object)
+
+	def decode(code):
+		if code is None: return None
+
+		object_id = _object_id(code)
+		register = object_class._Register
+
+		if register._redis.client.zscore(register._key, register._value_encoder.encode(object_id)) is None:
+			return None
+
+		return object_class(object_id)
+
+	return Encoder(encode, decode)
+
+
+class AsyncUniqueIndex(UniqueIndex):
+	"""
+	Asyncio counterpart of `UniqueIndex`
+	"""
+
+	def __init__(self, attribute, key=None, name_encoder=None, field_class=AsyncHashField):
+		super(AsyncUniqueIndex, self).__init__(attribute, key=key, name_encoder=name_encoder, field_class=field_class)
+
+	async def claim(self, cls, object_id, value):
+		"""
+		As like `UniqueIndex.claim`
+		"""
+		field = self.__get__(None, cls)
+		name = field._name_encoder.encode(value)
+
+		if await field._redis.hsetnx(field._key, name, str(object_id)):
+			return True
+
+		return False if _object_id(await field._redis.hget(field._key, name)) == _object_id(str(object_id)) else None
+
+	async def release(self, cls, object_id, value):
+		"""
+		As like `UniqueIndex.release`, queued, if called inside `AsyncField.batch` block
+		"""
+		field = self.__get__(None, cls)
+		args = (_RELEASE_SCRIPT, 1, field._key, field._name_encoder.encode(value), str(object_id))
+
+		batch = AsyncBatch.Current()
+
+		if batch is not None:
+			return batch.defer(field._redis, 'eval', args)
+
+		return await field._redis.eval(*args)
+
+
+class AsyncRangeIndex(RangeIndex):
+	"""
+	Asyncio counterpart of `RangeIndex`
+	"""
+
+	def __init__(self, attribute, key=None, score_encoder=None, field_class=AsyncSortedSetField):
+		super(AsyncRangeIndex, self).__init__(attribute, key=key, score_encoder=score_encoder, field_class=field_class)
+
+
+class AsyncTagIndex(TagIndex):
+	"""
+	Asyncio counterpart of `TagIndex`
+	"""
+
+	def __init__(self, attribute, key=None, set_class=AsyncSetField):
+		super(AsyncTagIndex, self).__init__(attribute, key=key, set_class=set_class)
+
+
+class AsyncObject(Object):
+	"""
+	Asyncio counterpart of `Object`. Fields of subclasses must be declared with async field classes,
+	indexes with `AsyncUniqueIndex`, `AsyncRangeIndex` and `AsyncTagIndex`. Ids are always taken from DB counter
+	"""
+
+	_Data_Field_Class = AsyncHashField
+	_Member_Field_Classes = {AsyncStringField: AsyncHashMemberField, AsyncScoreStringField: AsyncScoreHashMemberField}
+	_Scalar_Field_Classes = (AsyncStringField, AsyncHashMemberField)
+
+	_Last_Id = ClassField(AsyncStringField, 'last_id')
+	_Expires = ClassField(AsyncSortedSetField, 'exp', score_encoder=datetime_encoder)
+
+	_Register = ClassField(AsyncSortedSetField, 'reg')
+	Register = RegisterClassField('reg', score_encoder=datetime_encoder, field_class=AsyncSortedSetField)
+
+	create_date = ScoreObjectField('Register', score_encoder=datetime_encoder, field_class=AsyncScoreStringField)
+	tag = ObjectField(AsyncStringField)
+
+	@classmethod
+	def _Init_Fields(cls):
+		cls._Encoder = get_async_object_encoder(cls)
+		cls._Id_Encoder = get_object_id_encoder(cls)
+
+		for name, index in cls._Indexes.items():
+			field_class = index.options.get('set_class', index.field_class)
+
+			if not issubclass(field_class, AsyncField) or (isinstance(index, UniqueIndex) and not isinstance(index, AsyncUniqueIndex)):
+				raise Exception('Index %s of %s must be declared with asyncio index and field classes' % (name, cls.__name__))
+
+	@classmethod
+	async def Create(cls, **initial_values):
+		"""
+		As like `Object.Create`
+		"""
+		object_id = await cls._Last_Id._redis.incr(cls._Last_Id._key)
+
+		keys, args = cls._Create_Args(initial_values, object_id)
+		client = None
+
+		if cls._Register._router is not None:
+			clients = {id(cls._Client(key)): cls._Client(key) for key in keys}
+
+			if len(clients) > 1:
+				return (await cls._Create_Objects([cls(object_id)], initial_values))[0]
+
+			client, = clients.values()
+
+		try:
+			await cls._Script()(keys=keys, args=args, client=client)
+		except ResponseError as error:
+			raise Exception(str(error))
+
+		new_object = cls(object_id)
+
+		if cls._Ttl is not None:
+			await new_object.expire()
+
+		return new_object
+
+	@classmethod
+	async def CreateMany(cls, number, chunk_size=1000, **initial_values):
+		"""
+		As like `Object.CreateMany`
+		"""
+		if number <= 0:
+			raise Exception('Number must be positive')
+
+		cls._Check_Initial_Values(initial_values)
+
+		last_id = await cls._Last_Id._redis.incr(cls._Last_Id._key, number)
+
+		return await cls._Create_Objects([cls(object_id) for object_id in range(last_id - number + 1, last_id + 1)], initial_values, chunk_size)
+
+	@classmethod
+	async def _Create_Objects(cls, objects, initial_values, chunk_size=1000):
+		"""
+		As like `Object._Create_Objects`
+		"""
+		create_date = datetime.now()
+		values = dict(initial_values, create_date=create_date)
+		args = cls._Encode_Values(objects[0], values)
+
+		indexes = [(index, values[index.attribute]) for index in cls._Indexes.values() if values.get(index.attribute) is not None]
+
+		unique = [(index, value) for index, value in indexes if isinstance(index, UniqueIndex)]
+
+		if unique and len(objects) > 1:
+			raise Exception('Value of unique index can not be set for many objects')
+
+		if unique:
+			unique = await cls._Claim_Unique(unique, objects[0].object_id)
+			indexes = [(index, value) for index, value in indexes if not isinstance(index, UniqueIndex)]
+
+		try:
+			await cls._Write_New(objects, create_date, args, indexes, chunk_size)
+		except Exception:
+			if unique: await cls._Release_Unique(unique, objects[0].object_id)
+			raise
+
+		return objects
+
+	@classmethod
+	async def _Write_New(cls, objects, create_date, args, indexes, chunk_size):
+		number = len(objects)
+
+		for start in range(0, number, chunk_size):
+			chunk = objects[start:start + chunk_size]
+
+			async with AsyncField.batch() as batch:
+				await cls.Register.add_multi(dict.fromkeys(chunk, create_date))
+
+				for new_object in chunk:
+					if cls._Storage == HASH_STORAGE:
+						batch.defer(new_object._data._redis, 'hmset', (new_object._data._key, dict(zip(args[::2], args[1::2]))))
+					else:
+						for index in range(0, len(args), 2):
+							key = new_object._k(args[index])
+							batch.defer(cls._Client(key), 'set', (key, args[index + 1]))
+
+					for index, value in indexes:
+						await index.add(cls, new_object, value)
+
+					if cls._Ttl is not None:
+						await new_object._defer_expire(batch, cls._Ttl)
+
+	@classmethod
+	async def _Claim_Unique(cls, unique, object_id):
+		"""
+		As like `Object._Claim_Unique`
+		"""
+		claimed = []
+
+		for index, value in unique:
+			result = await index.claim(cls, object_id, value)
+
+			if result is None:
+				await cls._Release_Unique(claimed, object_id)
+				raise Exception('Value of %s is not unique for index %s' % (index.attribute, index.name))
+
+			if result: claimed.append((index, value))
+
+		return claimed
+
+	@classmethod
+	async def _Release_Unique(cls, unique, object_id):
+		# claims are rolled back immediately, even if object is written inside outer batch
+		with AsyncBatch.Suspended():
+			for index, value in unique:
+				await index.release(cls, object_id, value)
+
+	@classmethod
+	async def Get(cls, object_id):
+		if not await cls.Exists(object_id): return None
+
+		return cls(object_id)
+
+	@classmethod
+	async def GetMany(cls, object_ids):
+		"""
+		As like `Object.GetMany`
+		"""
+		object_ids = list(object_ids)
+		scores = await cls._Register.score_of_multi(object_ids)
+
+		return [cls(object_id) if score is not None else None for object_id, score in zip(object_ids, scores)]
+
+	@classmethod
+	async def DeleteMany(cls, object_ids, chunk_size=1000, transaction=False, unlink=False):
+		"""
+		As like `Object.DeleteMany`
+		"""
+		object_ids = list(object_ids)
+		number = 0
+
+		for start in range(0, len(object_ids), chunk_size):
+			number += await cls._Delete_Objects([cls(object_id) for object_id in object_ids[start:start + chunk_size]], transaction, unlink)
+
+		return number
+
+	@classmethod
+	async def _Read_Indexed(cls, objects):
+		"""
+		As like `Object._Read_Indexed`
+		"""
+		attributes = {index.attribute for index in cls._Indexes.values()}
+
+		if not attributes:
+			return [{} for obj in objects]
+
+		batch = AsyncBatch()
+		reads = [obj._defer_read(batch, attributes) for obj in objects]
+		await batch.execute()
+
+		return [read() for read in reads]
+
+	@classmethod
+	async def _Delete_Objects(cls, objects, transaction, unlink):
+		keys, targets, fields = cls._Delete_Plan(objects)
+		indexed = await cls._Read_Indexed(objects)
+
+		for field in fields:
+			await field.destroy()
+
+		async with AsyncField.batch(transaction) as batch:
+			for target, values in targets.values():
+				await target.delete(*values)
+
+			for obj, values in zip(objects, indexed):
+				for index in cls._Indexes.values():
+					if values[index.attribute] is not None:
+						await index.remove(cls, obj, values[index.attribute])
+
+			cls._Defer_Delete(batch, keys, unlink)
+
+			await cls._Expires.delete(*objects)
+			result = await cls._Register.delete(*objects)
+
+		return result.value
+
+	@classmethod
+	async def Find(cls, **conditions):
+		"""
+		As like `Object.Find`
+		"""
+		batch = AsyncBatch()
+		complete = cls._Defer_Find(batch, conditions)
+		await batch.execute()
+
+		return complete()
+
+	@classmethod
+	async def PurgeExpired(cls, limit=None, chunk_size=1000):
+		"""
+		As like `Object.PurgeExpired`
+		"""
+		object_ids = await cls._Expires.range_by_score(max_score=datetime.now(), limit=limit)
+
+		if not object_ids: return 0
+
+		await cls.DeleteMany(object_ids, chunk_size=chunk_size)
+
+		return len(object_ids)
+
+	@classmethod
+	async def Exists(cls, object_id):
+		return await cls._Register.contains(object_id)
+
+	async def load(self, fields=None):
+		"""
+		As like `Object.load`
+		"""
+		batch = AsyncBatch()
+		complete = self._defer_load(batch, fields)
+		await batch.execute()
+
+		return complete()
+
+	async def save(self, transaction=False):
+		"""
+		As like `Object.save`
+		"""
+		changed = self._changed()
+		indexes = [index for index in self._Indexes.values() if index.attribute in changed]
+
+		old_values = await self._read_old_values(indexes)
+
+		unique = [(index, changed[index.attribute]) for index in indexes if isinstance(index, UniqueIndex) and changed[index.attribute] is not None]
+		claimed = await self._Claim_Unique(unique, self.object_id) if unique else []
+
+		try:
+			async with AsyncField.batch(transaction) as batch:
+				for name, value in changed.items():
+					field = getattr(self, name)
+
+					if value is None:
+						await field.destroy()
+					else:
+						await field.set(value)
+
+				for index in indexes:
+					old_value = old_values[index.attribute]
+					value = changed[index.attribute]
+
+					if old_value == value: continue
+
+					if old_value is not None:
+						await index.remove(type(self), self, old_value)
+					if value is not None and not isinstance(index, UniqueIndex):
+						await index.add(type(self), self, value)
+
+				if self._Ttl is not None and changed:
+					await self._defer_expire(batch, self._Ttl)
+		except Exception:
+			if claimed: await self._Release_Unique(claimed, self.object_id)
+			raise
+
+		self._saved.update(changed)
+
+		return set(changed)
+
+	async def _read_old_values(self, indexes):
+		"""
+		As like `Object._read_old_values`
+		"""
+		unknown = {index.attribute for index in indexes if index.attribute not in self._saved}
+
+		if not unknown:
+			return {index.attribute: self._saved[index.attribute] for index in indexes}
+
+		batch = AsyncBatch()
+		read = self._defer_read(batch, unknown)
+		await batch.execute()
+
+		return dict({index.attribute: self._saved.get(index.attribute) for index in indexes}, **read())
+
+	async def expire(self, seconds=None):
+		"""
+		As like `Object.expire`
+		"""
+		seconds = seconds if seconds is not None else self._Ttl
+
+		if seconds is None:
+			raise Exception('Time to live is not specified')
+
+		async with AsyncField.batch() as batch:
+			await self._defer_expire(batch, seconds)
+
+	async def _defer_expire(self, batch, seconds):
+		if isinstance(seconds, timedelta): seconds = seconds.total_seconds()
+
+		milliseconds = int((seconds + self._Expire_Grace) * 1000)
+
+		for redis, keys in self._Keys(self).values():
+			for key in keys:
+				batch.defer(redis, 'pexpire', (key, milliseconds))
+
+		await self._Expires.add(self, datetime.now() + timedelta(seconds=seconds))
+
+	async def persist(self):
+		"""
+		As like `Object.persist`
+		"""
+		async with AsyncField.batch() as batch:
+			for redis, keys in self._Keys(self).values():
+				for key in keys:
+					batch.defer(redis, 'persist', (key, ))
+
+			await self._Expires.delete(self)
+
+	async def ttl(self):
+		"""
+		As like `Object.ttl`
+		"""
+		timestamp = await self._Expires.score_of(self)
+
+		return timestamp - datetime.now().timestamp() if timestamp is not None else None
+
+	async def delete(self, transaction=False, unlink=False):
+		"""
+		As like `Object.delete`
+		"""
+		return bool(await self._Delete_Objects([self], transaction, unlink))
@@ -0,0 +1,391 @@
+__author__ = 'Nuclight.atomAltera'
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from time import monotonic
+import threading
+
+
+class FieldCache():
+	"""
+	Local LRU cache of decoded values, read by fields. Field uses cache, if it was passed to field constructor.
+	Writes through field invalidate cached values of its key. Changes, made by other clients, are seen after
+	'ttl' expiration, or immediately, if `TrackingInvalidator` or `ChannelInvalidator` is attached.
+	Cached values are returned by reference, so mutable values (as like decoded dictionaries) must not be changed
+	in place, copy them before
+	"""
+
+	def __init__(self, max_size=10000, ttl=None):
+		"""
+		max_size
+			maximum number of cached values, least recently used values are evicted first
+
+		ttl
+			seconds, cached value is valid for, if None, values are valid until invalidated or evicted
+		"""
+		self._max_size = max_size
+		self._ttl = ttl
+
+		self._entries = OrderedDict()
+		self._subs = {}
+		# [version, number of loads] by key, kept only while values of key are being loaded
+		self._versions = {}
+		# incremented by `FieldCache.clear`, loaded values are not cached, if it was changed while loading
+		self._generation = 0
+		# number of `FieldCache.suspend` calls without `FieldCache.resume`, values are not cached while positive
+		self._suspended = 0
+		self._write_listeners = []
+		self._lock = threading.Lock()
+
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self.invalidations = 0
+
+	def get(self, key, sub, loader):
+		"""
+		Returns cached value for 'sub' (name of read, e.g. hash name) of 'key', or value, returned by 'loader',
+		which is cached then
+		"""
+		entry_key = (key, sub)
+
+		with self._lock:
+			entry = self._entries.get(entry_key)
+
+			if entry is not None and (entry[1] is None or entry[1] > monotonic()):
+				self._entries.move_to_end(entry_key)
+				self.hits += 1
+
+				return entry[0]
+
+			self.misses += 1
+
+			loading = self._versions.setdefault(key, [0, 0])
+			loading[1] += 1
+			version = loading[0], self._generation
+
+		loaded = False
+
+		try:
+			value = loader()
+			loaded = True
+		finally:
+			with self._lock:
+				loading = self._versions[key]
+
+				# value could be changed while loading
+				if loaded and (loading[0], self._generation) == version and not self._suspended:
+					self._put(entry_key, value)
+
+				loading[1] -= 1
+				if not loading[1]: del self._versions[key]
+
+		return value
+
+	def _put(self, entry_key, value):
+		expires = monotonic() + self._ttl if self._ttl is not None else None
+
+		self._entries[entry_key] = (value, expires)
+		self._entries.move_to_end(entry_key)
+		self._subs.setdefault(entry_key[0], set()).add(entry_key[1])
+
+		while len(self._entries) > self._max_size:
+			(key, sub), value = self._entries.popitem(last=False)
+			self._discard_sub(key, sub)
+
+			self.evictions += 1
+
+	def _discard_sub(self, key, sub):
+		subs = self._subs.get(key)
+
+		if subs is not None:
+			subs.discard(sub)
+			if not subs: del self._subs[key]
+
+	def invalidate(self, *keys):
+		"""
+		Drops cached values of 'keys'
+		"""
+		with self._lock:
+			for key in keys:
+				loading = self._versions.get(key)
+				if loading is not None: loading[0] += 1
+
+				for sub in self._subs.pop(key, ()):
+					del self._entries[(key, sub)]
+					self.invalidations += 1
+
+	def clear(self):
+		"""
+		Drops all cached values
+		"""
+		with self._lock:
+			self._generation += 1
+			self.invalidations += len(self._entries)
+
+			self._entries.clear()
+			self._subs.clear()
+
+	def suspend(self):
+		"""
+		Drops all cached values and stops caching new ones until `FieldCache.resume`. Used by invalidators,
+		while they can not receive invalidation messages, so reads go to DB
+		"""
+		with self._lock:
+			self._suspended += 1
+
+		self.clear()
+
+	def resume(self):
+		"""
+		Resumes caching, stopped by `FieldCache.suspend`
+		"""
+		with self._lock:
+			if self._suspended: self._suspended -= 1
+
+	@property
+	def suspended(self):
+		return self._suspended > 0
+
+	def written(self, key):
+		"""
+		Called by fields after write to 'key'
+		"""
+		self.invalidate(key)
+
+		for listener in self._write_listeners:
+			listener(key)
+
+	def queued(self, key, batch):
+		"""
+		Called by fields, when write to 'key' is queued to 'batch'. Listeners queue their commands to the same batch,
+		cached values are dropped by `FieldCache.invalidate` after batch is executed
+		"""
+		for listener in self._write_listeners:
+			listener(key, batch)
+
+	def add_write_listener(self, listener):
+		"""
+		Adds 'listener', function, called with key after each write and with key and batch, when write is queued to batch
+		"""
+		self._write_listeners.append(listener)
+
+	def stats(self):
+		"""
+		Returns dictionary of cache counters
+		"""
+		with self._lock:
+			return {
+				'size': len(self._entries),
+				'hits': self.hits,
+				'misses': self.misses,
+				'evictions': self.evictions,
+				'invalidations': self.invalidations,
+			}
+
+	def __len__(self):
+		return len(self._entries)
+
+
+class _Invalidator(ABC):
+	"""
+	Base class of invalidators, which listen invalidation messages in background thread. If connection is lost,
+	cache is suspended (see `FieldCache.suspend`) and listening thread reconnects with growing delay
+	"""
+
+	# Seconds, listening thread waits for message before checking, whether it must be stopped
+	_Poll_Interval = 0.5
+	# Seconds before second reconnection attempt, delay is doubled after each failed one up to maximum
+	_Reconnect_Delay = 0.1
+	_Max_Reconnect_Delay = 10.0
+
+	def __init__(self, cache, redis):
+		self._cache = cache
+		self._redis = redis
+		self._connections = []
+		self._suspended = False
+		self._thread = None
+		self._stopping = threading.Event()
+
+		self.reconnects = 0
+
+	def _acquire(self):
+		"""
+		Returns connection from pool of redis client, which is disconnected and released by `_Invalidator._release`
+		"""
+		connection = self._redis.connection_pool.get_connection('SUBSCRIBE')
+		self._connections.append(connection)
+
+		return connection
+
+	def _release(self):
+		pool = self._redis.connection_pool
+
+		for connection in self._connections:
+			connection.disconnect()
+			pool.release(connection)
+
+		self._connections = []
+
+	@abstractmethod
+	def _connect(self):
+		"""
+		Returns connection, subscribed to invalidation messages. Connections must be taken with `_Invalidator._acquire`
+		"""
+
+	def _listen(self, connection):
+		delay = self._Reconnect_Delay
+
+		while not self._stopping.is_set():
+			if connection is None:
+				try:
+					connection = self._connect()
+				except Exception:
+					self._release()
+
+					self._stopping.wait(delay)
+					delay = min(delay * 2, self._Max_Reconnect_Delay)
+
+					continue
+
+				# suspended cache is empty, so no message could be missed
+				self._cache.resume()
+				self._suspended = False
+
+				delay = self._Reconnect_Delay
+				self.reconnects += 1
+
+			try:
+				if not connection.can_read(timeout=self._Poll_Interval): continue
+				response = connection.read_response()
+			except Exception:
+				# values can not be trusted, until subscription is restored
+				self._cache.suspend()
+				self._suspended = True
+
+				self._release()
+				connection = None
+
+				continue
+
+			if response[0] in (b'message', 'message'):
+				self._invalidate(response[2])
+
+	@abstractmethod
+	def _invalidate(self, data):
+		"""
+		Drops cached values, named by invalidation message 'data'
+		"""
+
+	def start(self):
+		"""
+		Subscribes and starts listening in daemon thread
+		"""
+		if self._thread is not None:
+			raise Exception('Invalidator already started')
+
+		self._stopping.clear()
+
+		try:
+			connection = self._connect()
+		except Exception:
+			self._release()
+			raise
+
+		self._thread = threading.Thread(target=self._listen, args=(connection, ), daemon=True)
+		self._thread.start()
+
+		return self
+
+	def stop(self):
+		"""
+		Stops listening and releases connections
+		"""
+		if self._thread is None: return
+
+		self._stopping.set()
+		self._thread.join()
+
+		self._release()
+
+		if self._suspended:
+			self._cache.resume()
+			self._suspended = False
+
+		self._thread = None
+
+
+class TrackingInvalidator(_Invalidator):
+	"""
+	Invalidates cached values with server assisted client side caching (Redis 6+). Uses broadcasting mode,
+	so DB sends invalidation messages about all changed keys, started with 'prefixes'
+	"""
+
+	def __init__(self, cache, redis, prefixes=()):
+		"""
+		prefixes
+			key prefixes of cached fields, all keys by default
+		"""
+		super(TrackingInvalidator, self).__init__(cache, redis)
+
+		self._prefixes = prefixes
+
+	def _connect(self):
+		connection = self._acquire()
+		connection.send_command('CLIENT', 'ID')
+		client_id = connection.read_response()
+
+		connection.send_command('SUBSCRIBE', '__redis__:invalidate')
+		connection.read_response()
+
+		args = ['CLIENT', 'TRACKING', 'on', 'REDIRECT', client_id, 'BCAST']
+
+		for prefix in self._prefixes:
+			args += ['PREFIX', prefix]
+
+		# tracking lasts while this connection is open
+		tracking_connection = self._acquire()
+		tracking_connection.send_command(*args)
+		tracking_connection.read_response()
+
+		return connection
+
+	def _invalidate(self, data):
+		if data is None:
+			# DB was flushed
+			self._cache.clear()
+		else:
+			self._cache.invalidate(*(key.decode(encoding='utf-8') for key in data))
+
+
+class ChannelInvalidator(_Invalidator):
+	"""
+	Invalidates cached values with pub/sub channel. Each write through field with attached cache publishes its key
+	to channel, so all processes, sharing channel, drop cached values. Works with any Redis version,
+	but changes, not made through cached fields, are not seen. Writes, queued to batch, are published in the same batch,
+	after write commands of the same client
+	"""
+
+	def __init__(self, cache, redis, channel='orewrap:invalidate'):
+		super(ChannelInvalidator, self).__init__(cache, redis)
+
+		self._channel = channel
+
+		cache.add_write_listener(self._publish)
+
+	def _publish(self, key, batch=None):
+		if batch is not None:
+			batch.defer(self._redis, 'publish', (self._channel, key))
+		else:
+			self._redis.publish(self._channel, key)
+
+	def _connect(self):
+		connection = self._acquire()
+
+		connection.send_command('SUBSCRIBE', self._channel)
+		connection.read_response()
+
+		return connection
+
+	def _invalidate(self, data):
+		self._cache.invalidate(data.decode(encoding='utf-8'))
@@ -0,0 +1,335 @@
+__author__ = 'Nuclight.atomAltera'
+
+from time import monotonic
+import threading
+import atexit
+import os
+
+from .instrumentation import unwrap
+
+
+class CounterBuffer():
+	"""
+	Write-behind buffer of increments. `StringField.increment` of fields, constructed with buffer, adds amount to
+	pending delta of key in process instead of sending INCRBY. Deltas are sent with one pipeline per redis client
+	every 'interval' seconds by background thread, when number of pending keys or increments reaches limit,
+	and at interpreter exit. Increments are not visible to readers until flush and are lost, if process is killed
+	"""
+
+	def __init__(self, interval=1.0, max_keys=10000, max_increments=100000, max_failures=3):
+		"""
+		interval
+			seconds between flushes of background thread
+
+		max_keys
+			number of pending keys, which triggers flush
+
+		max_increments
+			number of buffered increments, which triggers flush
+
+		max_failures
+			number of failed flushes of key, after which its delta is dropped (see `CounterBuffer.stats`)
+		"""
+		self._interval = interval
+		self._max_keys = max_keys
+		self._max_increments = max_increments
+		self._max_failures = max_failures
+
+		# (id of redis client, key) -> [redis client, key, delta, monotonic time of first increment, field,
+		# number of increments, number of failed flushes]
+		self._pending = {}
+		self._increments = 0
+		self._lock = threading.Lock()
+		self._flush_lock = threading.Lock()
+
+		self._thread = None
+		self._stopping = threading.Event()
+		self._wakeup = threading.Event()
+
+		self.flushes = 0
+		self.flushed_keys = 0
+		self.flushed_increments = 0
+		self.errors = 0
+		self.dropped_keys = 0
+		self.dropped_increments = 0
+		self.last_error = None
+		self.last_flush_duration = None
+		self.max_flush_duration = 0.0
+		self.last_flush_delay = None
+		self.max_flush_delay = 0.0
+
+	def add(self, field, amount):
+		"""
+		Adds 'amount' to pending delta of key of 'field'
+
+		return value
+			pending delta of key of 'field' including 'amount', as it was before flush, caused by this call
+		"""
+		redis = unwrap(field._redis)
+		entry_key = (id(redis), field._key)
+
+		with self._lock:
+			entry = self._pending.get(entry_key)
+
+			if entry is None:
+				self._pending[entry_key] = [redis, field._key, amount, monotonic(), field, 1, 0]
+				delta = amount
+			else:
+				entry[2] += amount
+				entry[5] += 1
+				delta = entry[2]
+
+			self._increments += 1
+			full = len(self._pending) >= self._max_keys or self._increments >= self._max_increments
+
+		if full:
+			if self._thread is not None:
+				self._wakeup.set()
+			else:
+				self.flush()
+
+		return delta
+
+	def pending(self, field=None):
+		"""
+		Returns pending delta of key of 'field', or dictionary of pending deltas by key, if 'field' is None
+		"""
+		with self._lock:
+			if field is not None:
+				entry = self._pending.get((id(unwrap(field._redis)), field._key))
+				return entry[2] if entry is not None else 0
+
+			return {entry[1]: entry[2] for entry in self._pending.values()}
+
+	def flush(self):
+		"""
+		Sends all pending deltas with one pipeline per redis client. Deltas of failed commands are returned to buffer,
+		deltas, failed 'max_failures' times, are dropped. If any command failed, the last error is raised
+		after all pipelines are sent
+
+		return value
+			number of flushed keys
+		"""
+		with self._flush_lock:
+			with self._lock:
+				pending, self._pending = self._pending, {}
+				self._increments = 0
+
+			if not pending: return 0
+
+			started = monotonic()
+
+			clients = {}
+
+			for entry in pending.values():
+				clients.setdefault(id(entry[0]), (entry[0], []))[1].append(entry)
+
+			flushed = []
+			failed = []
+			error = None
+
+			for redis, entries in clients.values():
+				pipeline = redis.pipeline(False)
+
+				for entry in entries:
+					pipeline.incr(entry[1], entry[2])
+					if entry[4]._ttl is not None: pipeline.expire(entry[1], entry[4]._ttl)
+
+				try:
+					results = iter(pipeline.execute(raise_on_error=False))
+				except Exception as exception:
+					# connection error, none of deltas is known to be applied
+					error = exception
+					failed += entries
+					continue
+
+				for entry in entries:
+					result = next(results)
+					if entry[4]._ttl is not None: next(results)
+
+					if isinstance(result, Exception):
+						error = result
+						failed.append(entry)
+					else:
+						flushed.append(entry)
+
+			for client, key, delta, first, field, increments, failures in flushed:
+				if field._cache is not None: field._cache.written(key)
+
+			dropped = self._restore(failed)
+
+			finished = monotonic()
+
+			with self._lock:
+				self.flushes += 1
+				self.flushed_keys += len(flushed)
+				self.flushed_increments += sum(entry[5] for entry in flushed)
+				self.errors += len(failed)
+				self.dropped_keys += len(dropped)
+				self.dropped_increments += sum(entry[5] for entry in dropped)
+				if error is not None: self.last_error = error
+
+				self.last_flush_duration = finished - started
+				self.max_flush_duration = max(self.max_flush_duration, self.last_flush_duration)
+
+				self.last_flush_delay = finished - min(entry[3] for entry in pending.values())
+				self.max_flush_delay = max(self.max_flush_delay, self.last_flush_delay)
+
+			if error is not None:
+				raise error
+
+			return len(flushed)
+
+	def _restore(self, entries):
+		"""
+		Returns deltas of failed 'entries' to buffer
+
+		return value
+			list of dropped entries, which failed too many times
+		"""
+		dropped = []
+
+		with self._lock:
+			for client, key, delta, first, field, increments, failures in entries:
+				if failures + 1 >= self._max_failures:
+					dropped.append((client, key, delta, first, field, increments, failures + 1))
+					continue
+
+				entry = self._pending.get((id(client), key))
+
+				if entry is None:
+					self._pending[(id(client), key)] = [client, key, delta, first, field, increments, failures + 1]
+				else:
+					entry[2] += delta
+					entry[3] = min(entry[3], first)
+					entry[5] += increments
+					entry[6] = max(entry[6], failures + 1)
+
+				self._increments += increments
+
+		return dropped
+
+	def _run(self):
+		while not self._stopping.is_set():
+			self._wakeup.wait(self._interval)
+			self._wakeup.clear()
+
+			try:
+				self.flush()
+			except Exception:
+				# failed deltas stay in buffer and are sent with next flush, until they fail 'max_failures' times
+				pass
+
+	def start(self):
+		"""
+		Starts flushing in daemon thread, pending deltas are also flushed at interpreter exit
+		"""
+		if self._thread is not None:
+			raise Exception('Counter buffer already started')
+
+		self._stopping.clear()
+
+		self._thread = threading.Thread(target=self._run, daemon=True, name='orewrap-counters')
+		self._thread.start()
+
+		atexit.register(self.stop)
+
+		return self
+
+	def stop(self):
+		"""
+		Stops background thread and flushes pending deltas
+		"""
+		if self._thread is not None:
+			self._stopping.set()
+			self._wakeup.set()
+			self._thread.join()
+
+			self._thread = None
+			atexit.unregister(self.stop)
+
+		self.flush()
+
+	def stats(self):
+		"""
+		Returns dictionary of buffer counters. Delays are seconds between first buffered increment and its flush,
+		dropped keys and increments are ones, which failed to flush 'max_failures' times and were lost
+		"""
+		with self._lock:
+			return {
+				'pending_keys': len(self._pending),
+				'pending_increments': self._increments,
+				'flushes': self.flushes,
+				'flushed_keys': self.flushed_keys,
+				'flushed_increments': self.flushed_increments,
+				'errors': self.errors,
+				'dropped_keys': self.dropped_keys,
+				'dropped_increments': self.dropped_increments,
+				'last_error': self.last_error,
+				'last_flush_duration': self.last_flush_duration,
+				'max_flush_duration': self.max_flush_duration,
+				'last_flush_delay': self.last_flush_delay,
+				'max_flush_delay': self.max_flush_delay,
+			}
+
+	def __len__(self):
+		return len(self._pending)
+
+class IdBlockAllocator():
+	"""
+	Allocates ids from blocks, reserved in counter field with single INCRBY, so creating objects does not
+	increment shared counter each time. Ids are unique, but not ordered between processes, and ids, left in block,
+	are lost when process exits. Block is dropped after fork, so child processes reserve their own blocks
+	"""
+
+	def __init__(self, field, block_size=100):
+		"""
+		field
+			`StringField`, holding last reserved id
+
+		block_size
+			number of ids, reserved at once
+		"""
+		if block_size < 1:
+			raise Exception('Block size must be positive')
+
+		self._field = field
+		self._block_size = block_size
+
+		self._lock = threading.Lock()
+		self._pid = None
+		self._next = 0
+		self._last = -1
+
+		self.reserved_blocks = 0
+
+	def allocate(self, number=1):
+		"""
+		Returns list of 'number' unique ids
+		"""
+		with self._lock:
+			if self._pid != os.getpid():
+				self._pid = os.getpid()
+				self._next, self._last = 0, -1
+
+			taken = min(number, self._last - self._next + 1)
+			ids = list(range(self._next, self._next + taken))
+			self._next += taken
+
+			if taken < number:
+				size = max(self._block_size, number - taken)
+				self._last = self._field._redis.incr(self._field._key, size)
+				self._next = self._last - size + 1
+				self.reserved_blocks += 1
+
+				ids += range(self._next, self._next + number - taken)
+				self._next += number - taken
+
+			return ids
+
+	def remaining(self):
+		"""
+		Returns number of ids, left in current block
+		"""
+		with self._lock:
+			return self._last - self._next + 1 if self._pid == os.getpid() else 0
\ No newline at end of file
@@ -1,7 +1,5 @@
 __author__ = 'Nuclight.atomAltera'
 
-from functools import reduce
-
 class Encoder():
 	def __init__(self, encoder=None, decoder=None):
 		if encoder is not None: self.encode = encoder
@@ -13,24 +11,75 @@ class Encoder():
 	def decode(self, code):
 		return code
 
+	def encode_many(self, values):
+		"""
+		Encodes collection of values, returns list
+		"""
+		return list(map(self.encode, values))
+
+	def decode_many(self, codes):
+		"""
+		Decodes collection of codes, returns list
+		"""
+		return list(map(self.decode, codes))
+
+
+def _is_identity(encoder, name):
+	return name not in vars(encoder) and getattr(type(encoder), name) is getattr(Encoder, name)
+
+
+def _compose(functions):
+	"""
+	Returns single function, applying 'functions' one after another
+	"""
+	if not functions:
+		return lambda value: value
+
+	if len(functions) == 1:
+		return functions[0]
+
+	if len(functions) == 2:
+		first, second = functions
+		return lambda value: second(first(value))
+
+	def composed(value):
+		for function in functions:
+			value = function(value)
+
+		return value
+
+	return composed
+
+
+class EncodeQueue(Encoder):
+	"""
+	Chain of encoders. Encoding functions are applied in given order, decoding ones in reversed.
+	Chain is composed into single function once, identity encoders are skipped
+	"""
 
-class EncodeQueue():
 	def __init__(self, *encoders):
-		filterFunc = lambda func: func is not None
+		self._encoders = [encoder.encode for encoder in encoders if not _is_identity(encoder, 'encode')]
+		self._decoders = [encoder.decode for encoder in reversed(encoders) if not _is_identity(encoder, 'decode')]
 
-		self._encoders = list(filter(filterFunc, (encoder.encode for encoder in encoders)))
-		self._decoders = list(filter(filterFunc, (encoder.decode for encoder in reversed(encoders))))
+		self.encode = _compose(self._encoders)
+		self.decode = _compose(self._decoders)
 
-	def encode(self, value):
-		return reduce(lambda value, encoder: encoder(value), self._encoders, value)
+	def encode_many(self, values):
+		for encoder in self._encoders:
+			values = map(encoder, values)
 
-	def decode(self, code):
-		return reduce(lambda code, decoder: decoder(code), self._decoders, code)
+		return list(values)
+
+	def decode_many(self, codes):
+		for decoder in self._decoders:
+			codes = map(decoder, codes)
+
+		return list(codes)
 
 
 string_encoder = Encoder(
 	lambda value: str(value).encode(encoding='utf-8'),
-	lambda code: code.decode(encoding='utf-8')
+	bytes.decode
 )
 
 
@@ -40,14 +89,285 @@ lowercase_encoder = Encoder(
 )
 
 from datetime import datetime
+from time import localtime
 
-datetime_encoder = Encoder(
-	lambda value: value.timestamp(),
-	lambda code: datetime.fromtimestamp(float(code))
-)
+class DateTimeEncoder(Encoder):
+	"""
+	Encodes datetime as timestamp. Naive datetimes are local time, as like `datetime.fromtimestamp`.
+	Arrays of scores are encoded and decoded with vectorized NumPy operations, NumPy datetime64 values
+	have no timezone and are treated as local time too, so both ways give the same wall clock time
+	"""
+
+	# Seconds, local UTC offset is assumed to be constant within (timezones shift by quarters of hour)
+	_Offset_Step = 900
+
+	def encode(self, value):
+		return value.timestamp()
+
+	def decode(self, code):
+		return datetime.fromtimestamp(float(code))
+
+	def _offsets(self, timestamps):
+		"""
+		Returns array of local UTC offsets in seconds at 'timestamps', looked up once per distinct quarter of hour
+		"""
+		import numpy
+
+		steps, inverse = numpy.unique(numpy.floor(timestamps / self._Offset_Step), return_inverse=True)
+		offsets = numpy.array([localtime(int(step) * self._Offset_Step).tm_gmtoff for step in steps], dtype=numpy.float64)
+
+		return offsets[inverse.reshape(-1)].reshape(timestamps.shape)
+
+	def encode_array(self, values):
+		"""
+		Encodes datetime64 array (or collection of datetimes) to float64 array of timestamps
+		"""
+		import numpy
+
+		values = numpy.asarray(values)
+
+		if numpy.issubdtype(values.dtype, numpy.datetime64):
+			wall = values.astype('datetime64[us]').astype(numpy.int64) / 1e6
+
+			# offset at wall time, read as UTC, is corrected by offset at resulting moment
+			timestamps = wall - self._offsets(wall)
+			return wall - self._offsets(timestamps)
+
+		return numpy.fromiter(map(self.encode, values), numpy.float64, len(values))
+
+	def decode_array(self, codes):
+		"""
+		Decodes array of timestamps to datetime64 array
+		"""
+		import numpy
+
+		timestamps = numpy.asarray(codes, dtype=numpy.float64)
+
+		return numpy.round((timestamps + self._offsets(timestamps)) * 1e6).astype(numpy.int64).astype('datetime64[us]')
+
+
+datetime_encoder = DateTimeEncoder()
 
 import base64
 
 base64_encoder = Encoder(base64.b64encode, base64.b64decode)
 base32_encoder = Encoder(base64.b32encode, base64.b32decode)
 base16_encoder = Encoder(base64.b16encode, base64.b16decode)
+
+
+def serializer_encoder(serializer):
+	"""
+	Returns encoder, which dumps and loads values with 'serializer' (see `orewrap.serializers`)
+	"""
+	return Encoder(serializer.dump, serializer.load)
+
+
+from . import serializers
+
+# Registry of named encoders. Values are encoders or factories, called once on first lookup,
+# so encoders with optional dependencies are created only when used
+_Encoders = {
+	'string': string_encoder,
+	'lowercase': lowercase_encoder,
+	'datetime': datetime_encoder,
+	'base64': base64_encoder,
+	'int64': serializer_encoder(serializers.int64Serializer),
+	'float64': serializer_encoder(serializers.float64Serializer),
+	'timestamp': serializer_encoder(serializers.timestampSerializer),
+	'zlib': lambda: serializer_encoder(serializers.CompressSerializer()),
+	'lz4': lambda: serializer_encoder(serializers.CompressSerializer(method='lz4')),
+	'msgpack': lambda: serializer_encoder(serializers.MsgPackSerializer()),
+	'msgpack_zlib': lambda: serializer_encoder(serializers.CompressSerializer(serializers.MsgPackSerializer())),
+	'msgpack_lz4': lambda: serializer_encoder(serializers.CompressSerializer(serializers.MsgPackSerializer(), method='lz4')),
+}
+
+
+def register_encoder(name, encoder):
+	"""
+	Registers encoder under 'name', so it can be passed to fields by name
+
+	encoder
+		`Encoder` instance or callable without arguments, returning it
+	"""
+	_Encoders[name] = encoder
+
+
+def get_encoder(encoder):
+	"""
+	Returns encoder, registered under name 'encoder', or 'encoder' itself, if it is not a string
+	"""
+	if not isinstance(encoder, str):
+		return encoder
+
+	try:
+		registered = _Encoders[encoder]
+	except KeyError:
+		raise Exception('Unknown encoder: %s' % encoder)
+
+	if not isinstance(registered, Encoder):
+		registered = _Encoders[encoder] = registered()
+
+	return registered
+
+
+import struct
+
+class SchemaEncoder(Encoder):
+	"""
+	Encodes dictionaries with declared set of typed fields to fixed binary layout. Fixed width fields are packed first,
+	then end offsets of variable length ('str', 'bytes') ones, then their data. Decoding returns lazy `SchemaValue` view
+	over received buffer, each attribute is unpacked only when read
+	"""
+
+	_Fixed_Types = {
+		'bool': '?',
+		'int8': 'b', 'int16': 'h', 'int32': 'i', 'int64': 'q',
+		'uint8': 'B', 'uint16': 'H', 'uint32': 'I', 'uint64': 'Q',
+		'float32': 'f', 'float64': 'd',
+		'datetime': 'd',
+	}
+	_Variable_Types = ('str', 'bytes')
+
+	def __init__(self, *schema):
+		"""
+		schema
+			pairs (name, type), where type is one of 'bool', 'int8'...'int64', 'uint8'...'uint64', 'float32', 'float64',
+			'datetime', 'str' or 'bytes'
+		"""
+		self._types = {}
+		self._fixed = []
+		self._variable = []
+
+		for name, type in schema:
+			if name in self._types:
+				raise Exception('Duplicate schema field: %s' % name)
+
+			if type in self._Fixed_Types:
+				self._fixed.append(name)
+			elif type in self._Variable_Types:
+				self._variable.append(name)
+			else:
+				raise Exception('Unknown schema type: %s' % type)
+
+			self._types[name] = type
+
+		self.names = tuple(name for name, type in schema)
+
+		self._fixed_struct = struct.Struct('<' + ''.join(self._Fixed_Types[self._types[name]] for name in self._fixed))
+		self._offsets_struct = struct.Struct('<%dI' % len(self._variable))
+		self._header_size = self._fixed_struct.size + self._offsets_struct.size
+
+		# name -> (struct, position) for fixed fields, name -> index for variable ones
+		self._positions = {}
+		position = 0
+
+		for name in self._fixed:
+			field_struct = struct.Struct('<' + self._Fixed_Types[self._types[name]])
+			self._positions[name] = (field_struct, position)
+			position += field_struct.size
+
+		for index, name in enumerate(self._variable):
+			self._positions[name] = index
+
+	def encode(self, value):
+		if isinstance(value, SchemaValue) and value._encoder is self:
+			return bytes(value._buffer)
+
+		try:
+			fixed = [value[name] for name in self._fixed]
+			variable = [value[name] for name in self._variable]
+		except KeyError as error:
+			raise Exception('Value has no schema field: %s' % error.args[0])
+
+		for index, name in enumerate(self._fixed):
+			if self._types[name] == 'datetime':
+				fixed[index] = fixed[index].timestamp()
+
+		variable = [item.encode(encoding='utf-8') if isinstance(item, str) else bytes(item) for item in variable]
+
+		offsets = []
+		end = 0
+
+		for item in variable:
+			end += len(item)
+			offsets.append(end)
+
+		return b''.join([self._fixed_struct.pack(*fixed), self._offsets_struct.pack(*offsets)] + variable)
+
+	def decode(self, code):
+		if len(code) < self._header_size:
+			raise Exception('Encoded value is shorter than schema header')
+
+		return SchemaValue(self, memoryview(code))
+
+	def _read(self, buffer, name):
+		position = self._positions[name]
+		type = self._types[name]
+
+		if type in self._Variable_Types:
+			start = self._fixed_struct.size + 4 * position
+			begin = struct.unpack_from('<I', buffer, start - 4)[0] if position else 0
+			end = struct.unpack_from('<I', buffer, start)[0]
+
+			data = buffer[self._header_size + begin:self._header_size + end]
+
+			return str(data, encoding='utf-8') if type == 'str' else bytes(data)
+
+		field_struct, offset = position
+		value = field_struct.unpack_from(buffer, offset)[0]
+
+		return datetime.fromtimestamp(value) if type == 'datetime' else value
+
+
+class SchemaValue():
+	"""
+	Read-only view of value, decoded by `SchemaEncoder`. Attributes are available by key and as properties
+	"""
+	__slots__ = ('_encoder', '_buffer')
+
+	def __init__(self, encoder, buffer):
+		self._encoder = encoder
+		self._buffer = buffer
+
+	def __getitem__(self, name):
+		if name not in self._encoder._types:
+			raise KeyError(name)
+
+		return self._encoder._read(self._buffer, name)
+
+	def __getattr__(self, name):
+		try:
+			return self[name]
+		except KeyError:
+			raise AttributeError(name)
+
+	def __contains__(self, name):
+		return name in self._encoder._types
+
+	def __iter__(self):
+		return iter(self._encoder.names)
+
+	def __len__(self):
+		return len(self._encoder.names)
+
+	def keys(self):
+		return self._encoder.names
+
+	def to_dict(self):
+		"""
+		Returns dictionary of all attributes
+		"""
+		return {name: self[name] for name in self._encoder.names}
+
+	def __eq__(self, other):
+		if isinstance(other, SchemaValue):
+			other = other.to_dict()
+
+		return self.to_dict() == other
+
+	def __hash__(self):
+		# consistent with equality of values of different encoders, so values can be members of sets
+		return hash(frozenset(self.to_dict().items()))
+
+	def __repr__(self):
+		return 'SchemaValue(%r)' % self.to_dict()
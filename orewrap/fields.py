@@ -1,6 +1,245 @@
 __author__ = 'Nuclight.atomAltera'
 
-from .encoders import string_encoder
+from .encoders import string_encoder, get_encoder
+from .routing import Router
+from .instrumentation import InstrumentedClient
+from . import instrumentation
+
+import threading
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from time import perf_counter
+
+from redis.exceptions import ResponseError
+
+from base64 import urlsafe_b64encode, urlsafe_b64decode
+
+
+# Returns page of sorted set after cursor element. Position of cursor element is found with ZRANK, if it was removed,
+# page starts after elements with lower score and elements with equal score, ordered before it
+_PAGE_SCRIPT = """
+local key, member, score, size = KEYS[1], ARGV[1], ARGV[2], tonumber(ARGV[3])
+local desc = ARGV[4] == '1'
+local start = 0
+
+if member ~= '' then
+	local rank = redis.call(desc and 'ZREVRANK' or 'ZRANK', key, member)
+
+	if rank then
+		start = rank + 1
+	else
+		if desc then
+			start = redis.call('ZCOUNT', key, '(' .. score, '+inf')
+		else
+			start = redis.call('ZCOUNT', key, '-inf', '(' .. score)
+		end
+
+		while true do
+			local item = redis.call(desc and 'ZREVRANGE' or 'ZRANGE', key, start, start, 'WITHSCORES')
+
+			if #item == 0 or tonumber(item[2]) ~= tonumber(score) then break end
+			if (desc and item[1] < member) or (not desc and item[1] > member) then break end
+
+			start = start + 1
+		end
+	end
+end
+
+return redis.call(desc and 'ZREVRANGE' or 'ZRANGE', key, start, start + size - 1, 'WITHSCORES')
+"""
+
+
+def _milliseconds(seconds):
+	if isinstance(seconds, timedelta):
+		return int(seconds.total_seconds() * 1000)
+
+	return int(seconds * 1000)
+
+
+class DeferredResult():
+	"""
+	Result of command, queued in `Batch`. Value becomes available when batch is executed
+	"""
+
+	def __init__(self, callback=None):
+		self._callback = callback
+		self._resolved = False
+		self._value = None
+
+	def _resolve(self, value):
+		self._value = self._callback(value) if self._callback is not None else value
+		self._resolved = True
+
+	@property
+	def resolved(self):
+		"""
+		True, if batch, containing command, has been executed
+		"""
+		return self._resolved
+
+	@property
+	def value(self):
+		"""
+		Result of command, processed in the same way as field method would do it without batch
+		"""
+		if not self._resolved:
+			raise Exception('Batch has not been executed yet')
+
+		return self._value
+
+
+class Batch():
+	"""
+	Collects write commands of fields and sends them to DB with single pipeline per redis client.
+	Usually created by `Field.batch`
+	"""
+
+	_Local = threading.local()
+
+	# Pipelines of different clients are executed in parallel by threads of shared executor
+	_Max_Workers = 16
+	_Executor = None
+	_Executor_Lock = threading.Lock()
+
+	@classmethod
+	def Current(cls):
+		"""
+		Returns batch of innermost active block in current thread, or None
+		"""
+		stack = getattr(cls._Local, 'stack', None)
+		return stack[-1] if stack else None
+
+	@classmethod
+	def _Stack(cls):
+		stack = getattr(cls._Local, 'stack', None)
+
+		if stack is None:
+			stack = cls._Local.stack = []
+
+		return stack
+
+	@classmethod
+	@contextmanager
+	def Suspended(cls):
+		"""
+		Commands, called inside this block, are executed immediately even inside batch block
+		"""
+		stack = cls._Stack()
+		stack.append(None)
+
+		try:
+			yield
+		finally:
+			stack.pop()
+
+	def __init__(self, transaction=False):
+		"""
+		transaction
+			whether commands must be wrapped into MULTI/EXEC
+		"""
+		self._transaction = transaction
+		self._pipelines = {}
+		# commands of instrumented fields, reported when batch is executed
+		self._events = None
+
+	def defer(self, redis, command, args, callback=None):
+		"""
+		Queues 'command' with 'args' to pipeline of 'redis' client
+
+		callback
+			function, to be applied to raw command result
+
+		return value
+			`DeferredResult` instance
+		"""
+		proxy = None
+
+		if type(redis) is InstrumentedClient:
+			proxy, redis = redis, redis.client
+
+		entry = self._pipelines.get(id(redis))
+
+		if entry is None:
+			entry = self._pipelines[id(redis)] = (redis, redis.pipeline(self._transaction), [])
+
+		getattr(entry[1], command)(*args)
+
+		result = DeferredResult(callback)
+		entry[2].append(result)
+
+		if proxy is not None:
+			if self._events is None: self._events = []
+			self._events.append((id(redis), result, proxy, command, args))
+
+		return result
+
+	def execute(self):
+		"""
+		Sends all queued commands to DB and resolves deferred results. Pipelines of different clients
+		(nodes, if fields are routed) are executed in parallel
+		"""
+		entries = list(self._pipelines.values())
+		events, self._events = self._events, None
+		self._pipelines = {}
+
+		durations = {}
+
+		def run(entry):
+			if events is None: return entry[1].execute()
+
+			started = perf_counter()
+
+			try:
+				return entry[1].execute()
+			finally:
+				durations[id(entry[0])] = perf_counter() - started
+
+		try:
+			if len(entries) > 1:
+				responses = list(self._Get_Executor().map(run, entries))
+			else:
+				responses = [run(entry) for entry in entries]
+
+			for (redis, pipeline, results), values in zip(entries, responses):
+				for result, value in zip(results, values):
+					result._resolve(value)
+		finally:
+			if events is not None:
+				for client_id, result, proxy, command, args in events:
+					reply = result._value if result._resolved else None
+					proxy.report(command, args, reply, durations.get(client_id, 0.0), pipelined=True, error=not result._resolved)
+
+	@classmethod
+	def _Get_Executor(cls):
+		with cls._Executor_Lock:
+			if Batch._Executor is None:
+				Batch._Executor = ThreadPoolExecutor(cls._Max_Workers, thread_name_prefix='orewrap-batch')
+
+			return Batch._Executor
+
+	def discard(self):
+		"""
+		Drops all queued commands
+		"""
+		pipelines, self._pipelines = self._pipelines, {}
+		self._events = None
+
+		for redis, pipeline, results in pipelines.values():
+			pipeline.reset()
+
+	def __enter__(self):
+		self._Stack().append(self)
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self._Stack().pop()
+
+		if exc_type is None:
+			self.execute()
+		else:
+			self.discard()
+
 
 class Field():
 	"""
@@ -9,28 +248,157 @@ class Field():
 
 	# Global redis client instance
 	_Redis = None
+	# Whether fields of class are reported to hooks of `instrumentation`, if any hook is added
+	_Instrument = True
 	_Value_Encoder = None
+	# Default time to live of keys in seconds, set by writes through field
+	_Ttl = None
+	# Commands, after which time to live is not set
+	_No_Ttl_Commands = frozenset(('delete', 'unlink', 'expire', 'pexpire', 'pexpireat', 'persist'))
+
+	# Collections with more members are iterated with SCAN family commands instead of reading them at once
+	_Scan_Threshold = 1000
+	# Default COUNT hint for SCAN family commands
+	_Scan_Count = 500
 
 	@classmethod
-	def Init(cls, redis, value_encoder=None):
+	def Init(cls, redis, value_encoder=None, ttl=None):
 		"""
 		Initialize global Field settings
 		Note that for each Field class different settings can be used!
 
 		redis
-			redis client, will be used for all field by default
+			redis client, will be used for all field by default, or `routing.Router`, picking client by key of field
 
 		value_encoder
 			value serializer, will be used for all field by default
 
+		ttl
+			seconds, keys live for after each write through field, if None, keys do not expire
+
 		"""
 		cls._Redis = redis
 		cls._Value_Encoder = value_encoder
+		cls._Ttl = ttl
+
+	@staticmethod
+	def batch(transaction=False):
+		"""
+		Returns context manager, inside which all write methods of fields are queued
+		and sent to DB with single pipeline per redis client when block ends.
+		Write methods return `DeferredResult` instead of value inside block
+
+		transaction
+			whether commands must be wrapped into MULTI/EXEC
+		"""
+		return Batch(transaction)
+
+	def _write(self, command, *args, callback=None, expire=True):
+		"""
+		Executes write 'command' immediately, or queues it, if called inside `Field.batch` block.
+		If field has time to live, EXPIRE is sent with command in the same pipeline
+
+		callback
+			function, to be applied to raw command result
+
+		expire
+			whether time to live of field must be set after command
+
+		return value
+			processed command result or `DeferredResult`
+		"""
+		expire = expire and self._ttl is not None and command not in self._No_Ttl_Commands
+
+		batch = Batch.Current()
+
+		if self._cache is not None:
+			callback = self._written_callback(callback, batch is not None)
+
+		if batch is not None:
+			result = batch.defer(self._redis, command, args, callback)
+			if expire: batch.defer(self._redis, 'expire', (self._key, self._ttl))
+			if self._cache is not None: self._cache.queued(self._key, batch)
+
+			return result
+
+		if expire:
+			pipeline = self._redis.pipeline(False)
+			getattr(pipeline, command)(*args)
+			pipeline.expire(self._key, self._ttl)
+
+			result = pipeline.execute()[0]
+		else:
+			result = getattr(self._redis, command)(*args)
+
+		return callback(result) if callback is not None else result
+
+	def _written_callback(self, callback, queued=False):
+		def written(result):
+			# listeners of queued write are notified by `FieldCache.queued`
+			if queued:
+				self._cache.invalidate(self._key)
+			else:
+				self._cache.written(self._key)
+
+			return callback(result) if callback is not None else result
+
+		return written
+
+	def _cached(self, sub, loader):
+		"""
+		Returns result of 'loader' (reading 'sub' part of field), cached in field cache, if it is attached
+		"""
+		if self._cache is None:
+			return loader()
+
+		return self._cache.get(self._key, sub, loader)
 
 	def _keys_from_fields(self, fields):
 		return {field._key if isinstance(field, Field) else field for field in fields}
 
-	def __init__(self, key, value_encoder=None, redis=None):
+	def _node_groups(self, keys):
+		"""
+		Groups 'keys' by node, if field is routed
+
+		return value
+			list of pairs of client and list of its keys
+		"""
+		if self._router is None:
+			return [(self._redis, list(keys))]
+
+		return self._router.group(keys)
+
+	def _store(self, dest, command, args, ttl, keys=()):
+		"""
+		Runs write 'command', storing its result to 'dest', and sets expiration of 'dest' in the same pipeline
+
+		dest
+			field of the same class or key name, field with encoders of current field is created for key name
+
+		keys
+			source keys of command, they must be on the node of 'dest'
+
+		return value
+			destination field
+		"""
+		if not isinstance(dest, Field):
+			dest = self._dest_field(dest)
+
+		if len(self._node_groups([dest._key] + list(keys))) > 1:
+			raise Exception('Keys of store operation are on different nodes, use hash tags to place them together')
+
+		with Field.batch() if ttl is not None and Batch.Current() is None else nullcontext():
+			dest._write(command, dest._key, *args)
+
+			if ttl is not None:
+				dest._write('expire', dest._key, ttl)
+
+		return dest
+
+	def _dest_field(self, key):
+		return type(self)(key, value_encoder=self._value_encoder, redis=self._router or self._redis)
+
+	def __init__(self, key, value_encoder=None, redis=None, cache=None, ttl=None):
 		"""
 		Initializing new instance of Field
 
@@ -38,10 +406,18 @@ class Field():
 			Redis DB key name
 
 		value_encoder
-			I/O value serializer for current instance
+			I/O value serializer for current instance, `Encoder` or name of registered one (see `encoders.get_encoder`)
 
 		redis
-			Redis client for this instance, if None, global client will be used (Defined in `Field.Init`)
+			Redis client or `routing.Router` for this instance, if None, global client will be used (Defined in `Field.Init`)
+
+		cache
+			`FieldCache` instance, decoded values, read by field, will be cached in. Note that `get` and similar
+			methods return cached values by reference, they must not be changed in place
+
+		ttl
+			seconds, key lives for after each write through field, if None, global setting is used (see `Field.Init`),
+			if False, key never expires through field
 		"""
 		key = str(key)
 
@@ -49,12 +425,44 @@ class Field():
 			raise Exception('Field key has zero length')
 
 		self._key = key
-		self._value_encoder = value_encoder or self._Value_Encoder or string_encoder
+		self._value_encoder = get_encoder(value_encoder or self._Value_Encoder) or string_encoder
 		self._redis = redis or self._Redis
+		self._router = None
+		self._cache = cache
+		self._ttl = (ttl or None) if ttl is not None else self._Ttl
 
-		if self._redis is None:
+		if self._client is None:
 			raise Exception('Redis client not specified')
 
+		if isinstance(self._client, Router):
+			self._router = self._client
+			self._redis = self._router.client(key)
+
+	@property
+	def _redis(self):
+		# chosen on each access, so fields, created before `instrumentation.add_hook`, are reported too
+		if instrumentation._hooks and self._Instrument:
+			return instrumentation.proxies(self)[0]
+
+		return self._client
+
+	@_redis.setter
+	def _redis(self, redis):
+		self._client = redis
+		self._proxies = None
+
+	@property
+	def _value_encoder(self):
+		if instrumentation._hooks and self._Instrument:
+			return instrumentation.proxies(self)[1]
+
+		return self._encoder
+
+	@_value_encoder.setter
+	def _value_encoder(self, encoder):
+		self._encoder = encoder
+		self._proxies = None
+
 	def exists(self):
 		"""
 		Checking field exists in DB
@@ -71,7 +479,58 @@ class Field():
 		return value
 			True, if field existed, else False
 		"""
-		return bool(self._redis.delete(self._key))
+		return self._write('delete', self._key, callback=bool)
+
+	def expire(self, seconds):
+		"""
+		Sets time to live of field
+
+		seconds
+			number of seconds or `timedelta`
+
+		return value
+			True, if field exists, else False
+		"""
+		return self._write('pexpire', self._key, _milliseconds(seconds), callback=bool)
+
+	def pexpire(self, milliseconds):
+		"""
+		Sets time to live of field in milliseconds
+		"""
+		return self._write('pexpire', self._key, milliseconds, callback=bool)
+
+	def expire_at(self, when):
+		"""
+		Sets moment, field expires at
+
+		when
+			`datetime` instance
+		"""
+		return self._write('pexpireat', self._key, int(when.timestamp() * 1000), callback=bool)
+
+	def persist(self):
+		"""
+		Removes time to live of field
+
+		return value
+			True, if time to live was removed, else False
+		"""
+		return self._write('persist', self._key, callback=bool)
+
+	def ttl(self):
+		"""
+		Returns remaining time to live of field in seconds, or None, if field does not exist or does not expire
+		"""
+		milliseconds = self._redis.pttl(self._key)
+
+		return milliseconds / 1000 if milliseconds is not None and milliseconds >= 0 else None
+
+	def _load_command(self):
+		"""
+		Returns command name, its arguments and function, decoding its result, for reading whole field value.
+		Used to read several fields with single pipeline. Base field of unknown type reads serialized value with DUMP
+		"""
+		return 'dump', (self._key, ), None
 
 	def __eq__(self, other):
 		return (type(self) == type(other)) and (self._key == other._key)
@@ -86,44 +545,93 @@ class StringField(Field):
 	http://redis.io/commands#string
 	"""
 
-	def __init__(self, key, value_encoder=None, redis=None, overwrite=True):
+	def __init__(self, key, value_encoder=None, redis=None, overwrite=True, cache=None, ttl=None, buffer=None):
 		"""
 		overwrite
 			whether overwrite values of existing key by default
+
+		buffer
+			`CounterBuffer` instance, increments are combined in, instead of sending them to DB immediately
 		"""
-		super(StringField, self).__init__(key, value_encoder=value_encoder, redis=redis)
+		super(StringField, self).__init__(key, value_encoder=value_encoder, redis=redis, cache=cache, ttl=ttl)
 
 		self._overwrite = overwrite
+		self._buffer = buffer
 
-	def set(self, value, overwrite=None):
+	def set(self, value, overwrite=None, ex=None, px=None, keepttl=False):
 		"""
 		Writes value to field.
 
 		overwrite
 			whether overwrite value of existing key, if None, uses default value, defined while instantiating
 
+		ex
+			seconds (or `timedelta`), field lives for, time to live of field by default
+
+		px
+			milliseconds, field lives for
+
+		keepttl
+			whether current time to live of key must be kept (Redis 6+)
+
+		Only one of 'ex', 'px' and 'keepttl' can be given
+
 		return value
 			True if new value has been set, else False
 		"""
+		if (ex is not None) + (px is not None) + bool(keepttl) > 1:
+			raise Exception('Only one of ex, px and keepttl can be specified')
+
 		overwrite = self._overwrite if overwrite is None else overwrite
-		method = self._redis.set if overwrite else self._redis.setnx
 
-		return bool(method(self._key, self._value_encoder.encode(value)))
+		if ex is None and px is None and not keepttl:
+			ex = self._ttl
+
+		if ex is None and px is None and not keepttl:
+			command = 'set' if overwrite else 'setnx'
+
+			return self._write(command, self._key, self._value_encoder.encode(value), callback=bool)
+
+		args = ['SET', self._key, self._value_encoder.encode(value)]
+
+		if ex is not None: args += ['PX', _milliseconds(ex)]
+		if px is not None: args += ['PX', px]
+		if keepttl: args.append('KEEPTTL')
+		if not overwrite: args.append('NX')
+
+		return self._write('execute_command', *args, callback=bool, expire=False)
 
 	def get(self, default=None):
 		"""
 		Gets value from field. If field does not exists, 'default' will be returned
 		"""
-		data = self._redis.get(self._key)
+		value = self._cached(None, lambda: self._decode(self._redis.get(self._key)))
 
-		return self._value_encoder.decode(data) if data is not None else default
+		return value if value is not None else default
+
+	def _decode(self, data):
+		return self._value_encoder.decode(data) if data is not None else None
+
+	def _load_command(self):
+		return 'get', (self._key, ), self._decode
 
 	def increment(self, amount=1):
 		"""
 		Increments numeric value in DB by 'amount'. If field does not exists, "1" will be writen in it and returned.
-		If field contains non numeric value, `redis.exceptions.ResponseError` will occur
+		If field contains non numeric value, `redis.exceptions.ResponseError` will occur.
+		If field has counter buffer, amount is added to pending delta and that local delta is returned
+		instead of value in DB, as the buffered amounts are not sent yet
 		"""
-		return self._redis.incr(self._key, amount)
+		if self._buffer is not None:
+			return self._buffer.add(self, amount)
+
+		return self._write('incr', self._key, amount)
+
+	def pending(self):
+		"""
+		Returns delta, buffered in counter buffer of field and not sent to DB yet
+		"""
+		return self._buffer.pending(self) if self._buffer is not None else 0
 
 	def __call__(self, default=None):
 		"""
@@ -146,16 +654,16 @@ class HashField(Field):
 	_Name_Encoder = None
 
 	@classmethod
-	def Init(cls, redis, value_encoder=None, name_encoder=None):
+	def Init(cls, redis, value_encoder=None, name_encoder=None, ttl=None):
 		"""
 		As like `Field.Init`, but also initializes default 'name_encoder' for all instances of HashField
 		"""
-		super(HashField, cls).Init(redis=redis, value_encoder=value_encoder)
+		super(HashField, cls).Init(redis=redis, value_encoder=value_encoder, ttl=ttl)
 
 		cls._Name_Encoder = name_encoder
 
 
-	def __init__(self, key, value_encoder=None, name_encoder=None, redis=None, overwrite=True):
+	def __init__(self, key, value_encoder=None, name_encoder=None, redis=None, overwrite=True, cache=None, ttl=None):
 		"""
 		name_encoder
 			I/O name serializer for current instance
@@ -163,9 +671,9 @@ class HashField(Field):
 		overwrite
 			whether overwrite values of existing name in key by default
 		"""
-		super(HashField, self).__init__(key, value_encoder=value_encoder, redis=redis)
+		super(HashField, self).__init__(key, value_encoder=value_encoder, redis=redis, cache=cache, ttl=ttl)
 
-		self._name_encoder = name_encoder or self._Name_Encoder or string_encoder
+		self._name_encoder = get_encoder(name_encoder or self._Name_Encoder) or string_encoder
 
 		self._overwrite = overwrite
 
@@ -180,12 +688,13 @@ class HashField(Field):
 			True if new value has been set, else False
 		"""
 		overwrite = self._overwrite if overwrite is None else overwrite
-		method = self._redis.hset if overwrite else self._redis.hsetnx
+		command = 'hset' if overwrite else 'hsetnx'
 
-		return bool(method(self._key,
+		return self._write(command, self._key,
 			self._name_encoder.encode(name),
-			self._value_encoder.encode(value)
-		)) or overwrite # because hset returns 0 if name-value pair with same name already exists ( http://redis.io/commands/hset )
+			self._value_encoder.encode(value),
+			callback=lambda result: bool(result) or overwrite # because hset returns 0 if name-value pair with same name already exists ( http://redis.io/commands/hset )
+		)
 
 
 	def get(self, name, default=None):
@@ -193,11 +702,14 @@ class HashField(Field):
 		Gets value from name-value pair in field by 'name'.
 		If field or name does not exists, 'default' will be returned
 		"""
-		value = self._redis.hget(
-			self._key, self._name_encoder.encode(name)
-		)
+		name = self._name_encoder.encode(name)
+
+		value = self._cached(('get', name), lambda: self._decode_value(self._redis.hget(self._key, name)))
+
+		return value if value is not None else default
 
-		return self._value_encoder.decode(value) if value is not None else default
+	def _decode_value(self, value):
+		return self._value_encoder.decode(value) if value is not None else None
 
 
 	def set_multi(self, dictionary):
@@ -207,8 +719,8 @@ class HashField(Field):
 		return value
 			always True
 		"""
-		return self._redis.hmset(self._key,
-			{self._name_encoder.encode(name): self._value_encoder.encode(value) for name, value in dictionary.items()}
+		return self._write('hmset', self._key,
+			dict(zip(self._name_encoder.encode_many(dictionary.keys()), self._value_encoder.encode_many(dictionary.values())))
 		)
 
 	def get_multi(self, names, default=None):
@@ -222,7 +734,7 @@ class HashField(Field):
 			list of values, associated with 'names' in the same order as requested in 'names'
 		"""
 		values = self._redis.hmget(self._key,
-			(self._name_encoder.encode(name) for name in names)
+			self._name_encoder.encode_many(names)
 		)
 
 		return tuple(self._value_encoder.decode(value) if value is not None else default for value in values)
@@ -232,10 +744,13 @@ class HashField(Field):
 		"""
 		Returns all name-value pairs, stored in hash field
 		"""
-		return {
-		self._name_encoder.decode(name): self._value_encoder.decode(value)
-		for name, value in self._redis.hgetall(self._key).items()
-		}
+		return dict(self._cached('members', lambda: self._decode_members(self._redis.hgetall(self._key))))
+
+	def _decode_members(self, members):
+		return dict(zip(self._name_encoder.decode_many(members.keys()), self._value_encoder.decode_many(members.values())))
+
+	def _load_command(self):
+		return 'hgetall', (self._key, ), self._decode_members
 
 	def contains(self, name):
 		"""
@@ -247,13 +762,13 @@ class HashField(Field):
 		"""
 		Return set of names in hash field
 		"""
-		return map(self._name_encoder.decode, self._redis.hkeys(self._key))
+		return self._name_encoder.decode_many(self._redis.hkeys(self._key))
 
 	def values(self):
 		"""
 		Return list of value in hash field
 		"""
-		return map(self._value_encoder.decode, self._redis.hvals(self._key))
+		return self._value_encoder.decode_many(self._redis.hvals(self._key))
 
 	def delete(self, *names):
 		"""
@@ -265,7 +780,7 @@ class HashField(Field):
 		return value
 			Number of deleted members
 		"""
-		return self._redis.hdel(self._key, *(self._name_encoder.encode(name) for name in names))
+		return self._write('hdel', self._key, *self._name_encoder.encode_many(names))
 
 	def count(self):
 		"""
@@ -273,10 +788,32 @@ class HashField(Field):
 		"""
 		return self._redis.hlen(self._key)
 
+	def scan_items(self, match=None, count=None):
+		"""
+		Iterates over name-value pairs with HSCAN, without blocking DB and reading whole hash field at once.
+		Some pairs may be returned more then once, if hash field is modified while iterating
+
+		match
+			glob-style pattern, encoded names must match
+
+		count
+			hint, how many pairs DB returns per call
+		"""
+		for name, value in self._redis.hscan_iter(self._key, match=match, count=count or self._Scan_Count):
+			yield self._name_encoder.decode(name), self._value_encoder.decode(value)
+
 	def __len__(self):
 		return self.count()
 
 	def __iter__(self):
+		# cached names cost no call
+		if self._cache is not None:
+			return self.keys().__iter__()
+
+		# large hash fields are scanned, so names may repeat, if hash field is modified while iterating
+		if self.count() > self._Scan_Threshold:
+			return (name for name, value in self.scan_items())
+
 		return self.keys().__iter__()
 
 	def __contains__(self, name):
@@ -314,7 +851,7 @@ class SetField(Field):
 		return value
 			the number of elements that were added to the set, not including all the elements already present into the set.
 		"""
-		return self._redis.sadd(self._key, *map(self._value_encoder.encode, values))
+		return self._write('sadd', self._key, *self._value_encoder.encode_many(values))
 
 	def delete(self, *values):
 		"""
@@ -323,14 +860,19 @@ class SetField(Field):
 		return value
 			the number of members removed from the set field, not including non existing members.
 		"""
-		return self._redis.srem(self._key, *map(self._value_encoder.encode, values))
+		return self._write('srem', self._key, *self._value_encoder.encode_many(values))
 
 	def members(self):
 		"""
 		Gets all members from set field
 		"""
-		result = self._redis.smembers(self._key)
-		return {self._value_encoder.decode(value) for value in result}
+		return set(self._cached('members', lambda: self._decode_members(self._redis.smembers(self._key))))
+
+	def _decode_members(self, members):
+		return set(self._value_encoder.decode_many(members))
+
+	def _load_command(self):
+		return 'smembers', (self._key, ), self._decode_members
 
 	def count(self):
 		"""
@@ -364,9 +906,9 @@ class SetField(Field):
 
 			if not unique:
 				number *= -1
-				return map(self._value_encoder.decode, self._redis.srandmember(self._key, number))
+				return self._value_encoder.decode_many(self._redis.srandmember(self._key, number))
 			else:
-				return {self._value_encoder.decode(value) for value in self._redis.srandmember(self._key, number)}
+				return set(self._value_encoder.decode_many(self._redis.srandmember(self._key, number)))
 
 		else:
 			return self._value_encoder.decode(self._redis.srandmember(self._key))
@@ -393,9 +935,14 @@ class SetField(Field):
 				number -= 1
 
 			result = redis.execute()
-			return {self._value_encoder.decode(value) for value in filter(lambda value: value is not None, result)}
+			if self._cache is not None: self._cache.written(self._key)
+
+			return set(self._value_encoder.decode_many(filter(lambda value: value is not None, result)))
 		else:
-			return self._value_encoder.decode(self._redis.spop(self._key))
+			result = self._redis.spop(self._key)
+			if self._cache is not None: self._cache.written(self._key)
+
+			return self._value_encoder.decode(result)
 
 	def union(self, *setField_collection):
 		"""
@@ -411,8 +958,8 @@ class SetField(Field):
 		"""
 		keys = self._keys_from_fields(setField_collection)
 
-		values = self._redis.sunion(self._key, *keys)
-		return {self._value_encoder.decode(value) for value in values}
+		values = set().union(*self._grouped('sunion', [self._key] + list(keys)))
+		return set(self._value_encoder.decode_many(values))
 
 	def intersection(self, *setField_collection):
 		"""
@@ -428,13 +975,104 @@ class SetField(Field):
 		"""
 		keys = self._keys_from_fields(setField_collection)
 
-		values = self._redis.sinter(self._key, *keys)
-		return {self._value_encoder.decode(value) for value in values}
+		values = set.intersection(*self._grouped('sinter', [self._key] + list(keys)))
+		return set(self._value_encoder.decode_many(values))
+
+	def difference(self, *setField_collection):
+		"""
+		Returns values of current set field, which are not in any of 'setField_collection' fields
+
+		setField_collection
+			collection of `SetField` instances or strings (key names)
+
+		return value
+			set of decoded values
+		"""
+		keys = self._keys_from_fields(setField_collection)
+		groups = self._node_groups([self._key] + list(keys))
+
+		# keys on node of current field are subtracted by DB, values of others are subtracted here
+		batch = Batch()
+		results = [batch.defer(client, 'sdiff' if index == 0 else 'sunion', (group, )) for index, (client, group) in enumerate(groups)]
+		batch.execute()
+
+		values = results[0].value.difference(*(result.value for result in results[1:]))
+		return set(self._value_encoder.decode_many(values))
+
+	def _grouped(self, command, keys):
+		"""
+		Runs multi-key read 'command' for keys of each node in parallel
+
+		return value
+			list of results per node
+		"""
+		groups = self._node_groups(keys)
+
+		if len(groups) == 1:
+			return [getattr(groups[0][0], command)(groups[0][1])]
+
+		batch = Batch()
+		results = [batch.defer(client, command, (group, )) for client, group in groups]
+		batch.execute()
+
+		return [result.value for result in results]
+
+	def union_store(self, dest, *setField_collection, ttl=None):
+		"""
+		As like `SetField.union`, but result is stored in 'dest' by DB and is not sent to client
+
+		dest
+			`SetField` or key name, existing value of key is overwritten
+
+		ttl
+			seconds, after which 'dest' expires, if None, 'dest' does not expire
+
+		return value
+			`SetField` of 'dest' with encoder of current set field, if 'dest' is key name
+		"""
+		keys = [self._key] + list(self._keys_from_fields(setField_collection))
+		return self._store(dest, 'sunionstore', keys, ttl, keys)
+
+	def intersection_store(self, dest, *setField_collection, ttl=None):
+		"""
+		As like `SetField.intersection`, but result is stored in 'dest', see `SetField.union_store`
+		"""
+		keys = [self._key] + list(self._keys_from_fields(setField_collection))
+		return self._store(dest, 'sinterstore', keys, ttl, keys)
+
+	def difference_store(self, dest, *setField_collection, ttl=None):
+		"""
+		As like `SetField.difference`, but result is stored in 'dest', see `SetField.union_store`
+		"""
+		keys = [self._key] + list(self._keys_from_fields(setField_collection))
+		return self._store(dest, 'sdiffstore', keys, ttl, keys)
+
+	def scan_members(self, match=None, count=None):
+		"""
+		Iterates over members with SSCAN, without blocking DB and reading whole set field at once.
+		Some members may be returned more then once, if set field is modified while iterating
+
+		match
+			glob-style pattern, encoded values must match
+
+		count
+			hint, how many members DB returns per call
+		"""
+		for value in self._redis.sscan_iter(self._key, match=match, count=count or self._Scan_Count):
+			yield self._value_encoder.decode(value)
 
 	def __len__(self):
 		return self.count()
 
 	def __iter__(self):
+		# cached members cost no call
+		if self._cache is not None:
+			return self.members().__iter__()
+
+		# large set fields are scanned, so members may repeat, if set field is modified while iterating
+		if self.count() > self._Scan_Threshold:
+			return self.scan_members()
+
 		return self.members().__iter__()
 
 	def __contains__(self, value):
@@ -449,25 +1087,81 @@ class SortedSetField(Field):
 
 	_Score_Encoder = None
 
+	# Whether ZMSCORE command may be used, reset on first server that does not support it
+	_Use_Zmscore = True
+
+	# Script of `SortedSetField.page`, registered on first use
+	_Page_Script_Object = None
+
 	@classmethod
-	def Init(cls, redis, value_encoder=None, score_encoder=None):
+	def Init(cls, redis, value_encoder=None, score_encoder=None, ttl=None):
 		"""
 		As like `Field.Init`, but also initializes default 'core_encoder' for all instances of SortedSetField
 		"""
-		super(SortedSetField, cls).Init(redis=redis, value_encoder=value_encoder)
+		super(SortedSetField, cls).Init(redis=redis, value_encoder=value_encoder, ttl=ttl)
 
 		cls._Score_Encoder = score_encoder
 
 
-	def __init__(self, key, value_encoder=None, score_encoder=None, redis=None):
+	def __init__(self, key, value_encoder=None, score_encoder=None, redis=None, cache=None, ttl=None):
 		"""
 		score_encoder
 			I/O score serializer for current instance
 		"""
-		super(SortedSetField, self).__init__(key, value_encoder=value_encoder, redis=redis)
+		super(SortedSetField, self).__init__(key, value_encoder=value_encoder, redis=redis, cache=cache, ttl=ttl)
+
+		self._score_encoder = get_encoder(score_encoder or self._Score_Encoder) or string_encoder
+
+
+	def _dest_field(self, key):
+		return type(self)(key, value_encoder=self._value_encoder, score_encoder=self._score_encoder, redis=self._router or self._redis)
+
+	def _aggregate_args(self, fields, weights, aggregate):
+		keys = [self._key] + [field._key if isinstance(field, Field) else str(field) for field in fields]
+
+		if weights is not None:
+			if len(weights) != len(keys):
+				raise Exception('Number of weights must be equal to number of fields')
+
+			keys = dict(zip(keys, weights))
+
+		if aggregate is not None and aggregate.upper() not in ('SUM', 'MIN', 'MAX'):
+			raise Exception('Aggregate must be SUM, MIN or MAX')
+
+		return [keys, aggregate]
+
+	def union_store(self, dest, *fields, weights=None, aggregate=None, ttl=None):
+		"""
+		Stores union of current sorted set field and 'fields' in 'dest' by DB, result is not sent to client.
+		Score of value is aggregation of its scores in fields, multiplied by weights
+
+		dest
+			`SortedSetField` or key name, existing value of key is overwritten
+
+		fields
+			`SortedSetField`s, `SetField`s (scores of their values are 1) or key names
+
+		weights
+			multipliers of scores, one for current field and each of 'fields'
+
+		aggregate
+			'SUM' (default), 'MIN' or 'MAX'
 
-		self._score_encoder = score_encoder or self._Score_Encoder or string_encoder
+		ttl
+			seconds, after which 'dest' expires, if None, 'dest' does not expire
 
+		return value
+			`SortedSetField` of 'dest' with encoders of current field, if 'dest' is key name
+		"""
+		args = self._aggregate_args(fields, weights, aggregate)
+		return self._store(dest, 'zunionstore', args, ttl, list(args[0]))
+
+	def intersection_store(self, dest, *fields, weights=None, aggregate=None, ttl=None):
+		"""
+		As like `SortedSetField.union_store`, but stores values, which are members of all fields
+		"""
+		args = self._aggregate_args(fields, weights, aggregate)
+		return self._store(dest, 'zinterstore', args, ttl, list(args[0]))
 
 	def add(self, value, score):
 		"""
@@ -476,23 +1170,38 @@ class SortedSetField(Field):
 		return value
 			True, if 'value' was added to sorted set field, else False
 		"""
-		return bool(self.add_multi({value: score}))
+		return self._write('zadd', self._key, *self._pairs_to_args({value: score}), callback=bool)
 
-	def add_multi(self, dictionary):
+	def add_multi(self, dictionary, scores=None):
 		"""
 		Adds value-score pairs to sorted set field. If 'value' already exists in sorted set field, just score will be updated
 
-		values
-			mapping values to scores
+		dictionary
+			mapping values to scores, or sequence of values, if 'scores' specified
+
+		scores
+			sequence or NumPy array of scores for values in 'dictionary'. If score encoder has `encode_array` method
+			(as like `datetime_encoder`), scores are encoded with single call of it
 
 		return value
 			the number of elements added to the sorted set field, not including elements already existing for which the score was updated.
 		"""
-		args = [None] * len(dictionary) * 2
-		args[::2] = map(self._value_encoder.encode, dictionary.keys())
-		args[1::2] = map(self._score_encoder.encode, dictionary.values())
+		return self._write('zadd', self._key, *self._pairs_to_args(dictionary, scores))
 
-		return self._redis.zadd(self._key, *args)
+	def _pairs_to_args(self, dictionary, scores=None):
+		if scores is None:
+			values = self._value_encoder.encode_many(dictionary.keys())
+			scores = self._score_encoder.encode_many(dictionary.values())
+		else:
+			values = self._value_encoder.encode_many(dictionary)
+			encode_array = getattr(self._score_encoder, 'encode_array', None)
+			scores = encode_array(scores).tolist() if encode_array is not None else self._score_encoder.encode_many(scores)
+
+		args = [None] * len(values) * 2
+		args[::2] = values
+		args[1::2] = scores
+
+		return args
 
 	def delete(self, *values):
 		"""
@@ -504,7 +1213,7 @@ class SortedSetField(Field):
 		return value
 			the number of members removed from the sorted set, not including non existing members.
 		"""
-		return self._redis.zrem(self._key, *map(self._value_encoder.encode, values))
+		return self._write('zrem', self._key, *self._value_encoder.encode_many(values))
 
 	def count(self, min_score=None, max_score=None):
 		"""
@@ -544,10 +1253,53 @@ class SortedSetField(Field):
 
 		result = self._redis.zrange(self._key, start_index, stop_index, desc)
 
-		return tuple(self._value_encoder.decode(value) for value in result)
+		return tuple(self._value_encoder.decode_many(result))
+
+	def _decode_values(self, values):
+		return tuple(self._value_encoder.decode_many(values))
+
+	def range_with_scores(self, start_index=None, stop_index=None, desc=False, as_array=False):
+		"""
+		Returns the specified range of elements in the sorted set field with their scores (ZRANGE WITHSCORES).
+		Arguments are the same as for `SortedSetField.range_by_index`
 
+		as_array
+			if True, scores are returned as NumPy float64 array, decoded with `decode_array` method of score encoder,
+			if it has one (`datetime_encoder` returns datetime64 array)
 
-	def range_by_score(self, min_score=None, max_score=None):
+		return value
+			tuple of value-score pairs or, if 'as_array' is True, tuple of values and array of scores
+		"""
+		if start_index is None: start_index = 0
+		if stop_index is None: stop_index = -1
+
+		result = self._redis.zrange(self._key, start_index, stop_index, desc, withscores=True)
+		values, scores = zip(*result) if result else ((), ())
+
+		values = self._decode_values(values)
+
+		if as_array:
+			import numpy
+
+			scores = numpy.array(scores, dtype=numpy.float64)
+			decode_array = getattr(self._score_encoder, 'decode_array', None)
+
+			return values, decode_array(scores) if decode_array is not None else scores
+
+		return tuple(zip(values, self._decode_scores(scores)))
+
+	def _decode_scores(self, scores):
+		# DB returns scores as numbers, so default string encoder is used only for encoding
+		if self._score_encoder is string_encoder:
+			return list(scores)
+
+		return self._score_encoder.decode_many(scores)
+
+	def _load_command(self):
+		return 'zrange', (self._key, 0, -1), self._decode_values
+
+
+	def range_by_score(self, min_score=None, max_score=None, offset=None, limit=None, desc=False, min_exclusive=False, max_exclusive=False):
 		"""
 		Returns the range of elements in the sorted set field with scores between 'min_score' and 'max_score' (both inclusive).
 
@@ -557,13 +1309,127 @@ class SortedSetField(Field):
 		max_score
 			if None, "+inf" will used by default
 
+		offset
+			number of elements in range to skip (0 by default). Note that DB still walks skipped elements,
+			use `SortedSetField.page` to read deep pages
+
+		limit
+			maximal number of returned elements, all by default
+
+		desc
+			whether elements must be ordered from highest to lowest score
+
+		min_exclusive, max_exclusive
+			whether elements with score equal to bound must be excluded
 		"""
-		min_score = '-inf' if min_score is None else self._score_encoder.encode(min_score)
-		max_score = '+inf' if max_score is None else self._score_encoder.encode(max_score)
+		min_score = self._score_bound(min_score, '-inf', min_exclusive)
+		max_score = self._score_bound(max_score, '+inf', max_exclusive)
+
+		if offset is not None or limit is not None:
+			offset, limit = offset or 0, -1 if limit is None else limit
+
+		if desc:
+			result = self._redis.zrevrangebyscore(self._key, max_score, min_score, offset, limit)
+		else:
+			result = self._redis.zrangebyscore(self._key, min_score, max_score, offset, limit)
+
+		return tuple(self._value_encoder.decode_many(result))
+
+	def _score_bound(self, score, default, exclusive):
+		if score is None: return default
+
+		score = self._score_encoder.encode(score)
+
+		if exclusive:
+			return '(' + (score.decode(encoding='utf-8') if isinstance(score, bytes) else repr(score))
+
+		return score
+
+	def range_by_lex(self, min_value=None, max_value=None, offset=None, limit=None, desc=False, min_exclusive=False, max_exclusive=False):
+		"""
+		Returns the range of elements between 'min_value' and 'max_value' (both inclusive) in order of encoded values
+		(ZRANGEBYLEX). Makes sense only if all elements have the same score
+
+		min_value, max_value
+			if None, range is unbounded
+
+		offset, limit, desc, min_exclusive, max_exclusive
+			as like in `SortedSetField.range_by_score`
+		"""
+		min_value = self._lex_bound(min_value, b'-', min_exclusive)
+		max_value = self._lex_bound(max_value, b'+', max_exclusive)
+
+		if offset is not None or limit is not None:
+			offset, limit = offset or 0, -1 if limit is None else limit
+
+		if desc:
+			result = self._redis.zrevrangebylex(self._key, max_value, min_value, offset, limit)
+		else:
+			result = self._redis.zrangebylex(self._key, min_value, max_value, offset, limit)
+
+		return tuple(self._value_encoder.decode_many(result))
 
-		result = self._redis.zrangebyscore(self._key, min_score, max_score)
+	def _lex_bound(self, value, default, exclusive):
+		if value is None: return default
 
-		return tuple(self._value_encoder.decode(value) for value in result)
+		value = self._value_encoder.encode(value)
+
+		if not isinstance(value, bytes):
+			value = str(value).encode(encoding='utf-8')
+
+		return (b'(' if exclusive else b'[') + value
+
+	def page(self, cursor=None, size=None, desc=False):
+		"""
+		Returns page of elements, following element, 'cursor' points to, in score order. Unlike offset pagination,
+		each page costs O(log N + size) regardless of depth, and pages do not drift, when elements are added or
+		removed before cursor. Page is read with single call of server-side script
+
+		cursor
+			opaque cursor, returned with previous page, if None, first page is returned
+
+		size
+			number of elements per page (`Field._Scan_Count` by default)
+
+		desc
+			whether elements must be ordered from highest to lowest score, must be the same for all pages
+
+		return value
+			tuple of decoded values and cursor of next page, or None, if page is the last one
+		"""
+		size = size or self._Scan_Count
+
+		member, score = self._decode_cursor(cursor) if cursor is not None else (b'', '')
+
+		result = self._Page_Script(self._redis)(keys=[self._key], args=[member, score, size, int(desc)], client=self._redis)
+
+		members, scores = result[::2], result[1::2]
+		next_cursor = self._encode_cursor(members[-1], scores[-1]) if len(members) == size else None
+
+		return tuple(self._value_encoder.decode_many(members)), next_cursor
+
+	@classmethod
+	def _Page_Script(cls, redis):
+		if SortedSetField._Page_Script_Object is None:
+			SortedSetField._Page_Script_Object = redis.register_script(_PAGE_SCRIPT)
+
+		return SortedSetField._Page_Script_Object
+
+	@staticmethod
+	def _encode_cursor(member, score):
+		if not isinstance(member, bytes): member = str(member).encode(encoding='utf-8')
+		if not isinstance(score, bytes): score = str(score).encode(encoding='utf-8')
+
+		return urlsafe_b64encode(score + b'\n' + member).decode(encoding='ascii')
+
+	@staticmethod
+	def _decode_cursor(cursor):
+		try:
+			score, member = urlsafe_b64decode(cursor.encode(encoding='ascii')).split(b'\n', 1)
+		except (ValueError, UnicodeError):
+			raise Exception('Invalid cursor')
+
+		return member, score
 
 	def get_by_index(self, index):
 		result = self.range_by_index(index, index)
@@ -589,6 +1455,35 @@ class SortedSetField(Field):
 		"""
 		return self._redis.zscore(self._key, self._value_encoder.encode(value))
 
+	def score_of_multi(self, values):
+		"""
+		Returns scores for 'values' with single call of ZMSCORE, or single pipeline of ZSCORE,
+		if DB does not support ZMSCORE
+
+		return value
+			list of scores in the same order as requested in 'values', None for not existing values
+		"""
+		values = self._value_encoder.encode_many(values)
+
+		if not values:
+			return []
+
+		if SortedSetField._Use_Zmscore:
+			try:
+				scores = self._redis.execute_command('ZMSCORE', self._key, *values)
+			except ResponseError as error:
+				if 'unknown command' not in str(error).lower(): raise
+				SortedSetField._Use_Zmscore = False
+			else:
+				return [float(score) if score is not None else None for score in scores]
+
+		pipeline = self._redis.pipeline(False)
+
+		for value in values:
+			pipeline.zscore(self._key, value)
+
+		return pipeline.execute()
+
 	def delete(self, *values):
 		"""
 		Removes 'values' from sorted set field
@@ -596,7 +1491,7 @@ class SortedSetField(Field):
 		return value
 			the number of members removed from the sorted set field, not including non existing members.
 		"""
-		return self._redis.zrem(self._key, *map(self._value_encoder.encode, values))
+		return self._write('zrem', self._key, *self._value_encoder.encode_many(values))
 
 	def delete_range_by_index(self, start_index=None, stop_index=None):
 		"""
@@ -608,7 +1503,7 @@ class SortedSetField(Field):
 		if start_index is None: start_index = 0
 		if stop_index is None: stop_index = -1
 
-		return self._redis.zremrangebyrank(self._key, start_index, stop_index)
+		return self._write('zremrangebyrank', self._key, start_index, stop_index)
 
 	def delete_range_by_score(self, min_score=None, max_score=None):
 		"""
@@ -620,12 +1515,42 @@ class SortedSetField(Field):
 		min_score = '-inf' if min_score is None else self._score_encoder.encode(min_score)
 		max_score = '+inf' if max_score is None else self._score_encoder.encode(max_score)
 
-		return self._redis.zremrangebyscore(self._key, min_score, max_score)
+		return self._write('zremrangebyscore', self._key, min_score, max_score)
+
+	def scan_items(self, match=None, count=None):
+		"""
+		Iterates over value-score pairs with ZSCAN, without blocking DB and reading whole sorted set field at once.
+		Pairs are not ordered by score and some of them may be returned more then once,
+		if sorted set field is modified while iterating. Scores are not decoded
+
+		match
+			glob-style pattern, encoded values must match
+
+		count
+			hint, how many pairs DB returns per call
+		"""
+		for value, score in self._redis.zscan_iter(self._key, match=match, count=count or self._Scan_Count):
+			yield self._value_encoder.decode(value), score
+
+	def iterate(self, page_size=None, desc=False):
+		"""
+		Iterates over values in score order, reading them with pages of 'page_size' values (see `SortedSetField.page`)
+		"""
+		cursor = None
+
+		while True:
+			page, cursor = self.page(cursor, page_size, desc)
+			yield from page
+
+			if cursor is None: break
 
 	def __len__(self):
 		return self.count()
 
 	def __iter__(self):
+		if self.count() > self._Scan_Threshold:
+			return self.iterate()
+
 		return self.range_by_index().__iter__()
 
 	def __contains__(self, value):
@@ -642,6 +1567,77 @@ class SortedSetField(Field):
 
 
 
+class HashMemberField(Field):
+	"""
+	Represents single name-value pair of hash field in DB, works like `StringField`
+	"""
+
+	def __init__(self, hashField, name, value_encoder=None, overwrite=True, cache=None):
+		"""
+		hashField
+			`HashField` instance, holding name-value pair
+
+		name
+			name in hash field, will be encoded with name encoder of 'hashField'
+
+		overwrite
+			whether overwrite value of existing name by default
+		"""
+		super(HashMemberField, self).__init__(hashField._key, value_encoder=value_encoder, redis=hashField._redis, cache=cache)
+
+		self._name = hashField._name_encoder.encode(name)
+		self._overwrite = overwrite
+
+	def exists(self):
+		return self._redis.hexists(self._key, self._name)
+
+	def destroy(self):
+		return self._write('hdel', self._key, self._name, callback=bool)
+
+	def set(self, value, overwrite=None):
+		"""
+		Writes value to name-value pair. Same as `StringField.set`
+		"""
+		overwrite = self._overwrite if overwrite is None else overwrite
+		command = 'hset' if overwrite else 'hsetnx'
+
+		return self._write(command, self._key, self._name, self._value_encoder.encode(value),
+			callback=lambda result: bool(result) or overwrite
+		)
+
+	def get(self, default=None):
+		"""
+		Gets value from name-value pair. If it does not exists, 'default' will be returned
+		"""
+		value = self._cached(('get', self._name), lambda: self._decode(self._redis.hget(self._key, self._name)))
+
+		return value if value is not None else default
+
+	def _decode(self, data):
+		return self._value_encoder.decode(data) if data is not None else None
+
+	def _load_command(self):
+		return 'hget', (self._key, self._name), self._decode
+
+	def increment(self, amount=1):
+		"""
+		Increments numeric value by 'amount'. Same as `StringField.increment`
+		"""
+		return self._write('hincrby', self._key, self._name, amount)
+
+	def __call__(self, default=None):
+		return self.get(default=default)
+
+	def __bool__(self):
+		return self.exists()
+
+	def __eq__(self, other):
+		return super(HashMemberField, self).__eq__(other) and (self._name == other._name)
+
+	def __hash__(self):
+		return hash((self._key, self._name))
+
+
 class RefStringField(StringField):
 	def __init__(self, key, target_hashField, target_hashField_value, name_encoder=None, redis=None):
 		super(RefStringField, self).__init__(key, value_encoder=name_encoder, redis=redis, overwrite=True)
@@ -650,25 +1646,28 @@ class RefStringField(StringField):
 		self._target_hashField_value = target_hashField_value
 
 	def set(self, name):
-		if not self._target_hashField.set(name, self._target_hashField_value):
-			return False
+		# depends on results of previous commands, so can not be queued to batch
+		with Batch.Suspended():
+			if not self._target_hashField.set(name, self._target_hashField_value):
+				return False
 
-		old_value = self.get()
+			old_value = self.get()
 
-		super(RefStringField, self).set(name)
+			super(RefStringField, self).set(name)
 
-		if old_value is not None:
-			self._target_hashField.delete(name)
+			if old_value is not None:
+				self._target_hashField.delete(name)
 
 		return True
 
 	def destroy(self):
-		name = self.get()
+		with Batch.Suspended():
+			name = self.get()
 
-		if name is not None:
-			self._target_hashField.delete(name)
+			if name is not None:
+				self._target_hashField.delete(name)
 
-		super(RefStringField, self).destroy()
+			super(RefStringField, self).destroy()
 
 
 
@@ -689,3 +1688,21 @@ class ScoreStringField(StringField):
 		self._target_sortedSetField.delete(self._target_sortedSetField_value)
 
 		super(ScoreStringField, self).destroy()
+
+
+class ScoreHashMemberField(HashMemberField):
+	def __init__(self, hashField, name, target_sortedSetField, target_sortedSetField_value, score_encoder=None):
+		super(ScoreHashMemberField, self).__init__(hashField, name, value_encoder=score_encoder, overwrite=True)
+
+		self._target_sortedSetField = target_sortedSetField
+		self._target_sortedSetField_value = target_sortedSetField_value
+
+	def set(self, score):
+		self._target_sortedSetField.add(self._target_sortedSetField_value, score)
+		super(ScoreHashMemberField, self).set(score)
+
+
+	def destroy(self):
+		self._target_sortedSetField.delete(self._target_sortedSetField_value)
+
+		super(ScoreHashMemberField, self).destroy()
\ No newline at end of file
@@ -0,0 +1,432 @@
+__author__ = 'Nuclight.atomAltera'
+
+# Hooks, called around every command, sent by fields. While no hook is added, fields use redis clients and encoders
+# directly and instrumentation costs one check per access. Otherwise fields return proxies of client and value
+# encoder, which time calls and pass `CommandEvent`s to hooks. Proxies are chosen on each access, so fields,
+# created before `add_hook` (as like cached `ClassField`s of objects), are reported too. Pipelines of proxies report
+# queued commands, when they are executed, and scripts, registered through proxies, call them by default
+
+from .encoders import Encoder
+
+from collections import Counter
+from time import perf_counter
+import threading
+
+
+_hooks = ()
+
+
+def add_hook(hook):
+	"""
+	Adds 'hook', function, called with `CommandEvent` of each command of fields.
+	Hooks are called in thread, which sent command, and must be fast
+	"""
+	global _hooks
+	_hooks = _hooks + (hook, )
+
+
+def remove_hook(hook):
+	"""
+	Removes 'hook', added with `add_hook`
+	"""
+	global _hooks
+	_hooks = tuple(other for other in _hooks if other != hook)
+
+
+def enabled():
+	"""
+	Returns True, if any hook is added
+	"""
+	return bool(_hooks)
+
+
+def key_pattern(key):
+	"""
+	Returns pattern of 'key', replacing numeric parts (ids of objects) with "*": "obj:12:tag" -> "obj:*:tag"
+	"""
+	return ':'.join('*' if part.isdigit() else part for part in key.split(':'))
+
+
+_pattern = key_pattern
+
+
+def set_key_pattern(function):
+	"""
+	Replaces function, making key patterns, events of fields are grouped by, `key_pattern` by default
+	"""
+	global _pattern
+	_pattern = function
+
+
+def payload_size(value):
+	"""
+	Returns number of bytes (or characters) in arguments or reply of command
+	"""
+	if isinstance(value, (bytes, bytearray, str)):
+		return len(value)
+
+	if isinstance(value, (list, tuple, set, frozenset)):
+		return sum(map(payload_size, value))
+
+	if isinstance(value, dict):
+		return sum(payload_size(name) + payload_size(item) for name, item in value.items())
+
+	if isinstance(value, (int, float)) and not isinstance(value, bool):
+		return len(str(value))
+
+	return 0
+
+
+class CommandEvent():
+	"""
+	Description of single command or encoding call, passed to hooks
+
+	kind
+		"command", "encode" or "decode"
+
+	field_class
+		class of field, sent command
+
+	key, pattern
+		key of field and its pattern (see `set_key_pattern`)
+
+	command
+		name of redis client method (as like "hget"), or "encode" / "decode"
+
+	request_size, reply_size
+		sizes of arguments and reply of command
+
+	latency
+		seconds of round trip (of whole pipeline for pipelined commands), or of encoding
+
+	pipelined
+		whether command was sent in pipeline (of field or of `Field.batch`)
+
+	error
+		whether command failed
+	"""
+
+	__slots__ = ('kind', 'field_class', 'key', 'pattern', 'command', 'request_size', 'reply_size', 'latency', 'pipelined', 'error')
+
+	def __init__(self, kind, field_class, key, pattern, command, request_size, reply_size, latency, pipelined=False, error=False):
+		self.kind = kind
+		self.field_class = field_class
+		self.key = key
+		self.pattern = pattern
+		self.command = command
+		self.request_size = request_size
+		self.reply_size = reply_size
+		self.latency = latency
+		self.pipelined = pipelined
+		self.error = error
+
+
+def _command_name(method, args):
+	# commands, sent with `execute_command` (as like ZMSCORE), are named by themselves
+	if method == 'execute_command' and args and isinstance(args[0], str):
+		return args[0].lower()
+
+	return method
+
+
+def _emit(event):
+	for hook in _hooks:
+		hook(event)
+
+
+class InstrumentedClient():
+	"""
+	Proxy of redis client of single field, reporting its commands. Commands, queued to `Batch`, are reported by batch
+	"""
+
+	_Passthrough = frozenset(('transaction', 'pubsub', 'lock', 'connection_pool', 'response_callbacks'))
+
+	def __init__(self, client, field):
+		self.client = client
+		self.field_class = type(field)
+		self.key = field._key
+		self.pattern = _pattern(field._key)
+
+	def report(self, command, args, reply, latency, pipelined=False, error=False):
+		_emit(CommandEvent(
+			'command', self.field_class, self.key, self.pattern, command,
+			payload_size(args), payload_size(reply), latency, pipelined, error
+		))
+
+	def __getattr__(self, name):
+		attribute = getattr(self.client, name)
+
+		if name.startswith('_') or name in self._Passthrough or name.endswith('_iter') or not callable(attribute):
+			return attribute
+
+		def call(*args, **kwargs):
+			reply = None
+			error = True
+			started = perf_counter()
+
+			try:
+				reply = attribute(*args, **kwargs)
+				error = False
+
+				return reply
+			finally:
+				self.report(_command_name(name, args), (args, kwargs), reply, perf_counter() - started, error=error)
+
+		# next calls skip __getattr__
+		setattr(self, name, call)
+
+		return call
+
+	def pipeline(self, transaction=True, shard_hint=None):
+		return InstrumentedPipeline(self, self.client.pipeline(transaction, shard_hint))
+
+	def register_script(self, script):
+		script = self.client.register_script(script)
+		# calls without explicit client are sent through proxy
+		script.registered_client = self
+
+		return script
+
+
+class InstrumentedPipeline():
+	"""
+	Proxy of pipeline of `InstrumentedClient`, reporting queued commands with round trip of whole pipeline,
+	when it is executed
+	"""
+
+	def __init__(self, client, pipeline):
+		self.client = client
+		self.pipeline = pipeline
+		self._commands = []
+
+	def __getattr__(self, name):
+		attribute = getattr(self.pipeline, name)
+
+		if name.startswith('_') or not callable(attribute):
+			return attribute
+
+		def queue(*args, **kwargs):
+			result = attribute(*args, **kwargs)
+
+			# commands, sent immediately while keys are watched, and calls like `multi` are not queued
+			if result is not self.pipeline: return result
+
+			self._commands.append((_command_name(name, args), (args, kwargs)))
+
+			return self
+
+		setattr(self, name, queue)
+
+		return queue
+
+	def execute(self, raise_on_error=True):
+		commands, self._commands = self._commands, []
+
+		replies = None
+		started = perf_counter()
+
+		try:
+			replies = self.pipeline.execute(raise_on_error)
+
+			return replies
+		finally:
+			latency = perf_counter() - started
+
+			for index, (command, args) in enumerate(commands):
+				reply = replies[index] if replies is not None else None
+				error = replies is None or isinstance(reply, Exception)
+
+				self.client.report(command, args, reply, latency, pipelined=True, error=error)
+
+	def reset(self):
+		self._commands = []
+		self.pipeline.reset()
+
+	def __len__(self):
+		return len(self.pipeline)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.reset()
+
+
+class InstrumentedEncoder(Encoder):
+	"""
+	Proxy of value encoder of single field, reporting time of encoding and decoding
+	"""
+
+	def __init__(self, encoder, client):
+		self.encoder = encoder
+		self._client = client
+
+	def _timed(self, kind, function, value):
+		started = perf_counter()
+
+		try:
+			return function(value)
+		finally:
+			client = self._client
+			_emit(CommandEvent(kind, client.field_class, client.key, client.pattern, kind, 0, 0, perf_counter() - started))
+
+	def encode(self, value):
+		return self._timed('encode', self.encoder.encode, value)
+
+	def decode(self, code):
+		return self._timed('decode', self.encoder.decode, code)
+
+	def encode_many(self, values):
+		return self._timed('encode', self.encoder.encode_many, values)
+
+	def decode_many(self, codes):
+		return self._timed('decode', self.encoder.decode_many, codes)
+
+	def __getattr__(self, name):
+		return getattr(self.encoder, name)
+
+
+def proxies(field):
+	"""
+	Returns pair of reporting proxies of redis client and value encoder of 'field', created on first call
+	"""
+	result = field._proxies
+
+	if result is None:
+		client = InstrumentedClient(field._client, field)
+		result = field._proxies = (client, InstrumentedEncoder(field._encoder, client))
+
+	return result
+
+
+def unwrap(redis):
+	"""
+	Returns redis client, proxied by 'redis', or 'redis' itself, if it is not proxy
+	"""
+	return redis.client if type(redis) is InstrumentedClient else redis
+
+
+class Histogram():
+	"""
+	Histogram of latencies with buckets of powers of two microseconds
+	"""
+
+	_Buckets = 32
+
+	def __init__(self):
+		self.buckets = [0] * self._Buckets
+		self.count = 0
+		self.total = 0.0
+
+	def add(self, seconds):
+		index = min(int(seconds * 1e6).bit_length(), self._Buckets - 1)
+
+		self.buckets[index] += 1
+		self.count += 1
+		self.total += seconds
+
+	def percentile(self, fraction):
+		"""
+		Returns upper bound (microseconds) of bucket, holding 'fraction' (0..1) of latencies, or None, if histogram is empty
+		"""
+		if not self.count: return None
+
+		needed = fraction * self.count
+		passed = 0
+
+		for index, number in enumerate(self.buckets):
+			passed += number
+
+			if passed >= needed and number:
+				return 1 << index
+
+		return 1 << (self._Buckets - 1)
+
+	def to_dict(self):
+		return {
+			'count': self.count,
+			'mean_us': self.total / self.count * 1e6 if self.count else None,
+			'p50_us': self.percentile(0.5),
+			'p99_us': self.percentile(0.99),
+			# upper bound in microseconds -> number of latencies
+			'buckets': {1 << index: number for index, number in enumerate(self.buckets) if number},
+		}
+
+
+class MetricsAggregator():
+	"""
+	Hook, collecting latency histograms, payload sizes and numbers of errors per key pattern and command,
+	and the most frequently used keys of each pattern. Add it with `add_hook(aggregator)`
+	"""
+
+	def __init__(self, top=10, max_keys=1000):
+		"""
+		top
+			number of hot keys per pattern in report
+
+		max_keys
+			number of counted keys per pattern, when it is exceeded, rarely used keys are dropped
+		"""
+		self._top = top
+		self._max_keys = max_keys
+		self._lock = threading.Lock()
+		self._patterns = {}
+
+	def __call__(self, event):
+		with self._lock:
+			entry = self._patterns.get(event.pattern)
+
+			if entry is None:
+				entry = self._patterns[event.pattern] = {'field_class': event.field_class.__name__, 'commands': {}, 'keys': Counter()}
+
+			stats = entry['commands'].get(event.command)
+
+			if stats is None:
+				stats = entry['commands'][event.command] = {'histogram': Histogram(), 'errors': 0, 'pipelined': 0, 'request_bytes': 0, 'reply_bytes': 0}
+
+			stats['histogram'].add(event.latency)
+			stats['errors'] += event.error
+			stats['pipelined'] += event.pipelined
+			stats['request_bytes'] += event.request_size
+			stats['reply_bytes'] += event.reply_size
+
+			if event.kind == 'command':
+				keys = entry['keys']
+				keys[event.key] += 1
+
+				if len(keys) > self._max_keys:
+					entry['keys'] = Counter(dict(keys.most_common(self._max_keys // 2)))
+
+	def top_keys(self, pattern, number=None):
+		"""
+		Returns list of pairs of key and number of commands for the most used keys of 'pattern'
+		"""
+		with self._lock:
+			entry = self._patterns.get(pattern)
+
+			return entry['keys'].most_common(number or self._top) if entry is not None else []
+
+	def report(self):
+		"""
+		Returns dictionary of collected metrics by key pattern
+		"""
+		with self._lock:
+			return {
+				pattern: {
+					'field_class': entry['field_class'],
+					'commands': {
+						command: dict(
+							stats['histogram'].to_dict(),
+							errors=stats['errors'], pipelined=stats['pipelined'],
+							request_bytes=stats['request_bytes'], reply_bytes=stats['reply_bytes']
+						)
+						for command, stats in entry['commands'].items()
+					},
+					'top_keys': entry['keys'].most_common(self._top),
+				}
+				for pattern, entry in self._patterns.items()
+			}
+
+	def reset(self):
+		with self._lock:
+			self._patterns = {}
\ No newline at end of file
@@ -1,9 +1,99 @@
 __author__ = 'Nuclight.atomAltera'
 
 from .fields import Field, StringField, ScoreStringField, RefStringField, HashField, SetField, SortedSetField
+from .fields import HashMemberField, ScoreHashMemberField, Batch
 from .encoders import Encoder, datetime_encoder
+from .counters import IdBlockAllocator
+from .instrumentation import unwrap
+
+from redis.exceptions import ResponseError
+
+from abc import ABCMeta, abstractmethod
+from inspect import signature
+from datetime import datetime, timedelta
+
+
+# Storage modes of scalar fields of objects
+KEYS_STORAGE = 'keys' # each scalar field is own key
+HASH_STORAGE = 'hash' # scalar fields are members of single hash field per object
+
+
+_CREATE_SCRIPT = """
+-- KEYS: register, keys of values (single hash key in hash storage mode), keys of index entries
+-- ARGV: object id, register score, number of values, '1' in hash storage mode, values (names and values
+-- in hash storage mode), pairs of command and argument of index entries
+local object_id = ARGV[1]
+local values = tonumber(ARGV[3])
+local hash = ARGV[4] == '1'
+
+local values_end = 4 + (hash and 2 or 1) * values
+local keys_end = 1 + (hash and 1 or values)
+
+-- unique index entries (HSET) are checked before any write
+for index = values_end + 1, #ARGV, 2 do
+	local key = KEYS[keys_end + (index - values_end + 1) / 2]
+
+	if ARGV[index] == 'HSET' and redis.call('HEXISTS', key, ARGV[index + 1]) == 1 then
+		return redis.error_reply('Value is not unique for index ' .. key)
+	end
+end
+
+redis.call('ZADD', KEYS[1], ARGV[2], object_id)
+
+if hash then
+	for index = 5, values_end, 2 do
+		redis.call('HSET', KEYS[2], ARGV[index], ARGV[index + 1])
+	end
+else
+	for index = 1, values do
+		redis.call('SET', KEYS[1 + index], ARGV[4 + index])
+	end
+end
+
+for index = values_end + 1, #ARGV, 2 do
+	local key = KEYS[keys_end + (index - values_end + 1) / 2]
+
+	if ARGV[index] == 'SADD' then
+		redis.call('SADD', key, object_id)
+	else
+		redis.call(ARGV[index], key, ARGV[index + 1], object_id)
+	end
+end
+
+return 1
+"""
+
+
+# Removes value of unique index, if it is still owned by object, used to roll back claims of unique values
+_RELEASE_SCRIPT = """
+if redis.call('HGET', KEYS[1], ARGV[1]) == ARGV[2] then
+	return redis.call('HDEL', KEYS[1], ARGV[1])
+end
+
+return 0
+"""
+
+
+def _object_id(code):
+	"""
+	Returns object id, decoded from DB: ids, allocated by counter, are integers
+	"""
+	if isinstance(code, bytes): code = code.decode(encoding='utf-8')
+
+	return int(code) if isinstance(code, str) and code.isdigit() else code
+
+
+def get_object_id_encoder(object_class):
+	"""
+	Returns encoder of objects by id, unlike object encoder it does not check existence of decoded objects
+	"""
+	def decode(code):
+		if code is None: return None
+
+		return object_class(_object_id(code))
+
+	return Encoder(str, decode)
 
-from datetime import datetime
 
 def get_object_encoder(object_class):
 	def encode(object):
@@ -12,28 +102,418 @@ def get_object_encoder(object_class):
 
 	def decode(code):
 		if code is None: return None
-		return object_class.Get(code)
+
+		return object_class.Get(_object_id(code))
 
 	return Encoder(encode, decode)
 
 
+class ObjectField():
+	"""
+	Declares field of `Object` instances in class body. Field instance is created on first access to attribute
+	"""
+
+	def __init__(self, field_class, key=None, **options):
+		"""
+		field_class
+			class of field, `StringField` for example
+
+		key
+			suffix of field key, name of attribute by default
+
+		options
+			will be passed to 'field_class' constructor
+		"""
+		self.field_class = field_class
+		self.key = key
+		self.options = options
+
+		self.name = None
+		self._slot = None
+
+	def _bind(self, name):
+		self.name = name
+		self.key = self.key or name
+		self._slot = '_field_' + name
+
+	def is_member(self, cls):
+		"""
+		Whether field of objects of 'cls' is member of object hash field
+		"""
+		return cls._Storage == HASH_STORAGE and self.field_class in cls._Member_Field_Classes
+
+	def check(self, cls):
+		"""
+		Raises exception, if options can not be honoured by field of objects of 'cls': hash member fields
+		have no own key, so options as like 'ttl' or 'redis' are not supported in hash storage mode
+		"""
+		if not self.is_member(cls): return
+
+		member_class = cls._Member_Field_Classes[self.field_class]
+		unsupported = sorted(set(self.options) - set(signature(member_class.__init__).parameters))
+
+		if unsupported:
+			raise Exception('Options %s of field %s of %s are not supported by %s in hash storage mode' % (
+				', '.join(unsupported), self.name, cls.__name__, member_class.__name__
+			))
+
+	def create(self, obj):
+		"""
+		Returns new field instance for 'obj'. In hash storage mode `StringField`s become members of object hash field
+		"""
+		if self.is_member(type(obj)):
+			return obj._Member_Field_Classes[self.field_class](obj._data, self.key, **self.options)
+
+		return self.field_class(obj._k(self.key), **self.options)
+
+	def __get__(self, obj, cls):
+		if obj is None: return self
+
+		try:
+			return getattr(obj, self._slot)
+		except AttributeError:
+			field = self.create(obj)
+			setattr(obj, self._slot, field)
+
+			return field
+
+
+class ScoreObjectField(ObjectField):
+	"""
+	Declares `ScoreStringField`, which mirrors value as score of object in sorted set field 'target' of object class
+	"""
+
+	def __init__(self, target, key=None, score_encoder=None, field_class=ScoreStringField):
+		super(ScoreObjectField, self).__init__(field_class, key=key, score_encoder=score_encoder)
+
+		self.target = target
+
+	def create(self, obj):
+		target = getattr(type(obj), self.target)
+
+		if obj._Storage == HASH_STORAGE:
+			return obj._Member_Field_Classes[self.field_class](obj._data, self.key, target, obj, **self.options)
+
+		return self.field_class(obj._k(self.key), target, obj, **self.options)
+
+
+class ClassField():
+	"""
+	Declares field of `Object` class in class body. Each class gets own field instance, created on first access.
+	Class fields (registers, id counters, indexes) do not get default time to live of `Field.Init`,
+	unless 'ttl' is passed explicitly
+	"""
+
+	def __init__(self, field_class, key=None, **options):
+		self.field_class = field_class
+		self.key = key
+		self.options = dict(options)
+		self.options.setdefault('ttl', False)
+
+		self.name = None
+		self._cache = None
+
+	def _bind(self, name):
+		self.name = name
+		self.key = self.key or name
+		self._cache = '_class_field_' + name
+
+	def create(self, cls):
+		"""
+		Returns new field instance for 'cls'
+		"""
+		return self.field_class(cls._K(self.key), **self.options)
+
+	def __get__(self, obj, cls):
+		field = cls.__dict__.get(self._cache)
+
+		if field is None:
+			field = self.create(cls)
+			setattr(cls, self._cache, field)
+
+		return field
+
+
+class RegisterClassField(ClassField):
+	"""
+	Declares `SortedSetField` of class, which values are objects of class
+	"""
+
+	def __init__(self, key=None, score_encoder=None, field_class=SortedSetField):
+		super(RegisterClassField, self).__init__(field_class, key=key, score_encoder=score_encoder)
+
+	def create(self, cls):
+		return self.field_class(cls._K(self.key), value_encoder=cls._Encoder, **self.options)
+
+
+class Index(ClassField, metaclass=ABCMeta):
+	"""
+	Declares secondary index of objects by value of scalar field 'attribute'. Indexes are updated by
+	`Object.Create`, `Object.CreateMany`, `Object.save` and `Object.delete` in the same pipeline as values,
+	writes made directly through object fields bypass them. Objects are found by indexes with `Object.Find`
+	"""
+
+	def __init__(self, attribute, field_class, key=None, **options):
+		"""
+		attribute
+			name of indexed `StringField` of object
+
+		key
+			suffix of index key, 'idx:' and name of attribute by default
+		"""
+		super(Index, self).__init__(field_class, key=key, **options)
+
+		self.attribute = attribute
+
+	def _bind(self, name):
+		self.key = self.key or 'idx:' + name
+		super(Index, self)._bind(name)
+
+	def create(self, cls):
+		return self.field_class(cls._K(self.key), value_encoder=cls._Id_Encoder, **self.options)
+
+	@abstractmethod
+	def add(self, cls, obj, value):
+		"""
+		Adds 'obj' with attribute 'value' to index of 'cls'
+
+		return value
+			result of field call (coroutine, if index is declared with asyncio field classes)
+		"""
+
+	@abstractmethod
+	def remove(self, cls, obj, value):
+		"""
+		Removes 'obj' with attribute 'value' from index of 'cls'. Returns as like `Index.add`
+		"""
+
+	@abstractmethod
+	def script_args(self, cls, value):
+		"""
+		Returns (command, key, argument) of index entry for object creation script
+		"""
+
+	@abstractmethod
+	def defer_find(self, cls, batch, condition):
+		"""
+		Queues query of ids of objects, matching 'condition', to 'batch'
+
+		return value
+			`DeferredResult` of set of ids
+		"""
+
+
+def _ids(codes):
+	return {_object_id(code) for code in codes}
+
+
+class UniqueIndex(Index):
+	"""
+	Declares unique index, `HashField`, mapping attribute values to object ids.
+	Creating or saving object with value, taken by other object, raises exception
+	"""
+
+	def __init__(self, attribute, key=None, name_encoder=None, field_class=HashField):
+		super(UniqueIndex, self).__init__(attribute, field_class, key=key, name_encoder=name_encoder)
+
+	def add(self, cls, obj, value):
+		return self.__get__(None, cls).set(value, obj)
+
+	def remove(self, cls, obj, value):
+		return self.release(cls, obj.object_id, value)
+
+	def claim(self, cls, object_id, value):
+		"""
+		Atomically sets 'object_id' as owner of 'value' with HSETNX
+
+		return value
+			True, if 'value' was free and is claimed now, False, if it is already owned by 'object_id',
+			None, if it is owned by other object
+		"""
+		field = self.__get__(None, cls)
+		name = field._name_encoder.encode(value)
+
+		if field._redis.hsetnx(field._key, name, str(object_id)):
+			return True
+
+		return False if _object_id(field._redis.hget(field._key, name)) == _object_id(str(object_id)) else None
+
+	def release(self, cls, object_id, value):
+		"""
+		Removes 'value', if it is still owned by 'object_id', with server-side script, so value, claimed by other
+		object meanwhile, is kept. Queued, if called inside `Field.batch` block
+		"""
+		field = self.__get__(None, cls)
+		args = (_RELEASE_SCRIPT, 1, field._key, field._name_encoder.encode(value), str(object_id))
+
+		batch = Batch.Current()
+
+		if batch is not None:
+			return batch.defer(field._redis, 'eval', args)
+
+		return field._redis.eval(*args)
+
+	def script_args(self, cls, value):
+		field = self.__get__(None, cls)
+		return ['HSET', field._key, field._name_encoder.encode(value)]
+
+	def defer_find(self, cls, batch, condition):
+		field = self.__get__(None, cls)
+
+		return batch.defer(field._redis, 'hget', (field._key, field._name_encoder.encode(condition)),
+			lambda code: _ids([code]) if code is not None else set()
+		)
+
+
+class RangeIndex(Index):
+	"""
+	Declares range index, `SortedSetField` of objects, scored by attribute values
+	"""
+
+	def __init__(self, attribute, key=None, score_encoder=None, field_class=SortedSetField):
+		super(RangeIndex, self).__init__(attribute, field_class, key=key, score_encoder=score_encoder or Encoder(float, float))
+
+	def add(self, cls, obj, value):
+		return self.__get__(None, cls).add(obj, value)
+
+	def remove(self, cls, obj, value):
+		return self.__get__(None, cls).delete(obj)
+
+	def script_args(self, cls, value):
+		field = self.__get__(None, cls)
+		return ['ZADD', field._key, field._score_encoder.encode(value)]
+
+	def defer_find(self, cls, batch, condition):
+		"""
+		condition
+			pair of minimal and maximal values (both inclusive), None means unbounded
+		"""
+		field = self.__get__(None, cls)
+		min_value, max_value = condition
+
+		min_score = '-inf' if min_value is None else field._score_encoder.encode(min_value)
+		max_score = '+inf' if max_value is None else field._score_encoder.encode(max_value)
+
+		return batch.defer(field._redis, 'zrangebyscore', (field._key, min_score, max_score), _ids)
+
+
+class TagIndexField():
+	"""
+	Set of `SetField`s of objects, one per tag value, available as `index[tag]`
+	"""
+
+	def __init__(self, key, value_encoder, set_class=SetField, **options):
+		self._key = key
+		self._value_encoder = value_encoder
+		self._set_class = set_class
+		self._options = options
+
+	def __getitem__(self, tag):
+		return self._set_class('%s:%s' % (self._key, tag), value_encoder=self._value_encoder, **self._options)
+
+
+class TagIndex(Index):
+	"""
+	Declares tag index, `SetField` of objects per attribute value
+	"""
+
+	def __init__(self, attribute, key=None, set_class=SetField):
+		super(TagIndex, self).__init__(attribute, TagIndexField, key=key, set_class=set_class)
+
+	def add(self, cls, obj, value):
+		return self.__get__(None, cls)[value].add(obj)
+
+	def remove(self, cls, obj, value):
+		return self.__get__(None, cls)[value].delete(obj)
+
+	def script_args(self, cls, value):
+		return ['SADD', self.__get__(None, cls)[value]._key, '']
+
+	def defer_find(self, cls, batch, condition):
+		"""
+		condition
+			tag value, or list, tuple or set of values, objects with any of them match
+		"""
+		fields = [self.__get__(None, cls)[tag] for tag in (condition if isinstance(condition, (list, tuple, set)) else [condition])]
+
+		return batch.defer(fields[0]._redis, 'sunion', [field._key for field in fields], _ids)
+
+
 class ObjectType(type):
-	def __init__(cls, name, bases, fields):
-		super(ObjectType, cls).__init__(name, bases, fields)
+	def __new__(mcs, name, bases, namespace):
+		fields = {}
+		indexes = {}
+
+		for base in reversed(bases):
+			fields.update(getattr(base, '_Fields', {}))
+			indexes.update(getattr(base, '_Indexes', {}))
+
+		slots = list(namespace.get('__slots__', ()))
+
+		for attr, value in namespace.items():
+			if isinstance(value, (ObjectField, ClassField)):
+				value._bind(attr)
+
+			if isinstance(value, ObjectField):
+				if attr not in fields: slots.append(value._slot)
+				fields[attr] = value
+
+			if isinstance(value, Index):
+				indexes[attr] = value
+
+		namespace['__slots__'] = tuple(slots)
+		namespace['_Fields'] = fields
+		namespace['_Indexes'] = indexes
+
+		return super(ObjectType, mcs).__new__(mcs, name, bases, namespace)
+
+	def __init__(cls, name, bases, namespace):
+		super(ObjectType, cls).__init__(name, bases, namespace)
 		cls._Init_Fields()
 
+		for declaration in cls._Fields.values():
+			declaration.check(cls)
+
 
 class Object(metaclass=ObjectType):
+	__slots__ = ('object_id', '_data_field', '_values', '_saved')
+
 	_Name = 'obj'
 
+	# Storage mode of scalar fields, `KEYS_STORAGE` or `HASH_STORAGE`
+	_Storage = KEYS_STORAGE
+	# Key suffix of hash field, holding scalar fields in `HASH_STORAGE` mode
+	_Data_Key = 'data'
+	_Data_Field_Class = HashField
+	# Field classes, replacing scalar field classes in `HASH_STORAGE` mode
+	_Member_Field_Classes = {StringField: HashMemberField, ScoreStringField: ScoreHashMemberField}
+	# Field classes, which values can be written with `Object.save`
+	_Scalar_Field_Classes = (StringField, HashMemberField)
+	_Create_Script = None
+	# Number of ids, reserved by process at once, if None, each object takes id from DB counter
+	_Id_Block_Size = None
+	_Id_Allocator = None
+
+	# Default time to live of objects in seconds, if None, objects do not expire
+	_Ttl = None
+	# Seconds, keys of expiring object live after its expiration moment, so `Object.PurgeExpired`
+	# can still read indexed values and remove object from register and indexes
+	_Expire_Grace = 60
+
+	_Last_Id = ClassField(StringField, 'last_id')
+	# Expiration moments of objects
+	_Expires = ClassField(SortedSetField, 'exp', score_encoder=datetime_encoder)
+
+	_Register = ClassField(SortedSetField, 'reg')
+	Register = RegisterClassField('reg', score_encoder=datetime_encoder)
+
+	create_date = ScoreObjectField('Register', score_encoder=datetime_encoder)
+	tag = ObjectField(StringField)
+
 	@classmethod
 	def _Init_Fields(cls):
 		cls._Encoder = get_object_encoder(cls)
-
-		cls._Last_Id = StringField(cls._K('last_id'))
-
-		cls._Register = SortedSetField(cls._K('reg'))
-		cls.Register = SortedSetField(cls._K('reg'), value_encoder=cls._Encoder, score_encoder=datetime_encoder)
+		cls._Id_Encoder = get_object_id_encoder(cls)
 
 	@classmethod
 	def _K(cls, name):
@@ -42,13 +522,260 @@ class Object(metaclass=ObjectType):
 	def _k(self, name):
 		return "%s:%s:%s" % (self._Name, self.object_id, name)
 
+	@property
+	def _data(self):
+		"""
+		Hash field, holding scalar fields of object in `HASH_STORAGE` mode
+		"""
+		try:
+			return self._data_field
+		except AttributeError:
+			self._data_field = self._Data_Field_Class(self._k(self._Data_Key))
+
+			return self._data_field
+
 
 	@classmethod
-	def Create(cls):
-		object_id = cls._Last_Id.increment()
+	def _Script(cls):
+		if cls.__dict__.get('_Create_Script') is None:
+			cls._Create_Script = cls._Last_Id._redis.register_script(_CREATE_SCRIPT)
+
+		return cls._Create_Script
+
+	@classmethod
+	def _Encode_Values(cls, prototype, values):
+		"""
+		Returns flat list of key suffixes (or names in object hash field in `HASH_STORAGE` mode) and
+		encoded values for fields of 'prototype' object, named in 'values'
+		"""
+		prefix_length = len(prototype._k(''))
+
+		args = []
+
+		for name, value in values.items():
+			field = getattr(prototype, name)
+
+			args.append(field._name if cls._Fields[name].is_member(cls) else field._key[prefix_length:])
+			args.append(field._value_encoder.encode(value))
+
+		return args
+
+	@classmethod
+	def _Check_Initial_Values(cls, initial_values):
+		for name in initial_values:
+			field = cls._Fields.get(name)
+
+			if type(field) is not ObjectField or field.field_class not in cls._Member_Field_Classes:
+				raise Exception('%s is not StringField of %s' % (name, cls.__name__))
+
+	@classmethod
+	def Create(cls, **initial_values):
+		"""
+		Creates new object with single call of server-side script, which atomically registers object in `Register`,
+		writes 'create_date' and 'initial_values' and adds object to indexes. Id is allocated before by DB counter
+		(or taken from block, reserved by process), all keys, written by script, are passed to it as KEYS.
+		If value of unique index is taken, nothing is written and exception is raised.
+		If class has time to live, keys of object are expired with one more pipeline.
+		If fields are routed over several nodes and keys of object are not on single node,
+		object is written as by `Object.CreateMany`, because script can not write keys of other nodes
+
+		initial_values
+			values for `StringField`s of object by attribute name
+
+		return value
+			new object
+		"""
+		object_ids = cls._Allocate_Ids(1)
+		object_id = object_ids[0] if object_ids else cls._Last_Id._redis.incr(cls._Last_Id._key)
+
+		keys, args = cls._Create_Args(initial_values, object_id)
+		client = None
+
+		if cls._Register._router is not None:
+			clients = {id(cls._Client(key)): cls._Client(key) for key in keys}
+
+			if len(clients) > 1:
+				return cls._Create_Objects([cls(object_id)], initial_values)[0]
+
+			client, = clients.values()
+
+		try:
+			cls._Script()(keys=keys, args=args, client=client or cls._Register._redis)
+		except ResponseError as error:
+			raise Exception(str(error))
 
 		new_object = cls(object_id)
-		new_object.create_date.set(datetime.now())
+
+		if cls._Ttl is not None:
+			new_object.expire()
+
+		return new_object
+
+	@classmethod
+	def _Create_Args(cls, initial_values, object_id):
+		"""
+		Returns keys and arguments of object creation script for object with 'object_id'
+		"""
+		cls._Check_Initial_Values(initial_values)
+
+		create_date = datetime.now()
+
+		new_object = cls(object_id)
+		values = dict(initial_values, create_date=create_date)
+		pairs = cls._Encode_Values(new_object, values)
+
+		keys = [cls._Register._key]
+		args = [object_id, cls.Register._score_encoder.encode(create_date), len(pairs) // 2]
+
+		if cls._Storage == HASH_STORAGE:
+			keys.append(new_object._data._key)
+			args += ['1'] + pairs
+		else:
+			keys += [new_object._k(suffix) for suffix in pairs[::2]]
+			args += ['0'] + pairs[1::2]
+
+		for index in cls._Indexes.values():
+			if values.get(index.attribute) is not None:
+				command, key, argument = index.script_args(cls, values[index.attribute])
+
+				keys.append(key)
+				args += [command, argument]
+
+		return keys, args
+
+	@classmethod
+	def CreateMany(cls, number, chunk_size=1000, **initial_values):
+		"""
+		Creates 'number' of objects. Ids are reserved with single INCRBY (or taken from blocks, reserved by process,
+		if `_Id_Block_Size` is set), then objects are registered,
+		'create_date' and 'initial_values' are written and objects are indexed with one pipeline per 'chunk_size' objects
+
+		initial_values
+			values for `StringField`s of each object by attribute name
+
+		return value
+			list of new objects
+		"""
+		if number <= 0:
+			raise Exception('Number must be positive')
+
+		cls._Check_Initial_Values(initial_values)
+
+		object_ids = cls._Allocate_Ids(number)
+
+		if object_ids is None:
+			last_id = cls._Last_Id._redis.incr(cls._Last_Id._key, number)
+			object_ids = range(last_id - number + 1, last_id + 1)
+
+		return cls._Create_Objects([cls(object_id) for object_id in object_ids], initial_values, chunk_size)
+
+	@classmethod
+	def _Create_Objects(cls, objects, initial_values, chunk_size=1000):
+		"""
+		Writes new 'objects' with allocated ids, claiming values of unique indexes before
+		"""
+		create_date = datetime.now()
+		values = dict(initial_values, create_date=create_date)
+		args = cls._Encode_Values(objects[0], values)
+
+		indexes = [(index, values[index.attribute]) for index in cls._Indexes.values() if values.get(index.attribute) is not None]
+
+		unique = [(index, value) for index, value in indexes if isinstance(index, UniqueIndex)]
+
+		if unique and len(objects) > 1:
+			raise Exception('Value of unique index can not be set for many objects')
+
+		if unique:
+			# unique values are claimed before any write, so concurrent creations can not take the same value
+			unique = cls._Claim_Unique(unique, objects[0].object_id)
+			indexes = [(index, value) for index, value in indexes if not isinstance(index, UniqueIndex)]
+
+		try:
+			cls._Write_New(objects, create_date, args, indexes, chunk_size)
+		except Exception:
+			if unique: cls._Release_Unique(unique, objects[0].object_id)
+			raise
+
+		return objects
+
+	@classmethod
+	def _Write_New(cls, objects, create_date, args, indexes, chunk_size):
+		"""
+		Registers new 'objects', writes encoded values 'args' and adds objects to 'indexes' (pairs of index and value)
+		"""
+		number = len(objects)
+
+		for start in range(0, number, chunk_size):
+			chunk = objects[start:start + chunk_size]
+
+			with Field.batch() as batch:
+				cls.Register.add_multi(dict.fromkeys(chunk, create_date))
+
+				for new_object in chunk:
+					if cls._Storage == HASH_STORAGE:
+						batch.defer(new_object._data._redis, 'hmset', (new_object._data._key, dict(zip(args[::2], args[1::2]))))
+					else:
+						for index in range(0, len(args), 2):
+							key = new_object._k(args[index])
+							batch.defer(cls._Client(key), 'set', (key, args[index + 1]))
+
+					for index, value in indexes:
+						index.add(cls, new_object, value)
+
+					if cls._Ttl is not None:
+						new_object._defer_expire(batch, cls._Ttl)
+
+	@classmethod
+	def _Allocate_Ids(cls, number):
+		"""
+		Returns list of 'number' ids from blocks, reserved by process, or None, if class does not reserve ids
+		"""
+		if cls._Id_Block_Size is None: return None
+
+		if cls.__dict__.get('_Id_Allocator') is None:
+			cls._Id_Allocator = IdBlockAllocator(cls._Last_Id, cls._Id_Block_Size)
+
+		return cls._Id_Allocator.allocate(number)
+
+	@classmethod
+	def _Client(cls, key):
+		"""
+		Returns redis client of object 'key'
+		"""
+		router = cls._Register._router
+		return router.client(key) if router is not None else unwrap(cls._Register._redis)
+
+	@classmethod
+	def _Claim_Unique(cls, unique, object_id):
+		"""
+		Claims values of unique indexes for 'object_id'. If any value is taken by other object,
+		values, claimed by this call, are released and exception is raised
+
+		unique
+			collection of pairs of `UniqueIndex` and value
+
+		return value
+			list of pairs of index and value, claimed by this call (not owned by object before)
+		"""
+		claimed = []
+
+		for index, value in unique:
+			result = index.claim(cls, object_id, value)
+
+			if result is None:
+				cls._Release_Unique(claimed, object_id)
+				raise Exception('Value of %s is not unique for index %s' % (index.attribute, index.name))
+
+			if result: claimed.append((index, value))
+
+		return claimed
+
+	@classmethod
+	def _Release_Unique(cls, unique, object_id):
+		# claims are rolled back immediately, even if object is written inside outer batch
+		with Batch.Suspended():
+			for index, value in unique:
+				index.release(cls, object_id, value)
 
 	@classmethod
 	def Get(cls, object_id):
@@ -56,6 +783,218 @@ class Object(metaclass=ObjectType):
 
 		return cls(object_id)
 
+	@classmethod
+	def GetMany(cls, object_ids):
+		"""
+		Returns objects by 'object_ids', checking existence of all of them with single call
+
+		return value
+			list of objects in the same order as requested in 'object_ids', None for not existing objects
+		"""
+		object_ids = list(object_ids)
+		scores = cls._Register.score_of_multi(object_ids)
+
+		return [cls(object_id) if score is not None else None for object_id, score in zip(object_ids, scores)]
+
+	@classmethod
+	def DeleteMany(cls, object_ids, chunk_size=1000, transaction=False, unlink=False):
+		"""
+		Removes objects by 'object_ids' as like `Object.delete`, with one pipeline per 'chunk_size' objects
+
+		return value
+			number of objects, that were registered
+		"""
+		object_ids = list(object_ids)
+		number = 0
+
+		for start in range(0, len(object_ids), chunk_size):
+			number += cls._Delete_Objects([cls(object_id) for object_id in object_ids[start:start + chunk_size]], transaction, unlink)
+
+		return number
+
+	@classmethod
+	def _Delete_Plan(cls, objects):
+		"""
+		Returns keys of 'objects' grouped by redis client, values to be removed from sorted set fields
+		(other than `Register`) grouped by key, and fields, that must be destroyed separately
+		"""
+		keys = {}
+		targets = {}
+		fields = []
+
+		for obj in objects:
+			for name, declaration in cls._Fields.items():
+				field = getattr(obj, name)
+
+				if isinstance(field, RefStringField):
+					# reads referenced name, so can not be queued
+					fields.append(field)
+					continue
+
+				target = getattr(field, '_target_sortedSetField', None)
+
+				if target is not None and target._key != cls._Register._key:
+					targets.setdefault(target._key, (target, []))[1].append(field._target_sortedSetField_value)
+
+				if not declaration.is_member(cls):
+					redis = unwrap(field._redis)
+					keys.setdefault(id(redis), (redis, []))[1].append(field._key)
+
+			if cls._Storage == HASH_STORAGE:
+				redis = unwrap(obj._data._redis)
+				keys.setdefault(id(redis), (redis, []))[1].append(obj._data._key)
+
+		return keys, targets, fields
+
+	@staticmethod
+	def _Defer_Delete(batch, keys, unlink):
+		for redis, redis_keys in keys.values():
+			if unlink:
+				batch.defer(redis, 'execute_command', ['UNLINK'] + redis_keys)
+			else:
+				batch.defer(redis, 'delete', redis_keys)
+
+	@classmethod
+	def _Read_Indexed(cls, objects):
+		"""
+		Returns list of dictionaries of current values of indexed attributes of 'objects', read with single pipeline
+		"""
+		attributes = {index.attribute for index in cls._Indexes.values()}
+
+		if not attributes:
+			return [{} for obj in objects]
+
+		batch = Batch()
+		reads = [obj._defer_read(batch, attributes) for obj in objects]
+		batch.execute()
+
+		return [read() for read in reads]
+
+	@classmethod
+	def _Delete_Objects(cls, objects, transaction, unlink):
+		keys, targets, fields = cls._Delete_Plan(objects)
+		indexed = cls._Read_Indexed(objects)
+		cached = cls._Cached_Fields(objects)
+
+		for field in fields:
+			field.destroy()
+
+		with Field.batch(transaction) as batch:
+			for target, values in targets.values():
+				target.delete(*values)
+
+			for obj, values in zip(objects, indexed):
+				for index in cls._Indexes.values():
+					if values[index.attribute] is not None:
+						index.remove(cls, obj, values[index.attribute])
+
+			cls._Defer_Delete(batch, keys, unlink)
+
+			# keys are removed with raw commands, so caches of fields are notified here
+			for field in cached:
+				field._cache.queued(field._key, batch)
+
+			cls._Expires.delete(*objects)
+			result = cls._Register.delete(*objects)
+
+		for field in cached:
+			field._cache.invalidate(field._key)
+
+		return result.value
+
+	@classmethod
+	def _Cached_Fields(cls, objects):
+		"""
+		Returns fields of 'objects' with attached `FieldCache`
+		"""
+		return [field for obj in objects for field in (getattr(obj, name) for name in cls._Fields) if field._cache is not None]
+
+	@classmethod
+	def Find(cls, **conditions):
+		"""
+		Returns objects, matching all 'conditions', resolved by indexes with single pipeline
+
+		conditions
+			conditions by index name: value for `UniqueIndex`, pair of minimal and maximal values for `RangeIndex`,
+			value or list of values for `TagIndex`
+
+		return value
+			list of objects, ordered by id
+		"""
+		batch = Batch()
+		complete = cls._Defer_Find(batch, conditions)
+		batch.execute()
+
+		return complete()
+
+	@classmethod
+	def _Defer_Find(cls, batch, conditions):
+		"""
+		Queues index queries of `Object.Find` to 'batch'
+
+		return value
+			function, which returns found objects after 'batch' is executed
+		"""
+		if not conditions:
+			raise Exception('No conditions specified')
+
+		results = []
+
+		for name, condition in conditions.items():
+			index = cls._Indexes.get(name)
+
+			if index is None:
+				raise Exception('%s is not index of %s' % (name, cls.__name__))
+
+			results.append(index.defer_find(cls, batch, condition))
+
+		def complete():
+			object_ids = set.intersection(*(result.value for result in results))
+
+			return [cls(object_id) for object_id in sorted(object_ids)]
+
+		return complete
+
+	@classmethod
+	def PurgeExpired(cls, limit=None, chunk_size=1000):
+		"""
+		Removes objects, which expiration moments passed, from register and indexes (their keys are removed by DB).
+		Reads only expired entries, so it is cheap to call periodically
+
+		limit
+			maximal number of removed objects, all expired by default
+
+		return value
+			number of removed objects
+		"""
+		object_ids = cls._Expires.range_by_score(max_score=datetime.now(), limit=limit)
+
+		if not object_ids: return 0
+
+		cls.DeleteMany(object_ids, chunk_size=chunk_size)
+
+		return len(object_ids)
+
+	@classmethod
+	def _Keys(cls, obj):
+		"""
+		Returns keys of 'obj' grouped by redis client
+		"""
+		keys = {}
+
+		for name, declaration in cls._Fields.items():
+			if declaration.is_member(cls): continue
+
+			field = getattr(obj, name)
+			redis = unwrap(field._redis)
+			keys.setdefault(id(redis), (redis, []))[1].append(field._key)
+
+		if cls._Storage == HASH_STORAGE:
+			redis = unwrap(obj._data._redis)
+			keys.setdefault(id(redis), (redis, []))[1].append(obj._data._key)
+
+		return keys
+
 	@classmethod
 	def Exists(cls, object_id):
 		return cls._Register.contains(object_id)
@@ -66,11 +1005,237 @@ class Object(metaclass=ObjectType):
 
 		self.object_id = object_id
 
-		self.create_date = ScoreStringField(self._k('create_date'), self.Register, self, score_encoder=datetime_encoder)
-		self.tag = StringField(self._k('tag'))
+	def __str__(self):
+		return str(self.object_id)
+
+	def _cache(self):
+		try:
+			return self._values
+		except AttributeError:
+			self._values = {}
+			self._saved = {}
+
+			return self._values
+
+	def load(self, fields=None):
+		"""
+		Reads values of all declared fields, or only of 'fields', with single pipeline and caches decoded values
+		on object, they are available as `object[name]`. In `HASH_STORAGE` mode scalar fields are read with
+		single HGETALL, or HMGET, if 'fields' specified
+
+		fields
+			collection of field names, all declared fields by default
+
+		return value
+			dictionary of decoded values by field name, scalar fields, that does not exist, have None value
+		"""
+		batch = Batch()
+		complete = self._defer_load(batch, fields)
+		batch.execute()
+
+		return complete()
+
+	def _defer_load(self, batch, fields):
+		"""
+		Queues reading commands of `Object.load` to 'batch'
+
+		return value
+			function, which decodes and caches values after 'batch' is executed and returns them
+		"""
+		read = self._defer_read(batch, fields)
+
+		def complete():
+			values = read()
+
+			self._cache().update(values)
+			self._saved.update(values)
+
+			return values
+
+		return complete
+
+	def _defer_read(self, batch, fields):
+		"""
+		As like `Object._defer_load`, but returned function does not cache values
+		"""
+		names = list(self._Fields) if fields is None else list(fields)
+
+		results = {}
+		members = []
+
+		for name in names:
+			if name not in self._Fields:
+				raise Exception('%s is not field of %s' % (name, type(self).__name__))
+
+			field = getattr(self, name)
+
+			if self._Fields[name].is_member(type(self)):
+				members.append((name, field))
+			else:
+				command, args, decode = field._load_command()
+				results[name] = batch.defer(field._redis, command, args, decode)
+
+		if members:
+			member_names = [field._name for name, field in members]
+
+			if fields is None:
+				data = batch.defer(self._data._redis, 'hgetall', (self._data._key, ))
+			else:
+				data = batch.defer(self._data._redis, 'hmget', (self._data._key, member_names),
+					lambda values: dict(zip(member_names, values))
+				)
+
+		def complete():
+			values = {name: result.value for name, result in results.items()}
+
+			for name, field in members:
+				values[name] = field._decode(data.value.get(field._name))
+
+			return values
+
+		return complete
+
+	def save(self, transaction=False):
+		"""
+		Writes values of scalar fields, changed with `object[name] = value` since last load or save,
+		with single pipeline. None value removes field. Indexes of changed fields are updated in the same pipeline,
+		their previous values, if not loaded, are read with one more pipeline before. New values of unique indexes
+		are claimed atomically (HSETNX) before any write, if any of them is taken by other object, values, claimed
+		by this call, are released and exception is raised. Old values of unique indexes are removed only after
+		all new ones are claimed, and only if they are still owned by object. If class has time to live,
+		expiration of object is prolonged
+
+		transaction
+			whether commands must be wrapped into MULTI/EXEC
+
+		return value
+			set of names of written fields
+		"""
+		changed = self._changed()
+		indexes = [index for index in self._Indexes.values() if index.attribute in changed]
+
+		old_values = self._read_old_values(indexes)
+
+		unique = [(index, changed[index.attribute]) for index in indexes if isinstance(index, UniqueIndex) and changed[index.attribute] is not None]
+		claimed = self._Claim_Unique(unique, self.object_id) if unique else []
+
+		try:
+			with Field.batch(transaction):
+				for name, value in changed.items():
+					field = getattr(self, name)
+
+					if value is None:
+						field.destroy()
+					else:
+						field.set(value)
+
+				for index in indexes:
+					old_value = old_values[index.attribute]
+					value = changed[index.attribute]
+
+					if old_value == value: continue
+
+					if old_value is not None:
+						index.remove(type(self), self, old_value)
+					if value is not None and not isinstance(index, UniqueIndex):
+						index.add(type(self), self, value)
+
+				if self._Ttl is not None and changed:
+					self._defer_expire(Batch.Current(), self._Ttl)
+		except Exception:
+			if claimed: self._Release_Unique(claimed, self.object_id)
+			raise
+
+		self._saved.update(changed)
+
+		return set(changed)
+
+	def _read_old_values(self, indexes):
+		"""
+		Returns stored values of attributes of 'indexes', reading ones, which were not loaded, with single pipeline
+		"""
+		unknown = {index.attribute for index in indexes if index.attribute not in self._saved}
+
+		if not unknown:
+			return {index.attribute: self._saved[index.attribute] for index in indexes}
+
+		batch = Batch()
+		read = self._defer_read(batch, unknown)
+		batch.execute()
+
+		return dict({index.attribute: self._saved.get(index.attribute) for index in indexes}, **read())
+
+	def _changed(self):
+		values = self._cache()
+		return {name: value for name, value in values.items() if name not in self._saved or self._saved[name] != value}
+
+	def __getitem__(self, name):
+		return self._cache()[name]
+
+	def __setitem__(self, name, value):
+		if name not in self._Fields or not isinstance(getattr(self, name), self._Scalar_Field_Classes):
+			raise Exception('%s is not scalar field of %s' % (name, type(self).__name__))
+
+		self._cache()[name] = value
+
+
+	def expire(self, seconds=None):
+		"""
+		Sets time to live of all keys of object, so they expire together, with single pipeline.
+		Note that keys, created after this call, do not expire, `Object.save` expires them again, if class has time to live
+
+		seconds
+			number of seconds or `timedelta`, time to live of class by default
+		"""
+		seconds = seconds if seconds is not None else self._Ttl
+
+		if seconds is None:
+			raise Exception('Time to live is not specified')
+
+		with Field.batch() as batch:
+			self._defer_expire(batch, seconds)
+
+	def _defer_expire(self, batch, seconds):
+		if isinstance(seconds, timedelta): seconds = seconds.total_seconds()
+
+		milliseconds = int((seconds + self._Expire_Grace) * 1000)
+
+		for redis, keys in self._Keys(self).values():
+			for key in keys:
+				batch.defer(redis, 'pexpire', (key, milliseconds))
+
+		self._Expires.add(self, datetime.now() + timedelta(seconds=seconds))
+
+	def persist(self):
+		"""
+		Removes time to live of all keys of object
+		"""
+		with Field.batch() as batch:
+			for redis, keys in self._Keys(self).values():
+				for key in keys:
+					batch.defer(redis, 'persist', (key, ))
+
+			self._Expires.delete(self)
+
+	def ttl(self):
+		"""
+		Returns seconds, left to expiration of object, or None, if object does not expire
+		"""
+		timestamp = self._Expires.score_of(self)
+
+		return timestamp - datetime.now().timestamp() if timestamp is not None else None
+
+	def delete(self, transaction=False, unlink=False):
+		"""
+		Removes all keys of object and its entry in `Register` with single pipeline
+
+		transaction
+			whether commands must be wrapped into MULTI/EXEC
 
+		unlink
+			whether keys must be removed with UNLINK (DB frees memory in background) instead of DEL
 
-	def delete(self):
-		for value in self.__dict__.values():
-			if isinstance(value, Field):
-				value.destroy()
\ No newline at end of file
+		return value
+			True, if object was registered, else False
+		"""
+		return bool(self._Delete_Objects([self], transaction, unlink))
\ No newline at end of file
@@ -0,0 +1,271 @@
+__author__ = 'Nuclight.atomAltera'
+
+from hashlib import sha1
+
+from .fields import SetField, SortedSetField
+from .routing import hash_tag
+from .instrumentation import unwrap
+
+
+class Query():
+	"""
+	Composes filters over `SetField`s and `SortedSetField`s. Intersections, unions and differences are evaluated by DB
+	(SINTERSTORE, ZINTERSTORE, ZUNIONSTORE...) into temporary keys, which expire after 'ttl' seconds. Temporary keys
+	are named by expression, so intermediate results are reused by all queries, containing the same subexpression,
+	while they live. Only requested page of result is sent to client.
+
+	Queries are built from fields with operators: `Query(a) & b` - intersection, `Query(a) | b` - union,
+	`Query(a) - b` - difference. If any operand is sorted set field, result is sorted set, scores are summed.
+
+	If fields are routed over several nodes, all fields of query must be on one node (use hash tags),
+	temporary keys get hash tag of the first field
+	"""
+
+	_Prefix = 'query'
+	_Ttl = 60
+
+	# Temporary keys, which expire sooner (milliseconds), are computed again
+	_Min_Pttl = 1000
+
+	@classmethod
+	def Init(cls, prefix='query', ttl=60):
+		"""
+		Initialize global Query settings
+
+		prefix
+			prefix of temporary keys
+
+		ttl
+			seconds, temporary keys live for, results of queries can be stale for this time
+		"""
+		cls._Prefix = prefix
+		cls._Ttl = ttl
+
+	def __init__(self, field=None, operation=None, operands=(), weights=None, ttl=None):
+		"""
+		field
+			`SetField` or `SortedSetField`, query of all its values
+
+		ttl
+			seconds, temporary keys of this query live for, `Query.Init` setting by default
+		"""
+		self._field = field
+		self._operation = operation
+		self._operands = tuple(operands)
+		self._weights = weights
+		self._ttl = ttl or self._Ttl
+		self._desc = False
+
+		if field is None and any(operand._redis is not self._operands[0]._redis for operand in self._operands):
+			raise Exception('Fields of query are on different nodes, use hash tags to place them together')
+
+		if field is not None:
+			if not isinstance(field, (SetField, SortedSetField)):
+				raise Exception('Query field must be SetField or SortedSetField')
+
+			self.key = field._key
+			self.sorted = isinstance(field, SortedSetField)
+			self._expression = self.key
+		else:
+			expressions = [operand._expression for operand in self._operands]
+
+			if operation in ('inter', 'union'):
+				# operands of commutative operations are ordered, so equal subexpressions share key
+				expressions.sort()
+
+			self.sorted = any(operand.sorted for operand in self._operands) or operation == 'sort'
+			self._expression = '%s(%s%s)' % (operation, ','.join(expressions), ';%s' % (weights, ) if weights else '')
+		leaf = self
+		while leaf._field is None:
+			leaf = leaf._operands[0]
+
+		self._redis = unwrap(leaf._field._redis)
+		self._value_encoder = leaf._field._value_encoder
+
+		if field is None:
+			digest = sha1(self._expression.encode(encoding='utf-8')).hexdigest()
+
+			if leaf._field._router is not None:
+				self.key = '%s:{%s}:%s' % (self._Prefix, hash_tag(leaf.key), digest)
+			else:
+				self.key = '%s:%s' % (self._Prefix, digest)
+
+	@staticmethod
+	def _Wrap(operand):
+		return operand if isinstance(operand, Query) else Query(operand)
+
+	def _combine(self, operation, others):
+		return Query(operation=operation, operands=(self, ) + tuple(map(self._Wrap, others)), ttl=self._ttl)
+
+	def intersection(self, *others):
+		return self._combine('inter', others)
+
+	def union(self, *others):
+		return self._combine('union', others)
+
+	def difference(self, *others):
+		return self._combine('diff', others)
+
+	def __and__(self, other):
+		return self.intersection(other)
+
+	def __or__(self, other):
+		return self.union(other)
+
+	def __sub__(self, other):
+		return self.difference(other)
+
+	def sort_by(self, sortedSetField, desc=False):
+		"""
+		Returns query of the same values, ordered by their scores in 'sortedSetField'.
+		Values, which are not members of 'sortedSetField', are excluded
+
+		desc
+			whether values must be ordered from highest score to lowest
+		"""
+		query = Query(operation='sort', operands=(self, self._Wrap(sortedSetField)), weights=(0, 1), ttl=self._ttl)
+		query._desc = desc
+
+		return query
+
+	def _nodes(self):
+		"""
+		Returns computed nodes of expression tree, children before parents
+		"""
+		if self._field is not None: return []
+
+		nodes = []
+
+		for operand in self._operands:
+			nodes += operand._nodes()
+
+		return nodes + [self]
+
+	def _queue(self, pipeline, alive, queued):
+		"""
+		Queues commands, computing this node and its not alive children, to 'pipeline'
+		"""
+		if self._field is not None or self.key in alive or self.key in queued: return
+
+		for operand in self._operands:
+			operand._queue(pipeline, alive, queued)
+
+		keys = [operand.key for operand in self._operands]
+
+		if self.sorted:
+			command = {'inter': 'ZINTERSTORE', 'sort': 'ZINTERSTORE', 'union': 'ZUNIONSTORE', 'diff': 'ZDIFFSTORE'}[self._operation]
+			args = [command, self.key, len(keys)] + keys
+
+			if self._weights:
+				args += ['WEIGHTS'] + list(self._weights)
+		else:
+			command = {'inter': 'SINTERSTORE', 'union': 'SUNIONSTORE', 'diff': 'SDIFFSTORE'}[self._operation]
+			args = [command, self.key] + keys
+
+		pipeline.execute_command(*args)
+		pipeline.expire(self.key, self._ttl)
+
+		queued.add(self.key)
+
+	def _execute(self, command, *args, **options):
+		"""
+		Computes result key, if it is not alive, and runs reading 'command' on it in the same transaction.
+		Takes two calls, the first one checks, which temporary keys are alive. Check and transaction are not atomic:
+		keys are reused only if they live at least `_Min_Pttl` milliseconds more, so they expire between the calls
+		only if the second one is delayed for longer, but keys, removed by `Query.invalidate` of other client
+		between the calls, are not computed again and read as empty
+
+		return value
+			result of reading command
+		"""
+		nodes = self._nodes()
+		alive = set()
+
+		if nodes:
+			pipeline = self._redis.pipeline(False)
+
+			for node in nodes:
+				pipeline.pttl(node.key)
+
+			alive = {node.key for node, pttl in zip(nodes, pipeline.execute()) if pttl is not None and pttl >= self._Min_Pttl}
+
+		pipeline = self._redis.pipeline(True)
+		self._queue(pipeline, alive, set())
+
+		getattr(pipeline, command)(self.key, *args, **options)
+
+		return pipeline.execute()[-1]
+
+	def store(self):
+		"""
+		Evaluates query
+
+		return value
+			key, holding result
+		"""
+		self._execute('exists')
+
+		return self.key
+
+	def count(self):
+		"""
+		Returns number of values in result
+		"""
+		return self._execute('zcard' if self.sorted else 'scard')
+
+	def range(self, start=0, stop=-1):
+		"""
+		Returns values from 'start' to 'stop' (both inclusive) index of result. Sorted results are ordered by score,
+		others by encoded value. Negative indexes count from the end, for not sorted results they (except 'stop' -1)
+		are resolved with one more call, reading number of values
+
+		return value
+			list of decoded values
+		"""
+		if self.sorted:
+			values = self._execute('zrevrange' if self._desc else 'zrange', start, stop)
+		else:
+			if start < 0 or stop < -1:
+				count = self.count()
+
+				start = max(count + start, 0) if start < 0 else start
+				stop = count - 1 if stop == -1 else count + stop if stop < 0 else stop
+
+			if stop >= 0 and stop < start or stop < -1: return []
+
+			values = self._execute('sort', start=start, num=stop - start + 1 if stop >= 0 else -1, alpha=True)
+
+		return self._value_encoder.decode_many(values)
+
+	def page(self, number, size=20):
+		"""
+		Returns page 'number' (from zero) of result, 'size' values per page
+
+		return value
+			list of decoded values
+		"""
+		return self.range(number * size, (number + 1) * size - 1)
+
+	def values(self):
+		"""
+		Returns all values of result
+
+		return value
+			list of decoded values
+		"""
+		return self.range()
+
+	def invalidate(self):
+		"""
+		Removes temporary keys of query, so they are computed again by next read
+		"""
+		keys = [node.key for node in self._nodes()]
+
+		if keys:
+			self._redis.delete(*keys)
+
+	def __len__(self):
+		return self.count()
+
+	def __iter__(self):
+		return iter(self.values())
\ No newline at end of file
@@ -0,0 +1,180 @@
+__author__ = 'Nuclight.atomAltera'
+
+from abc import ABC, abstractmethod
+from bisect import bisect
+from binascii import crc_hqx
+from hashlib import md5
+
+# Number of hash slots of Redis Cluster
+SLOTS = 16384
+
+
+def hash_tag(key):
+	"""
+	Returns part of 'key', used for routing: substring inside first {...}, if it is not empty, else whole key.
+	Keys with equal hash tags are always placed on the same node
+	"""
+	start = key.find('{')
+
+	if start != -1:
+		end = key.find('}', start + 1)
+
+		if end > start + 1:
+			return key[start + 1:end]
+
+	return key
+
+
+def key_slot(key):
+	"""
+	Returns Redis Cluster hash slot of 'key' (CRC16 of hash tag modulo 16384)
+	"""
+	return crc_hqx(hash_tag(key).encode(encoding='utf-8'), 0) % SLOTS
+
+
+class Router(ABC):
+	"""
+	Picks redis client for each key. Router can be passed to `Field.Init` or field constructor instead of client,
+	then field uses client of its key. Note that commands, queued to one batch with transaction, are atomic
+	only per node
+	"""
+
+	@abstractmethod
+	def client(self, key):
+		"""
+		Returns redis client of node, holding 'key'
+		"""
+
+	@abstractmethod
+	def clients(self):
+		"""
+		Returns list of clients of all nodes
+		"""
+
+	def group(self, keys):
+		"""
+		Groups 'keys' by node
+
+		return value
+			list of pairs of client and list of its keys, in order of first occurrence
+		"""
+		groups = {}
+
+		for key in keys:
+			client = self.client(key)
+			groups.setdefault(id(client), (client, []))[1].append(key)
+
+		return list(groups.values())
+
+
+class HashRingRouter(Router):
+	"""
+	Distributes keys over standalone nodes with consistent hashing, so adding or removing node moves
+	only its share of keys
+	"""
+
+	def __init__(self, clients, replicas=160):
+		"""
+		clients
+			dictionary of redis clients by node name, or list of clients, named by their host, port and db.
+			Names define positions of nodes on ring, so they must be stable between processes
+
+		replicas
+			number of points of each node on ring, more points give more even distribution
+		"""
+		if not isinstance(clients, dict):
+			clients = {self._Name(client, index): client for index, client in enumerate(clients)}
+
+		if not clients:
+			raise Exception('No clients specified')
+
+		points = []
+
+		for name, client in clients.items():
+			for replica in range(replicas):
+				points.append((self._Hash('%s#%d' % (name, replica)), client))
+
+		points.sort(key=lambda point: point[0])
+
+		self._hashes = [point[0] for point in points]
+		self._points = [point[1] for point in points]
+		self._clients = list(clients.values())
+
+	@staticmethod
+	def _Name(client, index):
+		options = getattr(getattr(client, 'connection_pool', None), 'connection_kwargs', {})
+
+		if 'host' in options:
+			return '%s:%s/%s' % (options['host'], options.get('port', 6379), options.get('db', 0))
+
+		return str(index)
+
+	@staticmethod
+	def _Hash(value):
+		return int(md5(value.encode(encoding='utf-8')).hexdigest()[:16], 16)
+
+	def client(self, key):
+		index = bisect(self._hashes, self._Hash(hash_tag(key)))
+
+		return self._points[index % len(self._points)]
+
+	def clients(self):
+		return list(self._clients)
+
+
+class SlotRouter(Router):
+	"""
+	Routes keys to nodes of Redis Cluster by hash slots
+	"""
+
+	def __init__(self, slots):
+		"""
+		slots
+			collection of triples: first slot, last slot (inclusive) and client of master node, serving them
+		"""
+		self._slots = [None] * SLOTS
+		self._clients = []
+
+		for start, end, client in slots:
+			self._slots[start:end + 1] = [client] * (end - start + 1)
+
+			if all(client is not other for other in self._clients):
+				self._clients.append(client)
+
+		if any(client is None for client in self._slots):
+			raise Exception('Not all slots are covered')
+
+	@classmethod
+	def FromCluster(cls, redis, client_class=None, **options):
+		"""
+		Creates router from CLUSTER SLOTS reply of any node of cluster
+
+		redis
+			client of any node of cluster
+
+		client_class
+			class of clients of masters, class of 'redis' by default
+
+		options
+			will be passed to client constructor
+		"""
+		client_class = client_class or type(redis)
+		clients = {}
+		slots = []
+
+		for entry in redis.execute_command('CLUSTER', 'SLOTS'):
+			host, port = entry[2][0], int(entry[2][1])
+			if isinstance(host, bytes): host = host.decode(encoding='utf-8')
+
+			if (host, port) not in clients:
+				clients[(host, port)] = client_class(host=host, port=port, **options)
+
+			slots.append((int(entry[0]), int(entry[1]), clients[(host, port)]))
+
+		return cls(slots)
+
+	def client(self, key):
+		return self._slots[key_slot(key)]
+
+	def clients(self):
+		return list(self._clients)
\ No newline at end of file
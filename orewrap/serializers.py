@@ -2,6 +2,8 @@ __author__ = 'Nuclight.atomAltera'
 
 from datetime import datetime
 from base64 import b64encode, b64decode
+import struct
+import zlib
 
 class Serializer():
 	def dump(self, value):
@@ -45,8 +47,104 @@ class Base64Serializer(Serializer):
 		return b64decode(data).decode()
 
 
+class StructSerializer(Serializer):
+	"""
+	Packs numbers to fixed width binary form, '<q' (int64) by default
+	https://docs.python.org/3/library/struct.html#format-characters
+	"""
+	def __init__(self, format='<q'):
+		self._struct = struct.Struct(format)
+
+	def dump(self, value):
+		return self._struct.pack(value)
+
+	def load(self, data):
+		return self._struct.unpack(data)[0]
+
+class TimestampSerializer(StructSerializer):
+	"""
+	Packs datetime as float64 timestamp
+	"""
+	def __init__(self):
+		super(TimestampSerializer, self).__init__('<d')
+
+	def dump(self, value):
+		assert isinstance(value, datetime)
+
+		return super(TimestampSerializer, self).dump(value.timestamp())
+
+	def load(self, data):
+		return datetime.fromtimestamp(super(TimestampSerializer, self).load(data))
+
+class MsgPackSerializer(Serializer):
+	"""
+	Packs dicts, lists and scalars with MessagePack, requires `msgpack` package
+	"""
+	def __init__(self):
+		import msgpack
+
+		self._msgpack = msgpack
+
+	def dump(self, value):
+		return self._msgpack.packb(value, use_bin_type=True)
+
+	def load(self, data):
+		return self._msgpack.unpackb(data, raw=False)
+
+class CompressSerializer(Serializer):
+	"""
+	Compresses data, dumped by 'serializer', if it is longer than 'threshold' bytes.
+	First byte of result marks compression method, so small values stay almost unchanged
+
+	method
+		'zlib' or 'lz4' (requires `lz4` package)
+	"""
+	_Raw = b'\x00'
+	_Methods = {'zlib': b'\x01', 'lz4': b'\x02'}
+
+	def __init__(self, serializer=None, threshold=512, method='zlib'):
+		if method not in self._Methods:
+			raise Exception('Unknown compression method: %s' % method)
+
+		self._serializer = serializer or stringSerializer
+		self._threshold = threshold
+		self._flag = self._Methods[method]
+
+		if method == 'lz4':
+			import lz4.frame
+
+			self._compress = lz4.frame.compress
+		else:
+			self._compress = zlib.compress
+
+	def dump(self, value):
+		data = self._serializer.dump(value)
+
+		if len(data) > self._threshold:
+			return self._flag + self._compress(data)
+
+		return self._Raw + data
+
+	def load(self, data):
+		flag, data = data[:1], data[1:]
+
+		if flag == self._Methods['zlib']:
+			data = zlib.decompress(data)
+		elif flag == self._Methods['lz4']:
+			import lz4.frame
+
+			data = lz4.frame.decompress(data)
+		elif flag != self._Raw:
+			raise Exception('Unknown compression flag: %r' % flag)
+
+		return self._serializer.load(data)
+
+
 serializer = Serializer()
 stringSerializer = StringSerializer()
 lowerCaseSerializer = LowerCaseSerializer()
 dateTimeSerializer = DateTimeSerializer()
-base64Serializer = Base64Serializer()
\ No newline at end of file
+base64Serializer = Base64Serializer()
+int64Serializer = StructSerializer('<q')
+float64Serializer = StructSerializer('<d')
+timestampSerializer = TimestampSerializer()
\ No newline at end of file
@@ -0,0 +1,299 @@
+__author__ = 'Nuclight.atomAltera'
+
+# Fields, spread over several sub-keys (shards), so writes to single hot key are distributed over keys and,
+# if fields are routed (see `routing`), over nodes. Shard of value is defined by its hash, counters are
+# incremented in random shard. Reads aggregate all shards with single batch (pipelines of nodes run in parallel)
+
+from .fields import Field, Batch, StringField, SetField, SortedSetField
+
+from binascii import crc32
+from heapq import merge
+from random import randrange
+
+
+class ShardedField():
+	"""
+	Base class of sharded fields. Shard 'index' of field 'key' has key "key:index", so shards of field
+	with hash tag in key are placed on the same node
+	"""
+
+	def __init__(self, key, field_class, shards=16, **options):
+		"""
+		key
+			base key of shards
+
+		shards
+			number of shards, must not be changed for existing data
+
+		options
+			will be passed to 'field_class' constructor of each shard
+		"""
+		if shards < 1:
+			raise Exception('Number of shards must be positive')
+
+		self._key = str(key)
+		self.shards = [field_class('%s:%d' % (self._key, index), **options) for index in range(shards)]
+
+		self._value_encoder = self.shards[0]._value_encoder
+
+	def _shard_of(self, value):
+		code = self._value_encoder.encode(value)
+		if not isinstance(code, bytes): code = str(code).encode(encoding='utf-8')
+
+		return self.shards[crc32(code) % len(self.shards)]
+
+	def _group(self, values):
+		"""
+		Groups 'values' by shard
+
+		return value
+			list of pairs of shard and list of its values
+		"""
+		groups = {}
+
+		for value in values:
+			shard = self._shard_of(value)
+			groups.setdefault(id(shard), (shard, []))[1].append(value)
+
+		return list(groups.values())
+
+	@staticmethod
+	def _batched(calls):
+		"""
+		Runs write 'calls' with single batch
+
+		return value
+			list of results of calls, or None, if called inside `Field.batch` block
+		"""
+		if Batch.Current() is not None:
+			for call in calls:
+				call()
+
+			return None
+
+		with Field.batch():
+			results = [call() for call in calls]
+
+		return [result.value for result in results]
+
+	def _read(self, command_of):
+		"""
+		Runs reading command, returned by 'command_of' for each shard, with single batch
+
+		return value
+			list of results per shard
+		"""
+		batch = Batch()
+		results = []
+
+		for shard in self.shards:
+			command, args, decode = command_of(shard)
+			results.append(batch.defer(shard._redis, command, args, decode))
+
+		batch.execute()
+
+		return [result.value for result in results]
+
+	def exists(self):
+		return any(self._read(lambda shard: ('exists', (shard._key, ), bool)))
+
+	def destroy(self):
+		"""
+		Removes all shards
+
+		return value
+			True, if any shard existed, else False
+		"""
+		results = self._batched([shard.destroy for shard in self.shards])
+
+		return any(results) if results is not None else None
+
+	def expire(self, seconds):
+		"""
+		Sets time to live of all shards
+		"""
+		self._batched([lambda shard=shard: shard.expire(seconds) for shard in self.shards])
+
+
+class ShardedCounter(ShardedField):
+	"""
+	Counter, which increments are spread over shards, value is sum of shards
+	"""
+
+	def __init__(self, key, shards=16, field_class=StringField, **options):
+		super(ShardedCounter, self).__init__(key, field_class, shards=shards, **options)
+
+	def increment(self, amount=1):
+		"""
+		Increments random shard by 'amount'
+
+		return value
+			new value of shard (not whole counter)
+		"""
+		return self.shards[randrange(len(self.shards))].increment(amount)
+
+	def get(self, default=0):
+		"""
+		Returns sum of shards, or 'default', if no shard exists
+		"""
+		values = [value for value in self._read(lambda shard: ('get', (shard._key, ), None)) if value is not None]
+
+		return sum(map(int, values)) if values else default
+
+	def set(self, value):
+		"""
+		Sets counter to 'value': writes it to the first shard and removes others
+		"""
+		self._batched([lambda: self.shards[0].set(value)] + [shard.destroy for shard in self.shards[1:]])
+
+
+class ShardedSetField(ShardedField):
+	"""
+	Set field, which values are spread over shards by hash
+	"""
+
+	def __init__(self, key, shards=16, field_class=SetField, **options):
+		super(ShardedSetField, self).__init__(key, field_class, shards=shards, **options)
+
+	def add(self, *values):
+		"""
+		Adds 'values' with single batch
+
+		return value
+			number of added values, None inside `Field.batch` block
+		"""
+		results = self._batched([lambda shard=shard, group=group: shard.add(*group) for shard, group in self._group(values)])
+
+		return sum(results) if results is not None else None
+
+	def delete(self, *values):
+		"""
+		Removes 'values' with single batch
+
+		return value
+			number of removed values, None inside `Field.batch` block
+		"""
+		results = self._batched([lambda shard=shard, group=group: shard.delete(*group) for shard, group in self._group(values)])
+
+		return sum(results) if results is not None else None
+
+	def contains(self, value):
+		return self._shard_of(value).contains(value)
+
+	def members(self):
+		"""
+		Returns set of values of all shards
+		"""
+		return set().union(*self._read(lambda shard: shard._load_command()))
+
+	def count(self):
+		return sum(self._read(lambda shard: ('scard', (shard._key, ), None)))
+
+	def __len__(self):
+		return self.count()
+
+	def __iter__(self):
+		return iter(self.members())
+
+	def __contains__(self, value):
+		return self.contains(value)
+
+
+class ShardedSortedSetField(ShardedField):
+	"""
+	Sorted set field, which values are spread over shards by hash. Ranges are read from each shard
+	and merged by score
+	"""
+
+	def __init__(self, key, shards=16, field_class=SortedSetField, **options):
+		super(ShardedSortedSetField, self).__init__(key, field_class, shards=shards, **options)
+
+	def add(self, value, score):
+		return self._shard_of(value).add(value, score)
+
+	def add_multi(self, dictionary):
+		"""
+		Adds values with scores from 'dictionary' with single batch
+
+		return value
+			number of added values, None inside `Field.batch` block
+		"""
+		calls = [
+			lambda shard=shard, group=group: shard.add_multi({value: dictionary[value] for value in group})
+			for shard, group in self._group(dictionary)
+		]
+
+		results = self._batched(calls)
+
+		return sum(results) if results is not None else None
+
+	def delete(self, *values):
+		"""
+		Removes 'values' with single batch
+
+		return value
+			number of removed values, None inside `Field.batch` block
+		"""
+		results = self._batched([lambda shard=shard, group=group: shard.delete(*group) for shard, group in self._group(values)])
+
+		return sum(results) if results is not None else None
+
+	def score_of(self, value):
+		return self._shard_of(value).score_of(value)
+
+	def contains(self, value):
+		return self._shard_of(value).contains(value)
+
+	def count(self):
+		return sum(self._read(lambda shard: ('zcard', (shard._key, ), None)))
+
+	def _merged(self, pairs_per_shard, desc):
+		return merge(*pairs_per_shard, key=lambda pair: pair[1], reverse=desc)
+
+	def range_by_index(self, start_index=None, stop_index=None, desc=False):
+		"""
+		Returns range of merged shards, as like `SortedSetField.range_by_index`. Reads 'stop_index' + 1 elements
+		from each shard, so negative indexes other than -1 for 'stop_index' are not supported
+		"""
+		start_index = start_index or 0
+		stop_index = -1 if stop_index is None else stop_index
+
+		if start_index < 0 or stop_index < -1:
+			raise Exception('Negative indexes are not supported')
+
+		pairs = self._read(lambda shard: ('zrange', (shard._key, 0, stop_index, desc, True), None))
+
+		values = [value for value, score in self._merged(pairs, desc)]
+		values = values[start_index:stop_index + 1 if stop_index >= 0 else None]
+
+		return tuple(self._value_encoder.decode_many(values))
+
+	def range_by_score(self, min_score=None, max_score=None, offset=None, limit=None, desc=False):
+		"""
+		Returns range of merged shards, as like `SortedSetField.range_by_score`. Reads 'offset' + 'limit' elements
+		from each shard
+		"""
+		shard = self.shards[0]
+		min_code = shard._score_bound(min_score, '-inf', False)
+		max_code = shard._score_bound(max_score, '+inf', False)
+
+		number = -1 if limit is None else (offset or 0) + limit
+
+		if desc:
+			pairs = self._read(lambda shard: ('zrevrangebyscore', (shard._key, max_code, min_code, 0, number, True), None))
+		else:
+			pairs = self._read(lambda shard: ('zrangebyscore', (shard._key, min_code, max_code, 0, number, True), None))
+
+		values = [value for value, score in self._merged(pairs, desc)]
+		values = values[offset or 0:number if number >= 0 else None]
+
+		return tuple(self._value_encoder.decode_many(values))
+
+	def __len__(self):
+		return self.count()
+
+	def __iter__(self):
+		return iter(self.range_by_index())
+
+	def __contains__(self, value):
+		return self.contains(value)
\ No newline at end of file
@@ -0,0 +1,51 @@
+__author__ = 'Nuclight.atomAltera'
+
+from tests.fieldTestCaseBase import FieldTestCaseBase
+
+from orewrap.fields import Field, StringField, HashField, SetField, DeferredResult
+
+class BatchTestCase(FieldTestCaseBase):
+	def setUp(self):
+		super(BatchTestCase, self).setUp()
+
+		self.string = StringField(self.keys[0], redis=self.redis, value_encoder=self.v_con)
+		self.hash = HashField(self.keys[1], redis=self.redis, value_encoder=self.v_con, name_encoder=self.n_con)
+		self.set = SetField(self.keys[2], redis=self.redis, value_encoder=self.v_con)
+
+	def test_batch(self):
+		with Field.batch():
+			r1 = self.string.set(self.values[0])
+			r2 = self.hash.set(self.names[0], self.values[1])
+			r3 = self.set.add(*self.values[:3])
+
+			self.assertIsInstance(r1, DeferredResult)
+			self.assertFalse(r1.resolved)
+			self.assertFalse(self.redis.exists(self.keys[0]))
+
+		self.assertTrue(r1.value)
+		self.assertTrue(r2.value)
+		self.assertEqual(r3.value, 3)
+
+		self.assertEqual(self.redis.get(self.keys[0]), self.values_c[0])
+		self.assertEqual(self.redis.hget(self.keys[1], self.names_c[0]), self.values_c[1])
+		self.assertSetEqual(self.redis.smembers(self.keys[2]), set(self.values_c[:3]))
+
+	def test_reads_not_deferred(self):
+		self.redis.set(self.keys[0], self.values_c[0])
+
+		with Field.batch():
+			self.string.set(self.values[1])
+			self.assertEqual(self.string.get(), self.values[0])
+
+		self.assertEqual(self.string.get(), self.values[1])
+
+	def test_discard_on_error(self):
+		with self.assertRaises(KeyError):
+			with Field.batch():
+				result = self.string.set(self.values[0])
+				raise KeyError()
+
+		self.assertFalse(result.resolved)
+		self.assertFalse(self.redis.exists(self.keys[0]))
+
+		self.assertTrue(self.string.set(self.values[0]))
@@ -0,0 +1,93 @@
+__author__ = 'Nuclight.atomAltera'
+
+from time import sleep
+
+from tests.fieldTestCaseBase import FieldTestCaseBase
+
+from orewrap.fields import StringField
+from orewrap.cache import FieldCache
+from orewrap.counters import CounterBuffer
+
+class CounterBufferTestCase(FieldTestCaseBase):
+	def test_flush(self):
+		buffer = CounterBuffer(max_keys=3)
+		fields = [StringField(key, redis=self.redis, buffer=buffer) for key in self.keys[:3]]
+
+		for index in range(10):
+			self.assertEqual(fields[0].increment(), index + 1)
+
+		self.assertEqual(fields[1].increment(5), 5)
+		self.assertEqual(fields[1].increment(-2), 3)
+
+		self.assertEqual(fields[0].pending(), 10)
+		self.assertDictEqual(buffer.pending(), {self.keys[0]: 10, self.keys[1]: 3})
+		self.assertFalse(self.redis.exists(self.keys[0]))
+
+		self.assertEqual(buffer.flush(), 2)
+		self.assertEqual(self.redis.get(self.keys[0]), b'10')
+		self.assertEqual(self.redis.get(self.keys[1]), b'3')
+		self.assertEqual(fields[0].pending(), 0)
+		self.assertEqual(buffer.flush(), 0)
+
+		# size threshold flushes without background thread
+		for field in fields:
+			field.increment()
+
+		self.assertEqual(len(buffer), 0)
+		self.assertEqual(self.redis.get(self.keys[2]), b'1')
+
+		stats = buffer.stats()
+		self.assertEqual(stats['flushes'], 2)
+		self.assertEqual(stats['flushed_increments'], 15)
+		self.assertGreaterEqual(stats['max_flush_delay'], stats['last_flush_duration'])
+
+	def test_partial_failure(self):
+		buffer = CounterBuffer(max_failures=2)
+		good = StringField(self.keys[0], redis=self.redis, buffer=buffer)
+		bad = StringField(self.keys[1], redis=self.redis, buffer=buffer)
+
+		self.redis.set(self.keys[1], 'text')
+
+		good.increment(5)
+		good.increment()
+		bad.increment(2)
+
+		with self.assertRaises(Exception):
+			buffer.flush()
+
+		# only failed delta is returned to buffer
+		self.assertEqual(self.redis.get(self.keys[0]), b'6')
+		self.assertDictEqual(buffer.pending(), {self.keys[1]: 2})
+
+		with self.assertRaises(Exception):
+			buffer.flush()
+
+		self.assertEqual(self.redis.get(self.keys[0]), b'6')
+		self.assertDictEqual(buffer.pending(), {})
+		self.assertEqual(buffer.flush(), 0)
+
+		stats = buffer.stats()
+		self.assertEqual(stats['flushed_keys'], 1)
+		self.assertEqual(stats['flushed_increments'], 2)
+		self.assertEqual(stats['errors'], 2)
+		self.assertEqual(stats['dropped_keys'], 1)
+		self.assertEqual(stats['dropped_increments'], 1)
+		self.assertIsNotNone(stats['last_error'])
+
+	def test_background(self):
+		buffer = CounterBuffer(interval=0.05).start()
+		cache = FieldCache()
+		field = StringField(self.keys[0], redis=self.redis, buffer=buffer, cache=cache, ttl=30)
+
+		self.assertIsNone(field.get())
+
+		field.increment(2)
+		sleep(0.3)
+
+		self.assertEqual(field.get(), '2')
+		self.assertTrue(0 < self.redis.ttl(self.keys[0]) <= 30)
+
+		field.increment(3)
+		buffer.stop()
+
+		self.assertEqual(self.redis.get(self.keys[0]), b'5')
\ No newline at end of file
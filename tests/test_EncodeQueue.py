@@ -0,0 +1,29 @@
+__author__ = 'Nuclight.atomAltera'
+
+import unittest
+
+from orewrap.encoders import Encoder, EncodeQueue, string_encoder, lowercase_encoder, base64_encoder
+
+class EncodeQueueTestCase(unittest.TestCase):
+	def setUp(self):
+		self.queue = EncodeQueue(lowercase_encoder, string_encoder, base64_encoder)
+
+	def test_encode(self):
+		self.assertEqual(self.queue.encode('FooBar'), b'Zm9vYmFy')
+		self.assertEqual(self.queue.decode(b'Zm9vYmFy'), 'foobar')
+
+	def test_many(self):
+		values = ['Foo', 'BAR', 'baz']
+
+		codes = self.queue.encode_many(values)
+		self.assertSequenceEqual(codes, [self.queue.encode(value) for value in values])
+		self.assertSequenceEqual(self.queue.decode_many(codes), ['foo', 'bar', 'baz'])
+
+	def test_identity(self):
+		queue = EncodeQueue(Encoder(), Encoder(lambda value: value + 1, lambda code: code - 1))
+
+		self.assertEqual(len(queue._encoders), 1)
+		self.assertEqual(queue.encode(1), 2)
+		self.assertSequenceEqual(queue.decode_many((2, 3)), [1, 2])
+
+		self.assertEqual(EncodeQueue().encode(5), 5)
@@ -2,7 +2,9 @@ __author__ = 'Nuclight.atomAltera'
 
 from tests.fieldTestCaseBase import FieldTestCaseBase
 
-from orewrap.fields import Field
+from datetime import datetime, timedelta
+
+from orewrap.fields import Field, SetField
 
 class FieldTestCase(FieldTestCaseBase):
 	def setUp(self):
@@ -33,3 +35,44 @@ class FieldTestCase(FieldTestCaseBase):
 	def test_equals(self):
 		self.assertTrue(self.field == Field(self.keys[0], redis=self.redis))
 		self.assertFalse(self.field != Field(self.keys[0], redis=self.redis))
+
+	def test_expire(self):
+		self.assertFalse(self.field.expire(10))
+		self.assertIsNone(self.field.ttl())
+
+		self.redis.set(self.keys[0], 'foobar')
+		self.assertIsNone(self.field.ttl())
+
+		self.assertTrue(self.field.expire(timedelta(seconds=10)))
+		self.assertTrue(9 < self.field.ttl() <= 10)
+
+		self.assertTrue(self.field.pexpire(5000))
+		self.assertTrue(4 < self.field.ttl() <= 5)
+
+		self.assertTrue(self.field.expire_at(datetime.now() + timedelta(seconds=20)))
+		self.assertTrue(19 < self.field.ttl() <= 20)
+
+		self.assertTrue(self.field.persist())
+		self.assertIsNone(self.field.ttl())
+
+	def test_default_ttl(self):
+		field = SetField(self.keys[1], redis=self.redis, ttl=30)
+
+		with Field.batch():
+			field.add('a')
+
+		self.assertTrue(0 < self.redis.ttl(self.keys[1]) <= 30)
+
+		field.delete('a')
+		self.assertFalse(self.redis.exists(self.keys[1]))
+
+		try:
+			SetField.Init(self.redis, ttl=20)
+
+			field = SetField(self.keys[2])
+			field.add('a')
+
+			self.assertTrue(0 < self.redis.ttl(self.keys[2]) <= 20)
+			self.assertIsNone(Field(self.keys[3], redis=self.redis)._ttl)
+		finally:
+			del SetField._Redis, SetField._Value_Encoder, SetField._Ttl
\ No newline at end of file
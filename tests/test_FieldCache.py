@@ -0,0 +1,182 @@
+__author__ = 'Nuclight.atomAltera'
+
+import socket
+from time import sleep
+
+from tests.fieldTestCaseBase import FieldTestCaseBase
+
+from orewrap.fields import Field, StringField, HashField, SetField
+from orewrap.cache import FieldCache, ChannelInvalidator
+
+class FieldCacheTestCase(FieldTestCaseBase):
+	def setUp(self):
+		super(FieldCacheTestCase, self).setUp()
+
+		self.cache = FieldCache(max_size=3)
+		self.field = StringField(self.keys[0], redis=self.redis, value_encoder=self.v_con, cache=self.cache)
+
+	def test_get(self):
+		self.redis.set(self.keys[0], self.values_c[0])
+
+		self.assertEqual(self.field.get(), self.values[0])
+
+		self.redis.set(self.keys[0], self.values_c[1])
+
+		self.assertEqual(self.field.get(), self.values[0])
+		self.assertEqual(self.cache.stats()['hits'], 1)
+		self.assertEqual(self.cache.stats()['misses'], 1)
+
+	def test_write_invalidates(self):
+		self.assertEqual(self.field.get(self.values[2]), self.values[2])
+
+		self.field.set(self.values[0])
+		self.assertEqual(self.field.get(), self.values[0])
+
+		with Field.batch():
+			self.field.set(self.values[1])
+
+		self.assertEqual(self.field.get(), self.values[1])
+		self.assertEqual(self.cache.stats()['invalidations'], 2)
+
+	def test_collections(self):
+		hash = HashField(self.keys[1], redis=self.redis, cache=self.cache)
+		values = SetField(self.keys[2], redis=self.redis, cache=self.cache)
+
+		hash.set(self.names[0], self.values[0])
+		values.add(*self.values[:3])
+
+		self.assertEqual(hash.get(self.names[0]), self.values[0])
+		self.assertDictEqual(hash.members(), {self.names[0]: self.values[0]})
+		self.assertSetEqual(values.members(), set(self.values[:3]))
+
+		values.members().clear()
+		self.assertSetEqual(values.members(), set(self.values[:3]))
+
+		values.pop()
+		self.assertEqual(len(values.members()), 2)
+
+	def test_eviction(self):
+		fields = [StringField(key, redis=self.redis, cache=self.cache) for key in self.keys[:5]]
+
+		for field in fields:
+			field.get()
+
+		self.assertEqual(len(self.cache), 3)
+		self.assertEqual(self.cache.stats()['evictions'], 2)
+
+	def test_ttl(self):
+		self.cache = FieldCache(ttl=0.05)
+		self.field = StringField(self.keys[0], redis=self.redis, cache=self.cache)
+
+		self.redis.set(self.keys[0], self.values[0])
+		self.assertEqual(self.field.get(), self.values[0])
+
+		self.redis.set(self.keys[0], self.values[1])
+		sleep(0.1)
+
+		self.assertEqual(self.field.get(), self.values[1])
+
+	def test_versions(self):
+		fields = [StringField(key, redis=self.redis, cache=self.cache) for key in self.keys[:5]]
+
+		for field in fields:
+			field.get()
+			field.set(self.values[0])
+
+		self.assertDictEqual(self.cache._versions, {})
+
+		def loader():
+			self.cache.invalidate(self.keys[0])
+			return self.values[1]
+
+		self.assertEqual(self.cache.get(self.keys[0], None, loader), self.values[1])
+		self.assertEqual(len(self.cache), 0)
+		self.assertDictEqual(self.cache._versions, {})
+
+	def test_suspend(self):
+		self.redis.set(self.keys[0], self.values_c[0])
+		self.assertEqual(self.field.get(), self.values[0])
+
+		self.cache.suspend()
+		self.assertTrue(self.cache.suspended)
+		self.assertEqual(len(self.cache), 0)
+
+		self.redis.set(self.keys[0], self.values_c[1])
+		self.assertEqual(self.field.get(), self.values[1])
+		self.assertEqual(len(self.cache), 0)
+
+		self.cache.resume()
+		self.assertFalse(self.cache.suspended)
+
+		self.assertEqual(self.field.get(), self.values[1])
+		self.assertEqual(len(self.cache), 1)
+
+	def test_channel_invalidator(self):
+		other_cache = FieldCache()
+		other_field = StringField(self.keys[0], redis=self.redis, value_encoder=self.v_con, cache=other_cache)
+
+		invalidator = ChannelInvalidator(other_cache, self.redis).start()
+		ChannelInvalidator(self.cache, self.redis)
+
+		try:
+			self.assertIsNone(other_field.get())
+
+			self.field.set(self.values[0])
+
+			for attempt in range(50):
+				if not len(other_cache): break
+				sleep(0.01)
+
+			self.assertEqual(other_field.get(), self.values[0])
+
+			published = []
+			self.cache.add_write_listener(lambda key, batch=None: published.append(batch is not None))
+
+			with Field.batch():
+				self.field.set(self.values[2])
+
+			for attempt in range(50):
+				if not len(other_cache): break
+				sleep(0.01)
+
+			self.assertSequenceEqual(published, [True])
+			self.assertEqual(other_field.get(), self.values[2])
+			self.assertEqual(self.field.get(), self.values[2])
+		finally:
+			invalidator.stop()
+
+	def test_invalidator_reconnect(self):
+		other_cache = FieldCache()
+		other_field = StringField(self.keys[0], redis=self.redis, value_encoder=self.v_con, cache=other_cache)
+
+		invalidator = ChannelInvalidator(other_cache, self.redis)
+		invalidator._Poll_Interval = 0.01
+		invalidator.start()
+		ChannelInvalidator(self.cache, self.redis)
+
+		try:
+			self.assertIsNone(other_field.get())
+
+			# connection is lost
+			invalidator._connections[0]._sock.shutdown(socket.SHUT_RDWR)
+
+			for attempt in range(100):
+				if invalidator.reconnects: break
+				self.assertIsNone(other_field.get())
+				sleep(0.01)
+
+			self.assertEqual(invalidator.reconnects, 1)
+			self.assertFalse(other_cache.suspended)
+			self.assertEqual(len(invalidator._connections), 1)
+
+			self.field.set(self.values[0])
+
+			for attempt in range(50):
+				if not len(other_cache): break
+				sleep(0.01)
+
+			self.assertEqual(other_field.get(), self.values[0])
+		finally:
+			invalidator.stop()
+
+		self.assertEqual(len(invalidator._connections), 0)
@@ -110,3 +110,12 @@ class HashFieldTestCase(FieldTestCaseBase):
 
 		del temp_dict[self.names_c[5]]
 		self.assertDictEqual(self.redis.hgetall(self.keys[0]), temp_dict)
+
+	def test_scan_items(self):
+		self.redis.hmset(self.keys[0], self.d(self.names_c, self.values_c))
+
+		result = dict(self.field.scan_items(count=3))
+		self.assertDictEqual(result, self.d(self.names, self.values))
+
+		self.field._Scan_Threshold = 2
+		self.assertSetEqual(set(self.field), set(self.names))
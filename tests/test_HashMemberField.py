@@ -0,0 +1,48 @@
+__author__ = 'Nuclight.atomAltera'
+
+from tests.fieldTestCaseBase import FieldTestCaseBase
+
+from orewrap.fields import HashField, HashMemberField
+
+class HashMemberFieldTestCase(FieldTestCaseBase):
+	def setUp(self):
+		super(HashMemberFieldTestCase, self).setUp()
+
+		self.hash = HashField(self.keys[0], redis=self.redis, name_encoder=self.n_con)
+		self.field = HashMemberField(self.hash, self.names[0], value_encoder=self.v_con)
+
+	def test_set(self):
+		result = self.field.set(self.values[0])
+
+		self.assertTrue(result)
+		self.assertEqual(self.redis.hget(self.keys[0], self.names_c[0]), self.values_c[0])
+
+		result = self.field.set(self.values[1], overwrite=False)
+
+		self.assertFalse(result)
+		self.assertEqual(self.redis.hget(self.keys[0], self.names_c[0]), self.values_c[0])
+
+	def test_get(self):
+		self.assertEqual(self.field.get(self.values[1]), self.values[1])
+
+		self.redis.hset(self.keys[0], self.names_c[0], self.values_c[0])
+
+		self.assertEqual(self.field.get(), self.values[0])
+
+	def test_increment(self):
+		field = HashMemberField(self.hash, self.names[1])
+
+		self.assertEqual(field.increment(), 1)
+		self.assertEqual(field.increment(5), 6)
+
+	def test_exists_destroy(self):
+		self.assertFalse(self.field.exists())
+		self.assertFalse(self.field.destroy())
+
+		self.redis.hset(self.keys[0], self.names_c[0], self.values_c[0])
+		self.redis.hset(self.keys[0], self.names_c[1], self.values_c[1])
+
+		self.assertTrue(self.field.exists())
+		self.assertTrue(self.field.destroy())
+		self.assertFalse(self.redis.hexists(self.keys[0], self.names_c[0]))
+		self.assertTrue(self.redis.hexists(self.keys[0], self.names_c[1]))
@@ -0,0 +1,154 @@
+__author__ = 'Nuclight.atomAltera'
+
+from tests.fieldTestCaseBase import FieldTestCaseBase
+
+from orewrap.fields import Field, StringField, HashField, SetField, SortedSetField
+from orewrap.object import Object, ObjectField
+from orewrap.instrumentation import add_hook, remove_hook, enabled, key_pattern, unwrap, InstrumentedClient, MetricsAggregator
+from orewrap.query import Query
+
+class Post(Object):
+	_Name = 'post'
+
+	title = ObjectField(StringField)
+
+
+class InstrumentationTestCase(FieldTestCaseBase):
+	def setUp(self):
+		super(InstrumentationTestCase, self).setUp()
+
+		self.events = []
+		self.aggregator = MetricsAggregator(top=2)
+
+		add_hook(self.events.append)
+		add_hook(self.aggregator)
+
+	def tearDown(self):
+		remove_hook(self.events.append)
+		remove_hook(self.aggregator)
+
+	def test_disabled(self):
+		remove_hook(self.events.append)
+		remove_hook(self.aggregator)
+
+		self.assertFalse(enabled())
+
+		field = StringField(self.keys[0], redis=self.redis)
+		self.assertIs(field._redis, self.redis)
+
+		field.set(self.values[0])
+		self.assertListEqual(self.events, [])
+
+	def test_key_pattern(self):
+		self.assertEqual(key_pattern('obj:12:tag'), 'obj:*:tag')
+		self.assertEqual(key_pattern('obj:reg'), 'obj:reg')
+
+	def test_commands(self):
+		field = StringField('item:7:title', redis=self.redis)
+
+		self.assertIsInstance(field._redis, InstrumentedClient)
+		self.assertIs(unwrap(field._redis), self.redis)
+
+		field.set(self.values[0])
+		self.assertEqual(field.get(), self.values[0])
+
+		commands = [event for event in self.events if event.kind == 'command']
+
+		self.assertListEqual([event.command for event in commands], ['set', 'get'])
+		self.assertEqual(commands[0].pattern, 'item:*:title')
+		self.assertIs(commands[0].field_class, StringField)
+		self.assertEqual(commands[1].reply_size, len(self.values[0]))
+		self.assertGreater(commands[0].request_size, len(self.values[0]))
+		self.assertFalse(commands[0].error)
+
+		self.assertSetEqual({event.kind for event in self.events}, {'command', 'encode', 'decode'})
+
+	def test_batch(self):
+		fields = [HashField('user:%d:data' % index, redis=self.redis) for index in range(3)]
+
+		with Field.batch():
+			for field in fields:
+				field.set(self.names[0], self.values[0])
+
+		commands = [event for event in self.events if event.kind == 'command']
+
+		self.assertEqual(len(commands), 3)
+		self.assertTrue(all(event.pipelined for event in commands))
+		self.assertEqual(self.redis.hget('user:2:data', self.names[0]), self.values[0].encode())
+
+	def test_aggregator(self):
+		fields = [StringField('item:%d:title' % index, redis=self.redis) for index in range(3)]
+
+		for index, field in enumerate(fields):
+			for number in range(index + 1):
+				field.set(self.values[0])
+
+		report = self.aggregator.report()['item:*:title']
+
+		self.assertEqual(report['field_class'], 'StringField')
+		self.assertEqual(report['commands']['set']['count'], 6)
+		self.assertEqual(report['commands']['set']['errors'], 0)
+		self.assertIsNotNone(report['commands']['set']['p99_us'])
+		self.assertEqual(sum(report['commands']['set']['buckets'].values()), 6)
+		self.assertListEqual(report['top_keys'], [('item:2:title', 3), ('item:1:title', 2)])
+
+		self.aggregator.reset()
+		self.assertDictEqual(self.aggregator.report(), {})
+
+	def test_query(self):
+		a = SortedSetField(self.keys[0], redis=self.redis)
+		b = SortedSetField(self.keys[1], redis=self.redis)
+
+		a.add(self.values[0], 1)
+		b.add(self.values[0], 2)
+
+		self.assertListEqual(list((Query(a) & b).values()), [self.values[0]])
+
+	def commands(self):
+		return [(event.command, event.pipelined) for event in self.events if event.kind == 'command']
+
+	def test_bound_before_hook(self):
+		remove_hook(self.events.append)
+		remove_hook(self.aggregator)
+
+		Field.Init(self.redis)
+
+		field = StringField(self.keys[0], redis=self.redis)
+		register = Post._Register
+
+		add_hook(self.events.append)
+
+		field.set(self.values[0])
+		post = Post.Create(title=self.values[1])
+
+		self.assertIs(unwrap(field._redis), self.redis)
+		self.assertEqual(post.title.get(), self.values[1])
+		self.assertIn(('set', False), self.commands())
+		self.assertTrue(any(event.command == 'evalsha' and event.key == register._key for event in self.events))
+
+		remove_hook(self.events.append)
+		self.assertIs(field._redis, self.redis)
+
+	def test_pipelines(self):
+		field = HashField(self.keys[0], redis=self.redis, ttl=10)
+		field.set(self.names[0], self.values[0])
+
+		self.assertListEqual(self.commands(), [('hset', True), ('expire', True)])
+
+		values = SetField(self.keys[1], redis=self.redis)
+		values.add(*self.values[:3])
+
+		del self.events[:]
+		self.assertEqual(len(values.pop(2)), 2)
+		self.assertListEqual(self.commands(), [('spop', True), ('spop', True)])
+
+		scores = SortedSetField(self.keys[2], redis=self.redis)
+		scores.add(self.values[0], 1)
+
+		del self.events[:]
+		self.assertSequenceEqual(scores.page(size=2)[0], (self.values[0], ))
+		self.assertEqual(self.commands()[-1], ('evalsha', False))
+
+		del self.events[:]
+		self.assertListEqual(scores.score_of_multi([self.values[0], self.values[1]]), [1.0, None])
+		self.assertIn(self.commands()[-1], (('zmscore', False), ('zscore', True)))
\ No newline at end of file
@@ -0,0 +1,367 @@
+__author__ = 'Nuclight.atomAltera'
+
+from tests.fieldTestCaseBase import FieldTestCaseBase
+
+from orewrap.fields import Field, StringField, SetField, HashMemberField
+from orewrap.object import Object, ObjectField, HASH_STORAGE, UniqueIndex, RangeIndex, TagIndex
+from orewrap.cache import FieldCache
+
+class Item(Object):
+	_Name = 'item'
+
+	title = ObjectField(StringField)
+	labels = ObjectField(SetField, 'lbl')
+
+
+class HashItem(Item):
+	_Name = 'hitem'
+	_Storage = HASH_STORAGE
+
+
+class User(Object):
+	_Name = 'user'
+
+	email = ObjectField(StringField)
+	age = ObjectField(StringField)
+	city = ObjectField(StringField)
+
+	by_email = UniqueIndex('email')
+	by_age = RangeIndex('age')
+	by_city = TagIndex('city')
+
+
+class HashUser(User):
+	_Name = 'huser'
+	_Storage = HASH_STORAGE
+
+
+class Session(Item):
+	_Name = 'session'
+	_Storage = HASH_STORAGE
+	_Ttl = 100
+	_Expire_Grace = 10
+
+	by_title = UniqueIndex('title')
+
+
+class CachedItem(Item):
+	_Name = 'citem'
+
+	note = ObjectField(StringField, cache=FieldCache())
+
+
+class Account(Object):
+	_Name = 'account'
+
+	login = ObjectField(StringField)
+	email = ObjectField(StringField)
+
+	by_login = UniqueIndex('login')
+	by_email = UniqueIndex('email')
+
+
+class BlockItem(Item):
+	_Name = 'bitem'
+	_Id_Block_Size = 10
+
+
+class ObjectTestCase(FieldTestCaseBase):
+	@classmethod
+	def setUpClass(cls):
+		super(ObjectTestCase, cls).setUpClass()
+
+		Field.Init(cls.redis)
+
+	def test_fields(self):
+		item = Item(7)
+
+		self.assertIsInstance(item.title, StringField)
+		self.assertIs(item.title, item.title)
+		self.assertEqual(item.labels, SetField('item:7:lbl', redis=self.redis))
+		self.assertSetEqual(set(Item._Fields), {'create_date', 'tag', 'title', 'labels'})
+
+		with self.assertRaises(AttributeError):
+			item.foo = 1
+
+	def test_create(self):
+		item = Item.Create(title=self.values[0])
+
+		self.assertEqual(item.object_id, 1)
+		self.assertEqual(self.redis.get('item:1:title'), self.values[0].encode())
+		self.assertTrue(item.create_date.exists())
+		self.assertTrue(Item.Exists(1))
+		self.assertFalse(Object.Exists(1))
+
+		with self.assertRaises(Exception):
+			Item.Create(labels=self.values[0])
+
+		# all keys, written by creation script, are passed as KEYS
+		keys, args = User._Create_Args({'email': 'a@example.com', 'age': 30, 'city': 'Rome'}, 5)
+		self.assertSetEqual(set(keys), {
+			'user:reg', 'user:5:email', 'user:5:age', 'user:5:city', 'user:5:create_date',
+			'user:idx:by_email', 'user:idx:by_age', 'user:idx:by_city:Rome'
+		})
+
+		keys, args = HashUser._Create_Args({'email': 'a@example.com'}, 5)
+		self.assertSetEqual(set(keys), {'huser:reg', 'huser:5:data', 'huser:idx:by_email'})
+
+	def test_create_many(self):
+		Item.Create()
+		items = Item.CreateMany(5, chunk_size=2, tag=self.values[0])
+
+		self.assertSequenceEqual([item.object_id for item in items], range(2, 7))
+		self.assertEqual(self.redis.zcard('item:reg'), 6)
+		self.assertSequenceEqual([item.tag.get() for item in items], [self.values[0]] * 5)
+
+	def test_id_blocks(self):
+		BlockItem._Id_Allocator = None
+
+		items = [BlockItem.Create(title=self.values[index]) for index in range(3)]
+
+		self.assertSequenceEqual([item.object_id for item in items], [1, 2, 3])
+		self.assertEqual(self.redis.get('bitem:last_id'), b'10')
+		self.assertEqual(self.redis.get('bitem:3:title'), self.values[2].encode())
+		self.assertEqual(BlockItem._Id_Allocator.remaining(), 7)
+
+		items = BlockItem.CreateMany(12)
+
+		self.assertSequenceEqual([item.object_id for item in items], list(range(4, 11)) + list(range(11, 16)))
+		self.assertEqual(self.redis.get('bitem:last_id'), b'20')
+		self.assertEqual(self.redis.zcard('bitem:reg'), 15)
+		self.assertEqual(BlockItem._Id_Allocator.reserved_blocks, 2)
+
+		# other process reserves next block
+		self.assertEqual(Item._Last_Id._redis.incr('bitem:last_id', 10), 30)
+		self.assertEqual(BlockItem.Create().object_id, 16)
+
+	def test_get(self):
+		Item.CreateMany(3)
+
+		self.assertEqual(Item.Get(2).object_id, 2)
+		self.assertIsNone(Item.Get(4))
+
+		result = Item.GetMany([3, 4, 1])
+		self.assertSequenceEqual([item and item.object_id for item in result], [3, None, 1])
+
+	def test_hash_storage(self):
+		item = HashItem.Create(title=self.values[0])
+
+		self.assertIsInstance(item.title, HashMemberField)
+		self.assertIsInstance(item.labels, SetField)
+		self.assertDictEqual(self.redis.hgetall('hitem:1:data'), {b'title': self.values[0].encode(), b'create_date': self.redis.hget('hitem:1:data', 'create_date')})
+		self.assertEqual(item.title.get(), self.values[0])
+		self.assertIsNotNone(item.create_date.get())
+		self.assertTrue(HashItem.Exists(1))
+
+		items = HashItem.CreateMany(2, tag=self.values[1])
+		self.assertEqual(self.redis.hget('hitem:3:data', 'tag'), self.values[1].encode())
+
+		item.delete()
+		self.assertFalse(self.redis.exists('hitem:1:data'))
+		self.assertFalse(HashItem.Exists(1))
+
+		class EncodedItem(HashItem):
+			_Name = 'eitem'
+			note = ObjectField(StringField, value_encoder='base64', overwrite=False)
+
+		self.assertIsInstance(EncodedItem(1).note, HashMemberField)
+
+		# hash members have no own key, so they can not expire or be on other node
+		with self.assertRaises(Exception):
+			class ExpiringItem(HashItem):
+				_Name = 'xitem'
+				note = ObjectField(StringField, ttl=30)
+
+	def test_load_save(self):
+		for item_class in (Item, HashItem):
+			item = item_class.Create(title=self.values[0])
+			item.labels.add(*self.values[:3])
+
+			result = item.load()
+
+			self.assertEqual(result['title'], self.values[0])
+			self.assertIsNone(result['tag'])
+			self.assertSetEqual(result['labels'], set(self.values[:3]))
+			self.assertEqual(item['create_date'], item.create_date.get())
+
+			self.assertDictEqual(item.load(['title', 'tag']), {'title': self.values[0], 'tag': None})
+
+			item['tag'] = self.values[1]
+			item['title'] = None
+
+			self.assertSetEqual(item.save(), {'tag', 'title'})
+			self.assertSetEqual(item.save(), set())
+
+			self.assertEqual(item.tag.get(), self.values[1])
+			self.assertFalse(item.title.exists())
+
+			with self.assertRaises(Exception):
+				item['labels'] = set()
+
+	def test_delete(self):
+		for item_class in (Item, HashItem):
+			items = item_class.CreateMany(4, title=self.values[0])
+
+			for item in items:
+				item.labels.add(self.values[1])
+
+			self.assertTrue(items[0].delete())
+			self.assertFalse(items[0].delete())
+
+			self.assertEqual(item_class.DeleteMany([2, 3, 5], chunk_size=2, unlink=True), 2)
+
+			self.assertSequenceEqual([str(item) for item in item_class.Register], ['4'])
+			self.assertSetEqual({key.split(b':')[1] for key in self.redis.keys(item_class._Name + ':[0-9]*')}, {b'4'})
+
+			self.redis.flushdb()
+
+	def test_delete_cached(self):
+		items = CachedItem.CreateMany(2, note=self.values[0])
+		self.assertEqual(items[0].note.get(), self.values[0])
+		self.assertEqual(items[1].note.get(), self.values[0])
+
+		self.assertTrue(items[0].delete())
+		self.assertEqual(CachedItem.DeleteMany([2], unlink=True), 1)
+
+		self.assertIsNone(items[0].note.get())
+		self.assertIsNone(items[1].note.get())
+
+
+	def test_indexes(self):
+		for user_class in (User, HashUser):
+			alice = user_class.Create(email='alice@example.com', age=30, city='Paris')
+			bob = user_class.Create(email='bob@example.com', age=25, city='Paris')
+			carol = user_class.CreateMany(1, age=40, city='Rome')[0]
+
+			self.assertEqual(self.redis.hget(user_class._K('idx:by_email'), 'alice@example.com'), b'1')
+			self.assertEqual(user_class.by_email.get('bob@example.com').object_id, 2)
+			self.assertSetEqual({user.object_id for user in user_class.by_city['Paris'].members()}, {1, 2})
+
+			find = lambda **conditions: [user.object_id for user in user_class.Find(**conditions)]
+
+			self.assertSequenceEqual(find(by_city='Paris'), [1, 2])
+			self.assertSequenceEqual(find(by_city=['Paris', 'Rome'], by_age=(26, None)), [1, 3])
+			self.assertSequenceEqual(find(by_email='bob@example.com', by_age=(None, 25)), [2])
+			self.assertSequenceEqual(find(by_email='nobody@example.com'), [])
+
+			with self.assertRaises(Exception):
+				user_class.Create(email='alice@example.com')
+			self.assertEqual(user_class.Register.count(), 3)
+			self.assertFalse(self.redis.keys(user_class._Name + ':4:*'))
+
+			with self.assertRaises(Exception):
+				user_class.CreateMany(2, email='many@example.com')
+
+			with self.assertRaises(Exception):
+				user_class.Find(email='alice@example.com')
+
+			# old values are read, if not loaded
+			bob = user_class(bob.object_id)
+			bob['email'] = 'robert@example.com'
+			bob['city'] = 'Rome'
+			bob.save()
+
+			self.assertSequenceEqual(find(by_email='robert@example.com'), [2])
+			self.assertSequenceEqual(find(by_email='bob@example.com'), [])
+			self.assertSequenceEqual(find(by_city='Rome'), [2, 3])
+
+			carol.load()
+			carol['email'] = 'robert@example.com'
+
+			with self.assertRaises(Exception):
+				carol.save()
+
+			# nothing is written, if unique value is taken
+			self.assertEqual(self.redis.hget(user_class._K('idx:by_email'), 'robert@example.com'), b'2')
+			self.assertSequenceEqual(find(by_age=(40, 40)), [3])
+
+			carol['email'] = 'carol@example.com'
+			carol['age'] = None
+			carol.save()
+
+			self.assertSequenceEqual(find(by_age=(None, None)), [1, 2])
+
+			alice.delete()
+			user_class.DeleteMany([3])
+
+			self.assertSequenceEqual(find(by_city=['Paris', 'Rome']), [2])
+			self.assertSequenceEqual(find(by_email='carol@example.com'), [])
+			self.assertSequenceEqual(find(by_age=(None, None)), [2])
+
+			self.redis.flushdb()
+
+	def test_unique_rollback(self):
+		Account.Create(login='a', email='a@example.com')
+		Account.Create(login='b', email='b@example.com')
+
+		# value, already owned by object, is not released, when other value is taken
+		account = Account(1)
+		account['email'] = 'a@example.com'
+		account['login'] = 'b'
+
+		with self.assertRaises(Exception):
+			account.save()
+
+		self.assertEqual(Account.by_email.get('a@example.com').object_id, 1)
+		self.assertEqual(Account.by_login.get('a').object_id, 1)
+		self.assertEqual(Account.by_login.get('b').object_id, 2)
+
+		account['login'] = 'c'
+		account.save()
+
+		self.assertSetEqual(set(Account.by_login.names()), {'b', 'c'})
+		self.assertEqual(Account.by_email.get('a@example.com').object_id, 1)
+
+		# old value is removed only if it is still owned by object
+		Account.by_login.set('c', Account(2))
+		account['login'] = 'd'
+		account.save()
+
+		self.assertEqual(Account.by_login.get('c').object_id, 2)
+
+	def test_ttl(self):
+		session = Session.Create(title=self.values[0])
+		session.labels.add(self.values[1])
+
+		self.assertTrue(99 < session.ttl() <= 100)
+		self.assertTrue(109 < self.redis.ttl('session:1:data') <= 110)
+		self.assertIn(self.redis.ttl('session:1:lbl'), (None, -1))
+
+		session['tag'] = self.values[2]
+		session.save()
+		self.assertTrue(109 < self.redis.ttl('session:1:lbl') <= 110)
+
+		session.persist()
+		self.assertIsNone(session.ttl())
+		self.assertIn(self.redis.ttl('session:1:data'), (None, -1))
+
+		session.expire(0)
+		Session.CreateMany(2, tag=self.values[3])
+
+		self.assertEqual(Session.PurgeExpired(), 1)
+		self.assertSequenceEqual([str(item) for item in Session.Register], ['2', '3'])
+		self.assertSequenceEqual(Session.Find(by_title=self.values[0]), [])
+		self.assertFalse(self.redis.exists('session:1:data'))
+		self.assertTrue(99 < Session(3).ttl() <= 100)
+		self.assertEqual(Session.PurgeExpired(), 0)
+	def test_default_ttl(self):
+		Field.Init(self.redis, ttl=100)
+
+		try:
+			class Thing(Item):
+				_Name = 'thing'
+
+				by_title = UniqueIndex('title')
+				by_tag = TagIndex('tag')
+
+			thing = Thing.Create(title=self.values[0], tag=self.values[1])
+			Thing.CreateMany(2)
+			thing['title'] = self.values[2]
+			thing.save()
+
+			for key in ('thing:reg', 'thing:last_id', 'thing:idx:by_title', 'thing:idx:by_tag:' + self.values[1]):
+				self.assertIn(self.redis.ttl(key), (None, -1), key)
+
+			self.assertTrue(Thing.Exists(1))
+		finally:
+			Field.Init(self.redis)
\ No newline at end of file
@@ -0,0 +1,56 @@
+__author__ = 'Nuclight.atomAltera'
+
+from tests.fieldTestCaseBase import FieldTestCaseBase
+
+from orewrap.fields import SetField, SortedSetField
+from orewrap.query import Query
+
+class QueryTestCase(FieldTestCaseBase):
+	def setUp(self):
+		super(QueryTestCase, self).setUp()
+
+		self.red = SetField('color:red', redis=self.redis)
+		self.large = SetField('size:large', redis=self.redis)
+		self.sale = SetField('sale', redis=self.redis)
+		self.price = SortedSetField('price', redis=self.redis)
+
+		self.red.add('a', 'b', 'c', 'd')
+		self.large.add('b', 'c', 'd', 'e')
+		self.sale.add('d')
+		self.price.add_multi({'a': 10, 'b': 40, 'c': 20, 'd': 30, 'e': 5})
+
+	def test_algebra(self):
+		query = Query(self.red) & self.large
+
+		self.assertEqual(query.count(), 3)
+		self.assertSequenceEqual(query.values(), ['b', 'c', 'd'])
+		self.assertSequenceEqual(query.page(1, 2), ['d'])
+		self.assertSequenceEqual(query.range(-2, -1), ['c', 'd'])
+		self.assertSequenceEqual(query.range(1, -2), ['c'])
+		self.assertSequenceEqual(query.range(-5, 0), ['b'])
+		self.assertSequenceEqual(query.range(2, -3), [])
+		self.assertSequenceEqual((Query(self.red) | self.large).values(), ['a', 'b', 'c', 'd', 'e'])
+		self.assertSequenceEqual(((Query(self.red) & self.large) - self.sale).values(), ['b', 'c'])
+
+		self.assertTrue(self.redis.ttl(query.key) > 0)
+		self.assertTrue(query.key.startswith('query:'))
+
+	def test_sort(self):
+		query = (Query(self.red) & self.large).sort_by(self.price, desc=True)
+
+		self.assertSequenceEqual(query.values(), ['b', 'd', 'c'])
+		self.assertSequenceEqual(query.page(0, 2), ['b', 'd'])
+		self.assertSequenceEqual((Query(self.price) - self.red).values(), ['e'])
+
+	def test_reuse(self):
+		query = Query(self.red) & self.large
+		self.assertEqual(query.store(), query.key)
+
+		# intermediate result is shared by equal subexpressions and not computed again while alive
+		self.assertEqual((Query(self.large) & self.red).key, query.key)
+
+		self.large.add('a')
+		self.assertEqual(query.count(), 3)
+
+		query.invalidate()
+		self.assertEqual(query.count(), 4)
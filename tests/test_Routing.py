@@ -0,0 +1,117 @@
+__author__ = 'Nuclight.atomAltera'
+
+from redis import Redis
+
+from tests.fieldTestCaseBase import FieldTestCaseBase, HOST, PORT
+
+from orewrap.fields import Field, StringField, SetField
+from orewrap.object import Object, ObjectField, UniqueIndex
+from orewrap.routing import Router, HashRingRouter, SlotRouter, hash_tag, key_slot
+
+
+class RoutedItem(Object):
+	_Name = 'ritem'
+
+	title = ObjectField(StringField)
+	by_title = UniqueIndex('title')
+
+
+class RoutingTestCase(FieldTestCaseBase):
+	@classmethod
+	def setUpClass(cls):
+		super(RoutingTestCase, cls).setUpClass()
+
+		cls.nodes = [Redis(host=HOST, port=PORT, db=db) for db in (1, 2, 3)]
+		cls.router = HashRingRouter(cls.nodes[:2])
+
+	def setUp(self):
+		super(RoutingTestCase, self).setUp()
+
+		for node in self.nodes:
+			node.flushdb()
+
+	def tearDown(self):
+		Field.Init(self.redis)
+
+	@classmethod
+	def tearDownClass(cls):
+		for node in cls.nodes:
+			node.flushdb()
+
+		super(RoutingTestCase, cls).tearDownClass()
+
+	def test_hash_tag(self):
+		self.assertEqual(hash_tag('{user1000}.following'), 'user1000')
+		self.assertEqual(hash_tag('foo{}{bar}'), 'foo{}{bar}')
+		self.assertEqual(key_slot('123456789'), 0x31C3)
+		self.assertEqual(key_slot('{user1000}.following'), key_slot('user1000'))
+
+	def test_ring(self):
+		keys = ['key:%d' % index for index in range(1000)]
+		clients = [self.router.client(key) for key in keys]
+
+		self.assertTrue(all(clients.count(node) > 300 for node in self.nodes[:2]))
+		self.assertIs(self.router.client('{tag}:a'), self.router.client('{tag}:b'))
+
+		# only keys, moved to new node, change their node
+		router = HashRingRouter(self.nodes)
+
+		for key, client in zip(keys, clients):
+			self.assertIn(router.client(key), (client, self.nodes[2]))
+
+	def test_slots(self):
+		router = SlotRouter([(0, 8191, self.nodes[0]), (8192, 16383, self.nodes[1])])
+
+		self.assertIs(router.client('123456789'), self.nodes[1])
+		self.assertEqual(len(router.clients()), 2)
+
+		with self.assertRaises(Exception):
+			SlotRouter([(0, 100, self.nodes[0])])
+
+		class PartialRouter(Router):
+			def client(self, key):
+				return self.nodes[0]
+
+		# routers must implement all abstract methods
+		with self.assertRaises(TypeError):
+			PartialRouter()
+
+	def test_fields(self):
+		fields = [SetField('set:%d' % index, redis=self.router) for index in range(8)]
+		self.assertEqual(len({id(field._redis) for field in fields}), 2)
+
+		for index, field in enumerate(fields):
+			field.add(*range(index, index + 10))
+
+		self.assertTrue(self.nodes[0].exists(fields[0]._key) != self.nodes[1].exists(fields[0]._key))
+
+		self.assertSetEqual(fields[0].union(*fields[1:]), set(map(str, range(17))))
+		self.assertSetEqual(fields[0].intersection(*fields[1:]), set(map(str, range(7, 10))))
+		self.assertSetEqual(fields[0].difference(*fields[1:4]), {'0'})
+
+		with Field.batch():
+			for field in fields:
+				field.add('x')
+
+		self.assertTrue(all(field.contains('x') for field in fields))
+
+		with self.assertRaises(Exception):
+			fields[0].union_store('dest', *fields[1:])
+
+		tagged = SetField('{set}:a', redis=self.router)
+		tagged.add(1, 2)
+		self.assertSetEqual(tagged.union_store('{set}:b', ttl=10).members(), {'1', '2'})
+
+	def test_object(self):
+		Field.Init(self.router)
+
+		items = [RoutedItem.Create(title='title %d' % index) for index in range(6)]
+
+		self.assertSequenceEqual([item.title.get() for item in items], ['title %d' % index for index in range(6)])
+		self.assertEqual(RoutedItem.Find(by_title='title 3')[0].object_id, 4)
+
+		with self.assertRaises(Exception):
+			RoutedItem.Create(title='title 0')
+
+		self.assertEqual(RoutedItem.DeleteMany([item.object_id for item in items]), 6)
+		self.assertFalse(any(node.keys('ritem:[0-9]*') for node in self.nodes))
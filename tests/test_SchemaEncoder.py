@@ -0,0 +1,62 @@
+__author__ = 'Nuclight.atomAltera'
+
+from datetime import datetime
+
+from tests.fieldTestCaseBase import FieldTestCaseBase
+
+from orewrap.fields import StringField, HashField, SetField
+from orewrap.encoders import SchemaEncoder, SchemaValue
+
+class SchemaEncoderTestCase(FieldTestCaseBase):
+	def setUp(self):
+		super(SchemaEncoderTestCase, self).setUp()
+
+		self.encoder = SchemaEncoder(('id', 'int64'), ('name', 'str'), ('score', 'float64'), ('blob', 'bytes'), ('created', 'datetime'), ('active', 'bool'))
+		self.value = {'id': 7, 'name': 'Łukasz', 'score': 1.5, 'blob': b'\x00\x01', 'created': datetime(2020, 1, 2, 3, 4, 5, 6), 'active': True}
+
+	def test_encode(self):
+		code = self.encoder.encode(self.value)
+		decoded = self.encoder.decode(code)
+
+		self.assertIsInstance(decoded, SchemaValue)
+		self.assertEqual(decoded, self.value)
+		self.assertEqual(decoded.name, 'Łukasz')
+		self.assertEqual(decoded['blob'], b'\x00\x01')
+		self.assertEqual(self.encoder.encode(decoded), code)
+
+		with self.assertRaises(AttributeError):
+			decoded.missing
+
+		with self.assertRaises(Exception):
+			self.encoder.encode({'id': 1})
+
+	def test_empty_variable(self):
+		value = dict(self.value, name='', blob=b'')
+
+		self.assertEqual(self.encoder.decode(self.encoder.encode(value)), value)
+
+	def test_field(self):
+		field = StringField(self.keys[0], redis=self.redis, value_encoder=self.encoder)
+		field.set(self.value)
+
+		self.assertEqual(field.get().id, 7)
+
+		hash_field = HashField(self.keys[1], redis=self.redis, value_encoder=self.encoder)
+		hash_field.set('a', self.value)
+
+		self.assertEqual(hash_field.get('a')['created'], self.value['created'])
+
+	def test_set_field(self):
+		other = dict(self.value, id=8)
+
+		values = SetField(self.keys[2], redis=self.redis, value_encoder=self.encoder)
+		other_values = SetField(self.keys[3], redis=self.redis, value_encoder=self.encoder)
+
+		values.add(self.value, other)
+		other_values.add(other)
+
+		self.assertEqual(len(values.members()), 2)
+		self.assertIn(self.encoder.decode(self.encoder.encode(other)), values.members())
+		self.assertSetEqual({value.id for value in values.union(other_values)}, {7, 8})
+		self.assertSetEqual({value.id for value in values.intersection(other_values)}, {8})
+		self.assertSetEqual({value.id for value in values.difference(other_values)}, {7})
@@ -0,0 +1,82 @@
+__author__ = 'Nuclight.atomAltera'
+
+import unittest
+from datetime import datetime
+
+from tests.fieldTestCaseBase import FieldTestCaseBase
+
+from orewrap.fields import StringField, HashField
+from orewrap.encoders import get_encoder, register_encoder, Encoder
+from orewrap.serializers import int64Serializer, float64Serializer, timestampSerializer, CompressSerializer
+
+try:
+	import msgpack
+except ImportError:
+	msgpack = None
+
+try:
+	import lz4
+except ImportError:
+	lz4 = None
+
+
+class SerializersTestCase(unittest.TestCase):
+	def test_struct(self):
+		self.assertEqual(len(int64Serializer.dump(-5)), 8)
+		self.assertEqual(int64Serializer.load(int64Serializer.dump(-5)), -5)
+		self.assertEqual(float64Serializer.load(float64Serializer.dump(0.25)), 0.25)
+
+		now = datetime.now()
+		self.assertEqual(timestampSerializer.load(timestampSerializer.dump(now)), now)
+
+	def test_compress(self):
+		serializer = CompressSerializer(threshold=16)
+
+		self.assertEqual(serializer.dump('short'), b'\x00short')
+		self.assertEqual(serializer.load(serializer.dump('short')), 'short')
+
+		value = 'long value ' * 100
+		self.assertLess(len(serializer.dump(value)), len(value))
+		self.assertEqual(serializer.load(serializer.dump(value)), value)
+
+		with self.assertRaises(Exception):
+			serializer.load(b'short')
+
+	@unittest.skipIf(lz4 is None, 'lz4 is not installed')
+	def test_compress_lz4(self):
+		serializer = CompressSerializer(threshold=16, method='lz4')
+
+		value = 'long value ' * 100
+		self.assertEqual(serializer.dump(value)[:1], b'\x02')
+		self.assertEqual(serializer.load(serializer.dump(value)), value)
+
+	def test_registry(self):
+		self.assertIs(get_encoder('int64'), get_encoder('int64'))
+
+		encoder = Encoder()
+		self.assertIs(get_encoder(encoder), encoder)
+
+		register_encoder('test_identity', lambda: encoder)
+		self.assertIs(get_encoder('test_identity'), encoder)
+
+		with self.assertRaises(Exception):
+			get_encoder('missing')
+
+
+class NamedEncoderFieldTestCase(FieldTestCaseBase):
+	def test_int64(self):
+		field = StringField(self.keys[0], redis=self.redis, value_encoder='int64')
+		field.set(-42)
+
+		self.assertEqual(len(self.redis.get(self.keys[0])), 8)
+		self.assertEqual(field.get(), -42)
+
+	@unittest.skipIf(msgpack is None, 'msgpack is not installed')
+	def test_msgpack(self):
+		field = HashField(self.keys[1], redis=self.redis, value_encoder='msgpack_zlib')
+		value = {'tags': ['a', 'b'], 'count': 3, 'text': 'x' * 1000}
+
+		field.set('doc', value)
+
+		self.assertLess(len(self.redis.hget(self.keys[1], 'doc')), 1000)
+		self.assertEqual(field.get('doc'), value)
@@ -93,4 +93,40 @@ class SetFieldTestCase(FieldTestCaseBase):
 
 		self.assertSetEqual(result,
 			set(self.values[T:]).intersection(set(self.values[:T + 3]), set(self.values[2:T + 1]))
-		)
\ No newline at end of file
+		)
+
+	def test_difference(self):
+		self.redis.sadd(self.keys[1], *self.values_c[:T + 3])
+
+		result = self.field.difference(SetField(self.keys[1], redis=self.redis))
+
+		self.assertSetEqual(result, set(self.values[T + 3:]))
+
+	def test_store(self):
+		self.redis.sadd(self.keys[1], *self.values_c[:T + 3])
+		field1 = SetField(self.keys[1], redis=self.redis)
+
+		result = self.field.intersection_store(self.keys[2], field1)
+
+		self.assertIsInstance(result, SetField)
+		self.assertSetEqual(result.members(), set(self.values[T:T + 3]))
+		self.assertIn(self.redis.ttl(self.keys[2]), (None, -1))
+
+		result = self.field.union_store(self.keys[3], field1, ttl=100)
+
+		self.assertSetEqual(result.members(), set(self.values))
+		self.assertTrue(0 < self.redis.ttl(self.keys[3]) <= 100)
+
+		with SetField.batch():
+			result = self.field.difference_store(SetField(self.keys[4], redis=self.redis, value_encoder=self.v_con), field1, ttl=100)
+			self.assertFalse(self.redis.exists(self.keys[4]))
+
+		self.assertSetEqual(result.members(), set(self.values[T + 3:]))
+		self.assertTrue(0 < self.redis.ttl(self.keys[4]) <= 100)
+
+	def test_scan_members(self):
+		result = list(self.field.scan_members(count=2))
+		self.assertSetEqual(set(result), set(self.values[T:]))
+
+		self.field._Scan_Threshold = 2
+		self.assertSetEqual(set(self.field), set(self.values[T:]))
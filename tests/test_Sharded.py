@@ -0,0 +1,87 @@
+__author__ = 'Nuclight.atomAltera'
+
+from tests.fieldTestCaseBase import FieldTestCaseBase
+
+from orewrap.fields import Field, StringField
+from orewrap.sharded import ShardedCounter, ShardedSetField, ShardedSortedSetField
+from orewrap.counters import IdBlockAllocator
+
+class ShardedTestCase(FieldTestCaseBase):
+	def test_counter(self):
+		counter = ShardedCounter(self.keys[0], shards=4, redis=self.redis)
+
+		self.assertEqual(counter.get(), 0)
+		self.assertIsNone(counter.get(None))
+
+		for index in range(40):
+			counter.increment(2)
+
+		self.assertEqual(counter.get(), 80)
+		self.assertEqual(sum(int(self.redis.get(shard._key) or 0) for shard in counter.shards), 80)
+		self.assertGreater(sum(self.redis.exists(shard._key) for shard in counter.shards), 1)
+
+		counter.set(5)
+		self.assertEqual(counter.get(), 5)
+		self.assertEqual(self.redis.get('%s:0' % self.keys[0]), b'5')
+
+		self.assertTrue(counter.destroy())
+		self.assertFalse(counter.exists())
+
+	def test_set(self):
+		field = ShardedSetField(self.keys[0], shards=4, redis=self.redis, value_encoder=self.v_con)
+
+		self.assertEqual(field.add(*self.values), 20)
+		self.assertEqual(field.add(self.values[0]), 0)
+
+		self.assertSetEqual(field.members(), set(self.values))
+		self.assertEqual(len(field), 20)
+		self.assertIn(self.values[3], field)
+		self.assertNotIn(self.keys[0], field)
+
+		for shard in field.shards:
+			for value in shard.members():
+				self.assertIs(field._shard_of(value), shard)
+
+		self.assertEqual(field.delete(*self.values[:5]), 5)
+		self.assertSetEqual(set(field), set(self.values[5:]))
+
+		with Field.batch():
+			self.assertIsNone(field.add(self.values[0]))
+
+		self.assertTrue(field.contains(self.values[0]))
+
+	def test_sorted_set(self):
+		field = ShardedSortedSetField(self.keys[0], shards=4, redis=self.redis, value_encoder=self.v_con)
+
+		scores = dict(zip(self.values, self.scores))
+		ordered = tuple(sorted(self.values, key=scores.get))
+
+		self.assertEqual(field.add_multi(scores), 20)
+		self.assertEqual(field.count(), 20)
+		self.assertEqual(field.score_of(self.values[0]), self.scores[0])
+
+		self.assertSequenceEqual(field.range_by_index(), ordered)
+		self.assertSequenceEqual(field.range_by_index(2, 5), ordered[2:6])
+		self.assertSequenceEqual(field.range_by_index(0, 2, desc=True), ordered[::-1][:3])
+		self.assertSequenceEqual(tuple(field), ordered)
+
+		middle = scores[ordered[10]]
+		self.assertSequenceEqual(field.range_by_score(middle), ordered[10:])
+		self.assertSequenceEqual(field.range_by_score(max_score=middle, offset=2, limit=3, desc=True), ordered[8::-1][:3])
+
+		self.assertEqual(field.delete(*ordered[:5]), 5)
+		self.assertSequenceEqual(field.range_by_index(0, 0), ordered[5:6])
+
+		with self.assertRaises(Exception):
+			field.range_by_index(-3)
+
+	def test_id_blocks(self):
+		allocator = IdBlockAllocator(StringField(self.keys[0], redis=self.redis), block_size=5)
+
+		self.assertSequenceEqual(allocator.allocate(), [1])
+		self.assertSequenceEqual(allocator.allocate(3), [2, 3, 4])
+		self.assertEqual(allocator.remaining(), 1)
+		self.assertSequenceEqual(allocator.allocate(2), [5, 6])
+		self.assertSequenceEqual(allocator.allocate(7), [7, 8, 9, 10, 11, 12, 13])
+		self.assertEqual(self.redis.get(self.keys[0]), b'15')
+		self.assertEqual(allocator.reserved_blocks, 3)
\ No newline at end of file
@@ -1,8 +1,19 @@
 ____author__ = 'Nuclight.atomAltera'
 
+import unittest
+import os
+import time
+from datetime import datetime
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
 from tests.fieldTestCaseBase import FieldTestCaseBase
 
-from orewrap.fields import SortedSetField
+from orewrap.fields import SortedSetField, SetField
+from orewrap.encoders import datetime_encoder
 
 T = 10
 
@@ -45,3 +56,146 @@ class SortedSetFieldTestCase(FieldTestCaseBase):
 		self.assertSequenceEqual(sorted(self.redis.zrange(self.keys[0], 0, -1)), sorted(self.values_c))
 
 
+
+
+	def test_score_of_multi(self):
+		result = self.field.score_of_multi(self.values[T:T + 3] + self.values[:1])
+
+		self.assertSequenceEqual(result, [float(score) for score in self.scores_c[T:T + 3]] + [None])
+
+	def test_scan_items(self):
+		result = {value: score for value, score in self.field.scan_items(count=3)}
+
+		self.assertDictEqual(result, {value: float(score) for value, score in self.d(self.values[T:], self.scores_c[T:]).items()})
+
+	def test_iterate(self):
+		expected = self.field.range_by_index()
+
+		self.assertSequenceEqual(tuple(self.field.iterate(page_size=3)), expected)
+
+		self.field._Scan_Threshold = 2
+		self.assertSequenceEqual(tuple(self.field), expected)
+
+	def test_range_by_score(self):
+		expected = self.field.range_by_index()
+		scores = sorted(self.scores[T:])
+
+		self.assertSequenceEqual(self.field.range_by_score(scores[1], scores[4]), expected[1:5])
+		self.assertSequenceEqual(self.field.range_by_score(scores[1], scores[4], min_exclusive=True, max_exclusive=True), expected[2:4])
+		self.assertSequenceEqual(self.field.range_by_score(scores[1], offset=2, limit=3), expected[3:6])
+		self.assertSequenceEqual(self.field.range_by_score(limit=2, desc=True), expected[::-1][:2])
+		self.assertSequenceEqual(self.field.range_by_score(max_score=scores[4], offset=1, desc=True, max_exclusive=True), expected[2::-1])
+
+	def test_range_by_lex(self):
+		field = SortedSetField(self.keys[1], redis=self.redis)
+		field.add_multi(dict.fromkeys('abcdef', 0))
+
+		self.assertSequenceEqual(field.range_by_lex('b', 'e'), tuple('bcde'))
+		self.assertSequenceEqual(field.range_by_lex('b', 'e', min_exclusive=True, limit=2), tuple('cd'))
+		self.assertSequenceEqual(field.range_by_lex(max_value='c', desc=True), tuple('cba'))
+
+	def test_page(self):
+		expected = self.field.range_by_index()
+
+		page, cursor = self.field.page(size=4)
+		self.assertSequenceEqual(page, expected[:4])
+
+		# elements, added before cursor, do not shift following pages
+		self.field.add(self.values[0], -2000)
+		page, cursor = self.field.page(cursor, size=4)
+		self.assertSequenceEqual(page, expected[4:8])
+
+		# cursor stays valid, when its element is removed
+		self.field.delete(expected[7])
+		page, cursor = self.field.page(cursor, size=4)
+		self.assertSequenceEqual(page, expected[8:])
+		self.assertIsNone(cursor)
+
+		page, cursor = self.field.page(size=3, desc=True)
+		self.assertSequenceEqual(page, self.field.range_by_index(0, 2, desc=True))
+
+		with self.assertRaises(Exception):
+			self.field.page('!')
+
+	def test_page_equal_scores(self):
+		field = SortedSetField(self.keys[1], redis=self.redis)
+		field.add_multi(dict.fromkeys('abcdef', 1))
+
+		page, cursor = field.page(size=2)
+		field.delete('b')
+
+		self.assertSequenceEqual(field.page(cursor, size=2)[0], tuple('cd'))
+
+		page, cursor = field.page(size=2, desc=True)
+		field.delete('e')
+
+		self.assertSequenceEqual(field.page(cursor, size=2, desc=True)[0], tuple('dc'))
+
+	def test_range_with_scores(self):
+		result = self.field.range_with_scores()
+		expected = sorted(zip(self.values[T:], self.scores[T:]), key=lambda pair: pair[1])
+
+		self.assertSequenceEqual(result, tuple(expected))
+
+	@unittest.skipIf(numpy is None, 'NumPy is not available')
+	def test_range_with_scores_array(self):
+		field = SortedSetField(self.keys[1], redis=self.redis, score_encoder=datetime_encoder)
+
+		dates = numpy.array(['2014-01-01T10:00:00', '2014-01-01T09:00:00.5'], dtype='datetime64[us]')
+		self.assertEqual(field.add_multi(self.values[:2], dates), 2)
+
+		values, scores = field.range_with_scores(as_array=True)
+
+		self.assertSequenceEqual(values, (self.values[1], self.values[0]))
+		self.assertEqual(scores.dtype, numpy.dtype('datetime64[us]'))
+		self.assertSequenceEqual(scores.tolist(), dates[::-1].tolist())
+
+		values, scores = self.field.range_with_scores(as_array=True)
+
+		self.assertEqual(scores.dtype, numpy.float64)
+		self.assertSequenceEqual(sorted(scores.tolist()), sorted(float(score) for score in self.scores_c[T:]))
+
+	@unittest.skipIf(numpy is None, 'NumPy is not available')
+	def test_datetime_scalar_and_array(self):
+		field = SortedSetField(self.keys[1], redis=self.redis, score_encoder=datetime_encoder)
+		dates = [datetime(2014, 1, 1, 10), datetime(2014, 7, 1, 9, 0, 0, 500000)]
+
+		timezone = os.environ.get('TZ')
+		os.environ['TZ'] = 'Europe/Berlin'
+		time.tzset()
+
+		try:
+			field.add_multi(self.values[:1], dates[:1])
+			field.add_multi(self.values[1:2], numpy.array(dates[1:], dtype='datetime64[us]'))
+
+			values, scores = field.range_with_scores(as_array=True)
+			self.assertSequenceEqual(scores.tolist(), dates)
+
+			self.assertSequenceEqual([score for value, score in field.range_with_scores()], dates)
+		finally:
+			if timezone is None:
+				del os.environ['TZ']
+			else:
+				os.environ['TZ'] = timezone
+
+			time.tzset()
+
+	def test_aggregate_store(self):
+		self.redis.zadd(self.keys[1], *self.d2l(self.values_c[T:T + 2], (5000, 5000)))
+		self.redis.sadd(self.keys[2], self.values_c[T])
+
+		result = self.field.union_store(self.keys[3], self.keys[1], weights=(1, 2), aggregate='max', ttl=100)
+
+		self.assertIsInstance(result, SortedSetField)
+		self.assertEqual(result.count(), len(self.values) - T)
+		self.assertEqual(self.redis.zscore(self.keys[3], self.values_c[T]), max(self.scores_c[T], 10000))
+		self.assertEqual(result.score_of(self.values[T + 2]), self.scores_c[T + 2])
+		self.assertTrue(0 < self.redis.ttl(self.keys[3]) <= 100)
+
+		result = self.field.intersection_store(self.keys[4], self.keys[1], SetField(self.keys[2], redis=self.redis))
+
+		self.assertSequenceEqual(result.range_by_index(), (self.values[T], ))
+		self.assertEqual(self.redis.zscore(self.keys[4], self.values_c[T]), self.scores_c[T] + 5001)
+
+		with self.assertRaises(Exception):
+			self.field.union_store(self.keys[3], self.keys[1], weights=(1, ))
@@ -26,6 +26,31 @@ class StringFieldTestCase(FieldTestCaseBase):
 		self.assertEqual(self.v_con.decode(self.redis.get(self.keys[0])), self.values[3])
 
 
+	def test_set_ttl(self):
+		self.field.set(self.values[1], ex=10)
+		self.assertTrue(9 < self.field.ttl() <= 10)
+
+		self.field.set(self.values[2], keepttl=True)
+		self.assertTrue(9 < self.field.ttl() <= 10)
+		self.assertEqual(self.field.get(), self.values[2])
+
+		self.assertFalse(self.field.set(self.values[3], False, px=5000))
+		self.assertTrue(self.field.set(self.values[3], px=5000))
+		self.assertTrue(4 < self.field.ttl() <= 5)
+
+		self.assertRaises(Exception, self.field.set, self.values[4], ex=10, px=5000)
+		self.assertRaises(Exception, self.field.set, self.values[4], ex=10, keepttl=True)
+		self.assertRaises(Exception, self.field.set, self.values[4], px=5000, keepttl=True)
+		self.assertEqual(self.field.get(), self.values[3])
+
+		self.field.set(self.values[4])
+		self.assertIsNone(self.field.ttl())
+
+		field = StringField(self.keys[1], redis=self.redis, ttl=30)
+		field.set(self.values[5])
+
+		self.assertTrue(29 < field.ttl() <= 30)
+
 	def test_get(self):
 		result = self.field.get(self.values[1])
 		self.assertEqual(result, self.values[1])
@@ -0,0 +1,216 @@
+__author__ = 'Nuclight.atomAltera'
+
+import unittest
+
+from tests.fieldTestCaseBase import FieldTestCaseBase
+
+from orewrap.aio import AsyncField, AsyncStringField, AsyncHashField, AsyncSetField, AsyncSortedSetField, AsyncObject
+from orewrap.aio import AsyncClient, AsyncUniqueIndex, AsyncRangeIndex, AsyncTagIndex, get_async_object_encoder
+from orewrap.object import ObjectField, UniqueIndex, HASH_STORAGE
+
+
+class AsyncItem(AsyncObject):
+	_Name = 'aitem'
+
+	title = ObjectField(AsyncStringField)
+	labels = ObjectField(AsyncSetField)
+
+
+class AsyncHashItem(AsyncItem):
+	_Name = 'ahitem'
+	_Storage = HASH_STORAGE
+
+
+class AsyncExpiringItem(AsyncItem):
+	_Name = 'aeitem'
+	_Ttl = 100
+
+
+class AsyncUser(AsyncObject):
+	_Name = 'auser'
+
+	email = ObjectField(AsyncStringField)
+	age = ObjectField(AsyncStringField)
+	city = ObjectField(AsyncStringField)
+
+	by_email = AsyncUniqueIndex('email')
+	by_age = AsyncRangeIndex('age')
+	by_city = AsyncTagIndex('city')
+
+
+class AsyncHashUser(AsyncUser):
+	_Name = 'ahuser'
+	_Storage = HASH_STORAGE
+
+
+class AsyncTestCase(FieldTestCaseBase, unittest.IsolatedAsyncioTestCase):
+	async def asyncSetUp(self):
+		AsyncField.Init(self.redis)
+
+	async def test_fields(self):
+		string = AsyncStringField(self.keys[0], value_encoder=self.v_con)
+		values = AsyncSetField(self.keys[1], value_encoder=self.v_con)
+		hash = AsyncHashField(self.keys[2])
+
+		self.assertIsInstance(string._redis, AsyncClient)
+		self.assertIs(string._redis, values._redis)
+
+		self.assertTrue(await string.set(self.values[0]))
+		self.assertEqual(await string.get(), self.values[0])
+		self.assertEqual(self.redis.get(self.keys[0]), self.values_c[0])
+		self.assertEqual(await AsyncStringField(self.keys[3]).increment(5), 5)
+
+		self.assertEqual(await values.add(*self.values[:5]), 5)
+		self.assertSetEqual({value async for value in values}, set(self.values[:5]))
+
+		values._Scan_Threshold = 2
+		self.assertSetEqual({value async for value in values}, set(self.values[:5]))
+		self.assertSetEqual({value async for value in values.scan_members(count=2)}, set(self.values[:5]))
+
+		self.assertEqual(len(await values.pop(2)), 2)
+		self.assertEqual(await values.count(), 3)
+
+		self.assertTrue(await hash.set_multi(self.d(self.names[:3], self.values[:3])))
+		self.assertDictEqual(await hash.members(), self.d(self.names[:3], self.values[:3]))
+
+		hash._Scan_Threshold = 2
+		self.assertSetEqual({name async for name in hash}, set(self.names[:3]))
+
+	async def test_sorted_set(self):
+		scores = AsyncSortedSetField(self.keys[0], score_encoder=self.s_con)
+
+		self.assertTrue(await scores.add(self.values[0], self.scores[0]))
+		self.assertEqual(await scores.add_multi(self.d(self.values[1:4], self.scores[1:4])), 3)
+
+		expected = tuple(value for score, value in sorted(zip(self.scores[:4], self.values[:4])))
+
+		self.assertSequenceEqual(await scores.range_by_index(), expected)
+		self.assertSequenceEqual(await scores.range_by_index(desc=True), expected[::-1])
+		self.assertSequenceEqual(await scores.range_by_score(limit=2), expected[:2])
+		self.assertSequenceEqual(tuple([value async for value in scores]), expected)
+
+		scores._Scan_Threshold = 2
+		self.assertSetEqual({value async for value in scores}, set(expected))
+
+	async def test_batch(self):
+		string = AsyncStringField(self.keys[0])
+		scores = AsyncSortedSetField(self.keys[1])
+
+		async with AsyncField.batch():
+			r1 = await string.set(self.values[0])
+			r2 = await scores.add_multi(self.d(self.values[:3], self.scores[:3]))
+
+			self.assertFalse(self.redis.exists(self.keys[0]))
+
+		self.assertTrue(r1.value)
+		self.assertEqual(r2.value, 3)
+		self.assertEqual(await scores.score_of_multi(self.values[:4]), [float(score) for score in self.scores[:3]] + [None])
+
+		AsyncSortedSetField._Use_Zmscore = False
+
+		try:
+			self.assertEqual(await scores.score_of_multi(self.values[:4]), [float(score) for score in self.scores[:3]] + [None])
+		finally:
+			AsyncSortedSetField._Use_Zmscore = True
+
+		with self.assertRaises(Exception):
+			with AsyncField.batch():
+				await string.set(self.values[1])
+
+	async def test_object(self):
+		for item_class in (AsyncItem, AsyncHashItem):
+			item = await item_class.Create(title=self.values[0])
+			await item.labels.add(self.values[1])
+
+			self.assertEqual(await item.title.get(), self.values[0])
+			self.assertTrue(await item_class.Exists(item.object_id))
+
+			items = await item_class.CreateMany(3, tag=self.values[2])
+			self.assertSequenceEqual([await item.tag.get() for item in items], [self.values[2]] * 3)
+
+			result = await item.load()
+			self.assertEqual(result['title'], self.values[0])
+			self.assertSetEqual(result['labels'], {self.values[1]})
+
+			item['tag'] = self.values[3]
+			self.assertSetEqual(await item.save(), {'tag'})
+			self.assertEqual(await item.tag.get(), self.values[3])
+
+			result = await item_class.GetMany([1, 2, 9])
+			self.assertSequenceEqual([item and str(item) for item in result], ['1', '2', None])
+
+			self.assertTrue(await item.delete())
+			self.assertEqual(await item_class.DeleteMany([2, 3, 9]), 2)
+			self.assertSequenceEqual([str(item) for item in await item_class.Register.range_by_index()], ['4'])
+
+	async def test_object_encoder(self):
+		item = await AsyncItem.Create(title=self.values[0])
+		encoder = get_async_object_encoder(AsyncItem)
+
+		self.assertEqual(encoder.encode(item), str(item.object_id))
+		self.assertEqual(encoder.decode(str(item.object_id)).object_id, item.object_id)
+		self.assertIsNone(encoder.decode(b'999'))
+
+	async def test_indexes(self):
+		for user_class in (AsyncUser, AsyncHashUser):
+			first = await user_class.Create(email='a@x', age='30', city='paris')
+			second = await user_class.Create(email='b@x', age='40', city='oslo')
+			await user_class.CreateMany(2, age='50', city='paris')
+
+			self.assertSequenceEqual([user.object_id for user in await user_class.Find(by_email='a@x')], [first.object_id])
+			self.assertSequenceEqual([user.object_id for user in await user_class.Find(by_age=(35, None), by_city='oslo')], [second.object_id])
+			self.assertEqual(len(await user_class.Find(by_city=['paris', 'oslo'])), 4)
+
+			with self.assertRaises(Exception):
+				await user_class.Create(email='a@x')
+
+			self.assertEqual(await user_class.Register.count(), 4)
+
+			second['email'] = 'a@x'
+
+			with self.assertRaises(Exception):
+				await second.save()
+
+			second['email'] = 'c@x'
+			second['city'] = 'paris'
+			self.assertSetEqual(await second.save(), {'email', 'city'})
+
+			self.assertListEqual(await user_class.Find(by_email='b@x'), [])
+			self.assertSequenceEqual([user.object_id for user in await user_class.Find(by_email='c@x')], [second.object_id])
+			self.assertListEqual(await user_class.Find(by_city='oslo'), [])
+
+			self.assertTrue(await first.delete())
+			self.assertListEqual(await user_class.Find(by_email='a@x'), [])
+			self.assertEqual(len(await user_class.Find(by_age=(None, None))), 3)
+
+	def test_index_classes(self):
+		with self.assertRaises(Exception):
+			class BlockingIndexUser(AsyncObject):
+				email = ObjectField(AsyncStringField)
+				by_email = UniqueIndex('email')
+
+	async def test_object_ttl(self):
+		item = await AsyncExpiringItem.Create(title=self.values[0])
+		items = await AsyncExpiringItem.CreateMany(2, title=self.values[1])
+
+		for obj in [item] + items:
+			self.assertAlmostEqual(await obj.ttl(), 100, delta=5)
+			self.assertGreater(self.redis.pttl(obj.title._key), 100000)
+
+		self.assertIn(self.redis.ttl(AsyncExpiringItem._Expires._key), (None, -1))
+
+		item['tag'] = self.values[2]
+		await item.save()
+		self.assertGreater(self.redis.pttl(item.tag._key), 100000)
+
+		await item.persist()
+		self.assertIsNone(await item.ttl())
+		self.assertIn(self.redis.ttl(item.title._key), (None, -1))
+
+		await items[0].expire(-100)
+		self.assertEqual(await AsyncExpiringItem.PurgeExpired(), 1)
+		self.assertFalse(await AsyncExpiringItem.Exists(items[0].object_id))
+		self.assertTrue(await AsyncExpiringItem.Exists(items[1].object_id))
+
+		with self.assertRaises(Exception):
+			await AsyncExpiringItem.Find(title=self.values[0])